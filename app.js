@@ -9,6 +9,20 @@ class BJJFoundation {
         this.fightVideos = [];
         this.allVideos = []; // Combined array of technique and fight videos
         this.filteredVideos = [];
+        this.index = null; // Inverted index (bjj_index.json) over technique videos, if available
+        this.decodedPostings = new Map(); // Cache of decoded posting lists
+        this.athleteIndex = null; // Canonical athletes -> fight postings (athlete_index.json)
+        this.hiddenDuplicates = new Map(); // Shown video -> number of collapsed near-duplicates
+        this.searchIndex = null; // Full-text search index (bjj_search.json) over technique + fight videos
+        this.MIN_SEARCH_PREFIX = 3; // Shorter search tokens match whole words only (MIN_PREFIX_LENGTH in search_index.py)
+        this.similarVideos = null; // Technique position -> positions of similar videos (similar_videos.json)
+        this.videoPositions = new Map(); // Technique video -> its position, for the similar lists
+        this.manifest = null; // Shard manifest (shards/manifest.json): sorted pages, channel/category shards, menu counts
+        this.shardCache = new Map(); // Shard file -> promise of its videos
+        this.catalogueLoading = null; // Promise of the full catalogue, started the first time a view needs it
+        this.catalogueLoaded = false;
+        this.renderSequence = 0; // Views that finish loading after a newer filter change are dropped
+        this.sortBy = 'views'; // 'views' (most viewed first) or 'date' (newest first)
         this.filters = {
             techniqueCategory: '', // High-level filter: pass, sweep, submission, takedown, technique
             guard: '',
@@ -105,8 +119,13 @@ class BJJFoundation {
 
     async init() {
         try {
-            await this.loadVideos();
-            this.populateFilters();
+            // Start from the shards: the full catalogue is only downloaded once a view needs it
+            this.manifest = await this.loadManifest();
+            if (this.manifest) {
+                this.populateFilters();
+            } else {
+                await this.loadCatalogue();
+            }
             this.setupEventListeners();
             this.applyFilters();
         } catch (error) {
@@ -115,6 +134,41 @@ class BJJFoundation {
         }
     }
 
+    async loadManifest() {
+        try {
+            const response = await fetch('shards/manifest.json');
+            if (!response.ok) return null;
+            const manifest = await response.json();
+            // Only the current layout (MANIFEST_FORMAT in video_shards.py) has the shards and menu counts
+            return manifest.format === 3 ? manifest : null;
+        } catch (error) {
+            console.warn('Shards not available:', error);
+            return null;
+        }
+    }
+
+    // Videos of one shard file (cached)
+    loadShard(file) {
+        if (!this.shardCache.has(file)) {
+            this.shardCache.set(file, fetch(`shards/${file}`).then(response => {
+                if (!response.ok) throw new Error(`Failed to load shards/${file}`);
+                return response.json();
+            }));
+        }
+        return this.shardCache.get(file);
+    }
+
+    // Download the full catalogue once; the filter menus are then refilled from it
+    loadCatalogue() {
+        if (!this.catalogueLoading) {
+            this.catalogueLoading = this.loadVideos().then(() => {
+                this.catalogueLoaded = true;
+                this.populateFilters();
+            });
+        }
+        return this.catalogueLoading;
+    }
+
     async loadVideos() {
         try {
             // Load technique videos
@@ -125,9 +179,12 @@ class BJJFoundation {
             this.videos = await techResponse.json();
             console.log(`Loaded ${this.videos.length} technique videos`);
 
-            // Load fight videos
+            // Load fight videos: classified ones when available, the raw scrape otherwise
             try {
-                const fightResponse = await fetch('fight_simple.json');
+                let fightResponse = await fetch('fight_processed.json');
+                if (!fightResponse.ok) {
+                    fightResponse = await fetch('fight_simple.json');
+                }
                 if (fightResponse.ok) {
                     this.fightVideos = await fightResponse.json();
                     // Mark fight videos with a type flag
@@ -140,9 +197,87 @@ class BJJFoundation {
                 console.warn('Fight videos not available:', fightError);
             }
 
+            // Load the athlete index built by youtube_scraper.py
+            try {
+                const athleteResponse = await fetch('athlete_index.json');
+                if (athleteResponse.ok) {
+                    const athleteIndex = await athleteResponse.json();
+                    // Only trust an index built from the same fight file
+                    if (athleteIndex.count === this.fightVideos.length) {
+                        this.athleteIndex = athleteIndex;
+                        console.log(`Loaded athlete index (${athleteIndex.athletes.length} athletes)`);
+                    }
+                }
+            } catch (athleteError) {
+                console.warn('Athlete index not available:', athleteError);
+            }
+
+            // Load the inverted index built by classify_bjj_videos.py
+            try {
+                const indexResponse = await fetch('bjj_index.json');
+                if (indexResponse.ok) {
+                    const index = await indexResponse.json();
+                    // Only trust an index built from the same technique file
+                    if (index.count === this.videos.length) {
+                        this.index = index;
+                        console.log('Loaded inverted index');
+                    }
+                }
+            } catch (indexError) {
+                console.warn('Inverted index not available:', indexError);
+            }
+
+            // Load near-duplicate clusters built by near_duplicates.py
+            try {
+                const duplicatesResponse = await fetch('near_duplicates.json');
+                if (duplicatesResponse.ok) {
+                    const duplicates = await duplicatesResponse.json();
+                    // Only trust clusters built from the same technique file
+                    if (duplicates.count === this.videos.length) {
+                        duplicates.clusters.forEach((members, cluster) => {
+                            members.forEach(i => { this.videos[i].duplicateCluster = cluster; });
+                        });
+                        console.log(`Loaded ${duplicates.clusters.length} near-duplicate clusters`);
+                    }
+                }
+            } catch (duplicatesError) {
+                console.warn('Near-duplicate clusters not available:', duplicatesError);
+            }
+
+            // Load "more like this" lists built by similar_videos.py
+            try {
+                const similarResponse = await fetch('similar_videos.json');
+                if (similarResponse.ok) {
+                    const similar = await similarResponse.json();
+                    // Only trust lists built from the same technique file
+                    if (similar.count === this.videos.length) {
+                        this.similarVideos = similar.neighbours;
+                        this.videos.forEach((video, i) => this.videoPositions.set(video, i));
+                        console.log('Loaded similar video lists');
+                    }
+                }
+            } catch (similarError) {
+                console.warn('Similar videos not available:', similarError);
+            }
+
             // Combine both datasets
             this.allVideos = [...this.videos, ...this.fightVideos];
             console.log(`Total videos: ${this.allVideos.length}`);
+
+            // Load the search index built by classify_bjj_videos.py
+            try {
+                const searchResponse = await fetch('bjj_search.json');
+                if (searchResponse.ok) {
+                    const searchIndex = await searchResponse.json();
+                    // Positions are in the combined list, so both datasets must match the index
+                    if (searchIndex.count === this.allVideos.length && searchIndex.fight_start === this.videos.length) {
+                        this.searchIndex = searchIndex;
+                        console.log(`Loaded search index (${searchIndex.terms.length} terms)`);
+                    }
+                }
+            } catch (searchError) {
+                console.warn('Search index not available:', searchError);
+            }
         } catch (error) {
             console.error('Error loading videos:', error);
             throw error;
@@ -168,6 +303,18 @@ class BJJFoundation {
             map.set(k, (map.get(k) || 0) + 1);
         };
 
+        // Before the catalogue is downloaded, the counts come from the shard manifest
+        if (!this.catalogueLoaded) {
+            const labelCounts = {
+                guard_type: guardCounts, pass: passCounts, sweep: sweepCounts, position: positionCounts,
+                submission: submissionCounts, takedown: takedownCounts, escape: escapeCounts
+            };
+            Object.entries(labelCounts).forEach(([category, map]) => {
+                Object.entries(this.manifest.labels[category] || {}).forEach(([label, count]) => map.set(label, count));
+            });
+            Object.values(this.manifest.channels).forEach(({ name, count }) => channelCounts.set(name, count));
+        }
+
         // Process all videos (techniques + fights)
         this.allVideos.forEach(video => {
             if (video.classification) {
@@ -203,6 +350,8 @@ class BJJFoundation {
         const populateFromCounts = (selectId, countsMap, showCount = true) => {
             const sel = document.getElementById(selectId);
             if (!sel) return;
+            // Menus are refilled once the catalogue loads: keep the current choice
+            const selected = sel.value;
             // Remove existing options except the first (default) option
             while (sel.options.length > 1) sel.remove(1);
 
@@ -213,6 +362,7 @@ class BJJFoundation {
                 option.textContent = showCount ? `${name} (${cnt})` : name;
                 sel.appendChild(option);
             });
+            sel.value = selected;
         };
 
         // Populate filters ranked by number of videos (most -> least)
@@ -228,32 +378,18 @@ class BJJFoundation {
         // Populate athlete filter: only include TOP_ATHLETES but rank them by actual fight counts when possible
         const athleteFilter = document.getElementById('athlete-filter');
         if (athleteFilter) {
-            // Build counts map from fight videos (this.fightVideos)
-            const athleteCounts = new Map();
-            const incAth = (name) => {
-                if (!name) return;
-                const n = String(name).trim();
-                if (!n) return;
-                athleteCounts.set(n, (athleteCounts.get(n) || 0) + 1);
-            };
-
-            if (Array.isArray(this.fightVideos) && this.fightVideos.length > 0) {
-                this.fightVideos.forEach(v => {
-                    if (!v.athletes) return;
-                    if (Array.isArray(v.athletes)) {
-                        v.athletes.forEach(a => incAth(a));
-                    } else if (typeof v.athletes === 'string') {
-                        incAth(v.athletes);
-                    }
-                });
-            }
-
+            const selectedAthlete = athleteFilter.value;
             // Remove existing options except the default
             while (athleteFilter.options.length > 1) athleteFilter.remove(1);
 
             // Build list of TOP_ATHLETES with their counts (0 if none)
+            // The athlete index counts every spelling of an athlete, not just the exact name;
+            // names it cannot resolve are counted like getAthleteFights' fallback scan matches them
             const topWithCounts = this.TOP_ATHLETES.map(name => {
-                const cnt = athleteCounts.get(name) || 0;
+                const id = this.athleteIndex?.names[name.toLowerCase()];
+                const cnt = id !== undefined
+                    ? this.athleteIndex.athletes[id].fights
+                    : this.fightVideos.filter(video => this.fightHasAthlete(video, name.toLowerCase())).length;
                 return { name, cnt };
             });
 
@@ -266,6 +402,7 @@ class BJJFoundation {
                 option.textContent = cnt > 0 ? `${name} (${cnt})` : name;
                 athleteFilter.appendChild(option);
             });
+            athleteFilter.value = selectedAthlete;
         }
     }
 
@@ -274,10 +411,17 @@ class BJJFoundation {
         const searchInput = document.getElementById('search-input');
         const clearSearch = document.getElementById('clear-search');
 
+        // Search needs the full catalogue and its indexes: start downloading them on focus
+        searchInput.addEventListener('focus', () => {
+            this.loadCatalogue().catch(error => console.warn('Catalogue not available:', error));
+        });
+
         searchInput.addEventListener('input', (e) => {
             this.searchQuery = e.target.value.toLowerCase().trim();
             clearSearch.style.display = this.searchQuery ? 'flex' : 'none';
             
+            this.updateSearchSuggestions(e.target.value);
+
             // Debounce search - wait 300ms after user stops typing
             clearTimeout(this.searchDebounceTimer);
             this.searchDebounceTimer = setTimeout(() => {
@@ -353,30 +497,291 @@ class BJJFoundation {
             });
         }
 
+        // Sort order
+        const sortSelect = document.getElementById('sort-filter');
+        if (sortSelect) {
+            sortSelect.addEventListener('change', (e) => {
+                this.sortBy = e.target.value;
+                this.applyFilters();
+            });
+        }
+
         // Reset button
         document.getElementById('reset-filters').addEventListener('click', () => {
             this.resetFilters();
         });
     }
 
-    applyFilters() {
-        this.filteredVideos = this.allVideos.filter(video => {
-            // Search filter
-            if (this.searchQuery) {
-                const searchText = [
-                    video.title || '',
-                    video.description || '',
-                    ...(video.tags || [])
-                ].join(' ').toLowerCase();
+    // Substring match of a lowercased athlete name against a fight's extracted athletes
+    fightHasAthlete(video, athlete) {
+        return Array.isArray(video.athletes) && video.athletes.some(name => name.toLowerCase().includes(athlete));
+    }
 
-                if (!searchText.includes(this.searchQuery)) {
-                    return false;
-                }
+    // Channel key of the index and the channel filter: trimmed and lowercased, like InvertedIndexBuilder
+    channelKey(name) {
+        return (name || '').trim().toLowerCase();
+    }
+
+    // Decode a delta-encoded posting list from the inverted index (cached)
+    getPostings(group, key, subKey) {
+        const cacheKey = `${group}\u0000${key}\u0000${subKey || ''}`;
+        if (this.decodedPostings.has(cacheKey)) return this.decodedPostings.get(cacheKey);
+
+        let deltas = this.index[group]?.[key];
+        if (subKey !== undefined) deltas = deltas?.[subKey];
+        const positions = new Array((deltas || []).length);
+        let position = 0;
+        (deltas || []).forEach((delta, i) => {
+            position += delta;
+            positions[i] = position;
+        });
+        this.decodedPostings.set(cacheKey, positions);
+        return positions;
+    }
+
+    // Fight positions of the selected athlete, or null when the athlete index can't answer
+    // (no index, or a name it doesn't resolve): fights are then scanned by name
+    getAthleteFights() {
+        if (!this.athleteIndex || !this.filters.athlete) return null;
+        const id = this.athleteIndex.names[this.filters.athlete];
+        if (id === undefined) return null;
+
+        const cacheKey = `athletes\u0000${id}`;
+        if (this.decodedPostings.has(cacheKey)) return this.decodedPostings.get(cacheKey);
+        let position = 0;
+        const positions = this.athleteIndex.postings[id].map(delta => (position += delta));
+        this.decodedPostings.set(cacheKey, positions);
+        return positions;
+    }
+
+    // Same normalization as the Python pipeline: lowercase, accents folded, word tokens
+    tokenizeSearch(text) {
+        const folded = text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '').normalize('NFC');
+        return folded.match(/[\p{L}\p{N}_]+/gu) || [];
+    }
+
+    // First term id >= value in the sorted term dictionary
+    lowerBoundTerm(value) {
+        const terms = this.searchIndex.terms;
+        let lo = 0;
+        let hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (terms[mid] < value) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+
+    // Search without the index: the same fields, tokens and matching rules as SearchIndexBuilder
+    videoMatchesSearch(video, tokens) {
+        const words = this.tokenizeSearch([video.title || '', video.channel_name || '', ...(video.tags || [])].join(' '));
+        const minPrefix = this.searchIndex?.min_prefix ?? this.MIN_SEARCH_PREFIX;
+        return tokens.every(token => words.some(word => (token.length < minPrefix ? word === token : word.startsWith(token))));
+    }
+
+    // Ids of the terms a query token matches: exact for short tokens, by prefix otherwise
+    matchSearchTerms(token) {
+        const terms = this.searchIndex.terms;
+        const ids = [];
+        for (let id = this.lowerBoundTerm(token); id < terms.length && terms[id].startsWith(token); id++) {
+            if (token.length < this.searchIndex.min_prefix && terms[id] !== token) break;
+            ids.push(id);
+        }
+        return ids;
+    }
+
+    getSearchPostings(id) {
+        const cacheKey = `search\u0000${id}`;
+        if (this.decodedPostings.has(cacheKey)) return this.decodedPostings.get(cacheKey);
+        let position = 0;
+        const positions = this.searchIndex.postings[id].map(delta => (position += delta));
+        this.decodedPostings.set(cacheKey, positions);
+        return positions;
+    }
+
+    // Positions (in allVideos) matching every search token, or null when the search index can't answer
+    getSearchMatches() {
+        if (!this.searchIndex || !this.searchQuery) return null;
+        const tokens = this.tokenizeSearch(this.searchQuery);
+        if (tokens.length === 0) return null;
+
+        const lists = tokens.map(token => {
+            const ids = this.matchSearchTerms(token);
+            if (ids.length === 1) return this.getSearchPostings(ids[0]);
+            const union = new Set();
+            ids.forEach(id => this.getSearchPostings(id).forEach(position => union.add(position)));
+            return [...union].sort((a, b) => a - b);
+        });
+        lists.sort((a, b) => a.length - b.length);
+        return lists.reduce((acc, list) => this.intersectPostings(acc, list));
+    }
+
+    // Autocomplete the last word of the search box from the index's most frequent terms
+    updateSearchSuggestions(value) {
+        const datalist = document.getElementById('search-suggestions');
+        if (!datalist || !this.searchIndex) return;
+        datalist.innerHTML = '';
+
+        const match = value.match(/^(.*?)([\p{L}\p{N}_]+)$/u);
+        if (!match) return;
+        const [, before, word] = match;
+        const prefix = this.tokenizeSearch(word)[0];
+        if (!prefix) return;
+
+        let ids = this.searchIndex.completions[prefix];
+        if (!ids) {
+            ids = [];
+            const terms = this.searchIndex.terms;
+            for (let id = this.lowerBoundTerm(prefix); id < terms.length && terms[id].startsWith(prefix); id++) {
+                ids.push(id);
+            }
+            ids.sort((a, b) => this.searchIndex.counts[b] - this.searchIndex.counts[a]);
+            ids = ids.slice(0, 8);
+        }
+        ids.forEach(id => {
+            const option = document.createElement('option');
+            option.value = before + this.searchIndex.terms[id];
+            datalist.appendChild(option);
+        });
+    }
+
+    // Intersect two sorted posting lists
+    intersectPostings(a, b) {
+        const result = [];
+        let i = 0;
+        let j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] === b[j]) {
+                result.push(a[i]);
+                i++;
+                j++;
+            } else if (a[i] < b[j]) {
+                i++;
+            } else {
+                j++;
+            }
+        }
+        return result;
+    }
+
+    // Technique videos matching the active filters, via posting-list intersection
+    // Returns null when no indexed filter is active (every technique video is a candidate)
+    getTechniqueCandidates() {
+        const lists = [];
+        const category = this.filters.techniqueCategory;
+        if (category === 'escape') {
+            lists.push(this.getPostings('terms', 'technique', 'escape'));
+        } else if (category) {
+            lists.push(this.getPostings('categories', category));
+        }
+
+        const termFilters = {
+            guard_type: this.filters.guard,
+            pass: this.filters.pass,
+            sweep: this.filters.sweep,
+            position: this.filters.position,
+            submission: this.filters.submission,
+            takedown: this.filters.takedown,
+            escape: this.filters.escape
+        };
+        Object.entries(termFilters).forEach(([group, value]) => {
+            if (value) lists.push(this.getPostings('terms', group, value));
+        });
+
+        if (this.filters.channel) {
+            lists.push(this.getPostings('channels', this.channelKey(this.filters.channel)));
+        }
+
+        if (lists.length === 0) return null;
+        lists.sort((a, b) => a.length - b.length);
+        return lists.reduce((acc, list) => this.intersectPostings(acc, list));
+    }
+
+    // The shard answering the current view, or null when only the full catalogue can:
+    // no search, detail or athlete filter, and a channel or a technique category at most
+    getShard() {
+        const f = this.filters;
+        if (this.searchQuery || f.athlete || f.guard || f.pass || f.sweep || f.position || f.submission ||
+            f.takedown || f.escape) return null;
+        if (f.channel && f.techniqueCategory) return null;
+        if (f.channel) return this.manifest.channels[this.channelKey(f.channel)] || { file: null, count: 0 };
+        // Escapes are labels of the 'technique' category, which has no shard of its own
+        if (f.techniqueCategory === 'escape') return null;
+        if (f.techniqueCategory) return this.manifest.categories[f.techniqueCategory] || { file: null, count: 0 };
+        return { file: this.manifest.pages[this.sortBy][0], count: this.manifest.total };
+    }
+
+    // Newest first; videos without a publish date go last (like the date pages of video_shards.py)
+    compareDates(a, b) {
+        const dateA = a.published_at || '';
+        const dateB = b.published_at || '';
+        return dateA < dateB ? 1 : (dateA > dateB ? -1 : 0);
+    }
+
+    // Render a shard: shards are sorted by views, the date pages by date
+    showShard(videos, count) {
+        this.hiddenDuplicates = new Map();
+        this.filteredVideos = this.sortBy === 'date' ? [...videos].sort((a, b) => this.compareDates(a, b)) : videos;
+        this.renderVideos(count);
+        this.updateResultsCount(count);
+    }
+
+    async applyFilters() {
+        const sequence = ++this.renderSequence;
+        if (!this.catalogueLoaded) {
+            // Until the catalogue is downloaded, views a shard can answer only load that shard
+            const shard = this.manifest && this.getShard();
+            let videos = null;
+            try {
+                if (shard) videos = shard.file ? await this.loadShard(shard.file) : [];
+            } catch (error) {
+                console.warn('Shard not available, loading the full catalogue:', error);
+            }
+            if (videos) {
+                if (sequence === this.renderSequence) this.showShard(videos, shard.count);
+                return;
+            }
+            try {
+                await this.loadCatalogue();
+            } catch (error) {
+                console.error('Error loading videos:', error);
+                this.showError('Failed to load videos. Please check if bjj_simple_processed.json exists.');
+                return;
+            }
+            if (sequence !== this.renderSequence) return;
+        }
+
+        // With the inverted index, only technique videos in the posting-list intersection are scanned
+        // Candidate positions in allVideos (technique videos first, then fights); null means all videos
+        let positions = null;
+        // With the athlete index, only the resolved athlete's fights can match (technique videos never do)
+        const athleteFights = this.getAthleteFights();
+        if (athleteFights) {
+            positions = athleteFights.map(i => i + this.videos.length);
+        } else if (this.index) {
+            const techniquePositions = this.getTechniqueCandidates();
+            if (techniquePositions) {
+                positions = techniquePositions.concat(this.fightVideos.map((_, i) => i + this.videos.length));
+            }
+        }
+        // With the search index, the search box is answered by posting lists too
+        const searchMatches = this.getSearchMatches();
+        if (searchMatches) {
+            positions = positions ? this.intersectPostings(positions, searchMatches) : searchMatches;
+        }
+        const candidates = positions ? positions.map(i => this.allVideos[i]) : this.allVideos;
+        const searchTokens = this.searchQuery && !searchMatches ? this.tokenizeSearch(this.searchQuery) : [];
+
+        this.filteredVideos = candidates.filter(video => {
+            // Search filter (already applied by the search index)
+            if (searchTokens.length && !this.videoMatchesSearch(video, searchTokens)) {
+                return false;
             }
 
             // Channel filter (applies to both fight and technique videos)
             if (this.filters.channel) {
-                const hasChannel = video.channel_name?.toLowerCase() === this.filters.channel;
+                const hasChannel = this.channelKey(video.channel_name) === this.channelKey(this.filters.channel);
                 if (!hasChannel) return false;
             }
 
@@ -390,29 +795,19 @@ class BJJFoundation {
 
             // For fight videos (have athletes field)
             if (video.isFight) {
-                // If technique filters are set, hide all fight videos
-                if (hasTechniqueFilters) {
-                    return false;
+                // If athlete filter is set, must match (already resolved by the athlete index)
+                if (hasAthleteFilter && !athleteFights) {
+                    if (!this.fightHasAthlete(video, this.filters.athlete)) return false;
                 }
                 
-                // If athlete filter is set, must match
-                if (hasAthleteFilter) {
-                    if (!video.athletes || !Array.isArray(video.athletes)) {
-                        return false;
-                    }
-                    const hasAthlete = video.athletes.some(athlete => 
-                        athlete.toLowerCase().includes(this.filters.athlete)
-                    );
-                    return hasAthlete;
+                // No technique filters active - show fight video
+                if (!hasTechniqueFilters) {
+                    return true;
                 }
-                
-                // No filters active - show fight video
-                return true;
-            }
-
-            // For technique videos (no athletes field)
-            // If athlete filter is set, hide all technique videos
-            if (hasAthleteFilter) {
+                // Classified fights (fight_processed.json) go through the technique filters below
+            } else if (hasAthleteFilter) {
+                // For technique videos (no athletes field)
+                // If athlete filter is set, hide all technique videos
                 return false;
             }
             
@@ -499,11 +894,33 @@ class BJJFoundation {
             return viewsB - viewsA;
         });
 
+        this.collapseDuplicates();
+        if (this.sortBy === 'date') {
+            this.filteredVideos.sort((a, b) => this.compareDates(a, b));
+        }
+
         this.renderVideos();
         this.updateResultsCount();
     }
 
-    renderVideos() {
+    // Keep only the most viewed matching video of each near-duplicate cluster (list is sorted by views)
+    collapseDuplicates() {
+        this.hiddenDuplicates = new Map();
+        const shown = new Map(); // cluster -> video kept for it
+        this.filteredVideos = this.filteredVideos.filter(video => {
+            if (video.duplicateCluster === undefined) return true;
+            const kept = shown.get(video.duplicateCluster);
+            if (!kept) {
+                shown.set(video.duplicateCluster, video);
+                return true;
+            }
+            this.hiddenDuplicates.set(kept, (this.hiddenDuplicates.get(kept) || 0) + 1);
+            return false;
+        });
+    }
+
+    // matches: number of matching videos, when filteredVideos only holds the first page of them
+    renderVideos(matches = this.filteredVideos.length) {
         const grid = document.getElementById('videos-grid');
         const loading = document.getElementById('loading');
         const noResults = document.getElementById('no-results');
@@ -540,10 +957,10 @@ class BJJFoundation {
         grid.appendChild(fragment);
 
         // If we trimmed the results, show a small hint at the bottom
-        if (this.filteredVideos.length > maxToRender) {
+        if (matches > maxToRender) {
             const hint = document.createElement('div');
             hint.className = 'results-hint';
-            hint.textContent = `Showing ${maxToRender} of ${this.filteredVideos.length} matches — refine search or filters to see more`;
+            hint.textContent = `Showing ${maxToRender} of ${matches} matches — refine search or filters to see more`;
             hint.style.marginTop = '12px';
             hint.style.color = 'var(--text-secondary)';
             hint.style.textAlign = 'center';
@@ -564,6 +981,12 @@ class BJJFoundation {
         // Get language flag
         const languageFlag = this.getLanguageFlag(video.language);
 
+        // Near-duplicate reuploads collapsed into this card
+        const hiddenDuplicates = this.hiddenDuplicates.get(video) || 0;
+
+        // Precomputed similar videos, if any
+        const similar = this.getSimilarVideos(video);
+
         // Create tags HTML
         const tagsHTML = this.createTagsHTML(video.classification, video);
 
@@ -578,12 +1001,21 @@ class BJJFoundation {
             <div class="video-content">
                 <h3 class="video-title">${this.escapeHtml(video.title)}</h3>
                 ${video.view_count ? `<div class="video-views">👁️ ${this.formatViews(video.view_count)} views</div>` : ''}
+                ${hiddenDuplicates ? `<div class="video-duplicates">+${hiddenDuplicates} similar upload${hiddenDuplicates > 1 ? 's' : ''}</div>` : ''}
                 <div class="video-tags">
                     ${tagsHTML}
                 </div>
+                ${similar.length ? '<button class="similar-button">More like this</button>' : ''}
             </div>
         `;
 
+        if (similar.length) {
+            card.querySelector('.similar-button').addEventListener('click', (e) => {
+                e.stopPropagation(); // Don't open the video
+                this.showSimilar(video, similar);
+            });
+        }
+
         // Add click event to open YouTube video
         card.addEventListener('click', () => {
             window.open(video.youtube_link, '_blank');
@@ -592,6 +1024,22 @@ class BJJFoundation {
         return card;
     }
 
+    getSimilarVideos(video) {
+        const position = this.videoPositions.get(video);
+        if (!this.similarVideos || position === undefined) return [];
+        return this.similarVideos[position].map(i => this.videos[i]);
+    }
+
+    // Show a video followed by its most similar videos (any filter change goes back to the filtered list)
+    showSimilar(video, similar) {
+        this.hiddenDuplicates = new Map();
+        this.filteredVideos = [video, ...similar];
+        this.renderVideos();
+        document.getElementById('results-count').textContent =
+            `Showing ${similar.length} videos similar to "${video.title}"`;
+        document.getElementById('videos-grid').scrollIntoView({ behavior: 'smooth' });
+    }
+
     createTagsHTML(classification, video) {
         const tags = [];
 
@@ -726,10 +1174,9 @@ class BJJFoundation {
         return flag || '🌐'; // Globe emoji as fallback
     }
 
-    updateResultsCount() {
+    updateResultsCount(filtered = this.filteredVideos.length) {
         const count = document.getElementById('results-count');
-        const total = this.allVideos.length;
-        const filtered = this.filteredVideos.length;
+        const total = this.catalogueLoaded ? this.allVideos.length : this.manifest.total;
 
         if (filtered === total) {
             count.textContent = `Showing all ${total} techniques`;
@@ -758,6 +1205,10 @@ class BJJFoundation {
             athlete: ''
         };
 
+        this.sortBy = 'views';
+        const sortSelect = document.getElementById('sort-filter');
+        if (sortSelect) sortSelect.value = 'views';
+
         // Reset search
         this.searchQuery = '';
         document.getElementById('search-input').value = '';
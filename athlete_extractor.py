@@ -0,0 +1,194 @@
+"""
+Athlete name extraction for fight/match video titles
+All patterns are compiled once at import time, and a gazetteer of known
+athletes (TOP_ATHLETES in app.js plus names from the "vs" titles of past
+scrapes) is compiled into a single longest-first regex, so a batch of titles
+resolves in one pass:
+- "Name1 vs Name2" titles are split on the first separator, each side is
+  resolved against the gazetteer, then cleaned with the name heuristics
+- titles without a separator still report the known athletes they mention
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from typing import Iterable, List
+
+from text_normalize import fold_accents
+
+
+APP_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.js')
+
+# A name from past "vs" titles joins the gazetteer once it was seen in this many titles
+MIN_PAST_OCCURRENCES = 2
+
+# " vs ", " vs. ", " v. ", " v " (case-sensitive, like the scraper always matched them)
+_SEPARATOR = re.compile(r" (?:vs\.?|v\.?) ")
+_PARENS = re.compile(r"\(.*?\)")
+_SECONDARY_SEPARATOR = re.compile(r"\|| — | – | - |:|\u2013|\u2014")
+_EVENT_WORDS = re.compile(
+    r"\b(Highlights|Highlight|Full Match|Full Fight|Replay|Semifinal|Final|Quarterfinal|Quarter-finals|"
+    r"Round\s*\d+|ADCC|IBJJF|Polaris|Eternal|202\d)\b", re.I
+)
+_YEAR = re.compile(r"\b20\d{2}\b")
+_LEADING_NAME = re.compile(r"^([A-Z][\w'\.-]+(?:\s+(?:[A-Z][\w'\.-]+|de|da|do|dos|van|von|la|le|del|di)){0,4})")
+_LETTER = re.compile(r"[A-Za-z]")
+_FALLBACK_VS = re.compile(
+    r"([A-Z][\w'\.-]+(?:\s+[A-Z][\w'\.-]+)*)\s+vs\.?\s+([A-Z][\w'\.-]+(?:\s+[A-Z][\w'\.-]+)*)", re.I
+)
+_NON_NAME = re.compile(r"[\W_]+")
+_TOP_ATHLETES = re.compile(r"this\.TOP_ATHLETES\s*=\s*\[(.*?)\]", re.S)
+_JS_STRING = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+
+def normalize_name(name: str) -> str:
+    """Gazetteer key: lowercase, accent-folded words separated by single spaces"""
+    return _NON_NAME.sub(' ', fold_accents(name.lower())).strip()
+
+
+def _remove_trailing_event_info(side: str) -> str:
+    # Keep the first chunk before a secondary separator, drop event words and years
+    side = _SECONDARY_SEPARATOR.split(side, 1)[0]
+    side = _EVENT_WORDS.sub("", side)
+    return _YEAR.sub("", side).strip()
+
+
+def _leading_name_hint(side: str) -> str:
+    # A leading capitalized name of up to 5 words (particles like 'de', 'van' allowed)
+    m = _LEADING_NAME.match(side)
+    return m.group(1).strip() if m else side.strip()
+
+
+class AthleteExtractor:
+    """Extracts athlete names from titles and maps known spellings to one canonical name"""
+
+    def __init__(self, known_athletes: Iterable[str] = ()):
+        self.gazetteer = {}         # normalized name -> canonical display name
+        self._pattern = None
+        for name in known_athletes:
+            self.add(name)
+
+    def add(self, name: str):
+        """Add a known athlete; the first spelling added for a normalized name wins"""
+        key = normalize_name(name)
+        if key and key not in self.gazetteer:
+            self.gazetteer[key] = name.strip()
+            self._pattern = None
+
+    def canonical(self, name: str) -> str:
+        """Canonical spelling of a known athlete, or the name itself"""
+        return self.gazetteer.get(normalize_name(name), name)
+
+    def find_known(self, text: str) -> List[str]:
+        """Known athletes mentioned in text, in order of appearance (longest name wins on overlap)"""
+        if not self.gazetteer:
+            return []
+        if self._pattern is None:
+            # Normalized text is words separated by single spaces, so the space
+            # checks are word boundaries; longer names are tried first
+            names = sorted(self.gazetteer, key=len, reverse=True)
+            self._pattern = re.compile(r"(?<!\S)(?:" + "|".join(map(re.escape, names)) + r")(?!\S)")
+
+        found = []
+        for match in self._pattern.finditer(normalize_name(text)):
+            name = self.gazetteer[match.group()]
+            if name not in found:
+                found.append(name)
+        return found
+
+    def _resolve_side(self, side: str) -> str:
+        side = _PARENS.sub("", side).strip()
+        known = self.find_known(side)
+        if known:
+            return known[0]
+        return self.canonical(_leading_name_hint(_remove_trailing_event_info(side)))
+
+    def extract(self, title: str) -> List[str]:
+        """Athletes of one title: both sides of a 'vs' match, or the known athletes it mentions"""
+        if not title:
+            return []
+
+        # Normalize spacing / NBSP
+        title = title.replace('\xa0', ' ').strip()
+
+        m = _SEPARATOR.search(title)
+        if m:
+            left = self._resolve_side(title[:m.start()])
+            right = self._resolve_side(title[m.end():])
+            if _LETTER.search(left) and _LETTER.search(right):
+                return [left, right]
+
+        # Fallback regex: 'Name1 vs Name2' anywhere in title
+        m = _FALLBACK_VS.search(title)
+        if m:
+            return [self.canonical(m.group(1).strip()), self.canonical(m.group(2).strip())]
+
+        return self.find_known(title)[:2]
+
+    def extract_batch(self, titles: Iterable[str]) -> List[List[str]]:
+        """Extract athletes from many titles; repeated titles are resolved once"""
+        results = {}
+        extracted = []
+        for title in titles:
+            athletes = results.get(title)
+            if athletes is None:
+                athletes = results[title] = self.extract(title)
+            extracted.append(list(athletes))
+        return extracted
+
+
+def load_top_athletes(app_js: str = APP_JS) -> List[str]:
+    """Read the TOP_ATHLETES list of the web app, so both sides share one list"""
+    try:
+        with open(app_js, 'r', encoding='utf-8') as f:
+            m = _TOP_ATHLETES.search(f.read())
+    except OSError:
+        return []
+    if not m:
+        return []
+    return [single or double for single, double in _JS_STRING.findall(m.group(1))]
+
+
+def load_past_athletes(files: Iterable[str], min_occurrences: int = MIN_PAST_OCCURRENCES) -> List[str]:
+    """
+    Names found on either side of the "vs" titles of previous scrapes (fight JSON files)
+    Titles are split again without a gazetteer rather than reading the stored
+    'athletes' field, so names that only came from gazetteer hits never feed
+    back into it. Only multi-word names without event words seen in at least
+    min_occurrences titles are kept, so one bad split does not pollute the gazetteer
+    """
+    splitter = AthleteExtractor()
+    counts = Counter()
+    for path in files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                videos = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        titles = [video.get('title') or '' for video in videos if isinstance(video, dict)]
+        for athletes in splitter.extract_batch(titles):
+            for name in athletes:
+                words = normalize_name(name).split()
+                if 2 <= len(words) <= 4 and not _EVENT_WORDS.search(name) and not any(w.isdigit() for w in words):
+                    counts[name.strip()] += 1
+    return [name for name, count in counts.most_common() if count >= min_occurrences]
+
+
+def build_extractor(app_js: str = APP_JS, past_files: Iterable[str] = ('fight_simple.json',)) -> AthleteExtractor:
+    """Extractor seeded with TOP_ATHLETES first (their spelling is canonical), then past "vs" titles"""
+    extractor = AthleteExtractor(load_top_athletes(app_js))
+    for name in load_past_athletes(past_files):
+        extractor.add(name)
+    return extractor
+
+
+_DEFAULT_EXTRACTOR = None
+
+
+def extract_athletes_from_title(title: str) -> List[str]:
+    """Extract athletes from one title with the default gazetteer (built on first use)"""
+    global _DEFAULT_EXTRACTOR
+    if _DEFAULT_EXTRACTOR is None:
+        _DEFAULT_EXTRACTOR = build_extractor()
+    return _DEFAULT_EXTRACTOR.extract(title)
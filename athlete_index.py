@@ -0,0 +1,245 @@
+"""
+Athlete entity resolution and athlete -> fight indexes
+Extracted names vary ("Gordon Ryan", "G. Ryan", "Gordon Ryan (USA)"), so the
+names of all fights are clustered into canonical athletes before indexing:
+- spellings that normalize identically are one athlete
+- remaining names are only compared inside blocks sharing the Soundex code
+  of their surname, so there are no all-pairs comparisons
+- inside a block, names merge when their surnames match and their given names
+  match or differ by one typo (a swap of two letters counts as one); "G. Ryan" joins the single full name it can abbreviate
+The result is a canonical athlete table, an athlete -> fight posting list and
+a head-to-head pair -> fight posting list (delta-encoded, positions in the fight JSON)
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from athlete_extractor import build_extractor, normalize_name
+from inverted_index import encode_postings
+from json_artifacts import save_json
+
+
+ATHLETE_INDEX_FORMAT = 1
+ATHLETE_INDEX_FILE = 'athlete_index.json'
+
+# Tokens ignored when picking a surname ("Rafa Lovato Jr.")
+NAME_SUFFIXES = {'jr', 'sr', 'junior', 'ii', 'iii', 'iv'}
+
+_PARENS = re.compile(r"\(.*?\)")
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6'
+}
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a normalized (lowercase ASCII) word"""
+    letters = [char for char in word if 'a' <= char <= 'z']
+    if not letters:
+        return word
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # 'h' and 'w' do not separate letters with the same code, vowels do
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    # One substitution, insertion, deletion or swap of adjacent letters
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) != len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2]
+                                      and a[i + 2:] == b[i + 2:])
+
+
+class _NameForm:
+    """One normalized spelling and the parts used to compare it"""
+
+    def __init__(self, key: str):
+        self.key = key
+        tokens = key.split()
+        core = [token for token in tokens if token not in NAME_SUFFIXES] or tokens
+        self.surname = core[-1]
+        self.given = core[0] if len(core) > 1 else ''
+
+    @property
+    def is_initial(self) -> bool:
+        return len(self.given) == 1
+
+    def same_person(self, other: '_NameForm') -> bool:
+        """Full names with the same surname and given name, allowing one typo in names of 4+ letters"""
+        if not self.given or not other.given or self.is_initial or other.is_initial:
+            return False
+        if self.surname != other.surname and not (
+                min(len(self.surname), len(other.surname)) >= 4
+                and _within_one_edit(self.surname, other.surname)):
+            return False
+        if self.given == other.given:
+            return True
+        return min(len(self.given), len(other.given)) >= 4 and _within_one_edit(self.given, other.given)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def resolve_athletes(mentions: Counter, known_athletes: Dict[str, str] = None) -> Tuple[List[dict], Dict[str, int]]:
+    """
+    Cluster raw athlete names (with their mention counts) into canonical athletes
+    known_athletes maps normalized names to preferred display names (the gazetteer)
+    Returns ([{name, aliases}], raw name -> athlete id)
+    """
+    known_athletes = known_athletes or {}
+
+    # Spellings that normalize the same are merged up front
+    raw_by_key = {}
+    for raw in mentions:
+        key = normalize_name(_PARENS.sub('', raw))
+        if key and any(char.isalpha() for char in key):
+            raw_by_key.setdefault(key, []).append(raw)
+
+    forms = {key: _NameForm(key) for key in raw_by_key}
+    blocks = {}
+    for form in forms.values():
+        blocks.setdefault(soundex(form.surname), []).append(form)
+
+    clusters = _UnionFind()
+    for block in blocks.values():
+        full = [form for form in block if form.given and not form.is_initial]
+        for i, form in enumerate(full):
+            clusters.find(form.key)
+            for other in full[i + 1:]:
+                if form.same_person(other):
+                    clusters.union(form.key, other.key)
+
+        # "g ryan" joins the full names it abbreviates, if they are all one athlete
+        for form in block:
+            clusters.find(form.key)
+            if not form.is_initial:
+                continue
+            targets = {clusters.find(other.key) for other in full
+                       if other.surname == form.surname and other.given[0] == form.given}
+            if len(targets) == 1:
+                clusters.union(form.key, targets.pop())
+
+    members = {}
+    for key in forms:
+        members.setdefault(clusters.find(key), []).append(key)
+
+    athletes = []
+    athlete_ids = {}
+    for keys in members.values():
+        spellings = Counter({raw: mentions[raw] for key in keys for raw in raw_by_key[key]})
+        known = [key for key in keys if key in known_athletes]
+        if known:
+            name = known_athletes[max(known, key=lambda key: sum(mentions[raw] for raw in raw_by_key[key]))]
+        else:
+            # Most mentioned full spelling; initials only when nothing else exists
+            name = max(spellings, key=lambda raw: (not forms[normalize_name(_PARENS.sub('', raw))].is_initial,
+                                                   spellings[raw], -len(raw)))
+        athlete_id = len(athletes)
+        athletes.append({'name': name, 'aliases': sorted(raw for raw in spellings if raw != name)})
+        for raw in spellings:
+            athlete_ids[raw] = athlete_id
+    return athletes, athlete_ids
+
+
+def build_athlete_index(fights: List[dict], known_athletes: Dict[str, str] = None, source: str = '') -> dict:
+    """Canonical athletes, athlete -> fights and head-to-head pair -> fights for a fight dataset"""
+    mentions = Counter()
+    for fight in fights:
+        for name in fight.get('athletes') or []:
+            mentions[name.strip()] += 1
+    athletes, athlete_ids = resolve_athletes(mentions, known_athletes)
+
+    postings = [[] for _ in athletes]
+    pairs = {}
+    for position, fight in enumerate(fights):
+        ids = sorted({athlete_ids[name.strip()] for name in fight.get('athletes') or []
+                      if name.strip() in athlete_ids})
+        for athlete_id in ids:
+            postings[athlete_id].append(position)
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                pairs.setdefault((first, second), []).append(position)
+
+    # Most active athletes first; ids are positions in this order
+    order = sorted(range(len(athletes)), key=lambda i: (-len(postings[i]), athletes[i]['name']))
+    new_id = {old: new for new, old in enumerate(order)}
+
+    names = {}
+    for old in order:
+        athlete = athletes[old]
+        for name in [athlete['name']] + athlete['aliases']:
+            names.setdefault(name.lower(), new_id[old])
+            names.setdefault(normalize_name(_PARENS.sub('', name)), new_id[old])
+
+    head_to_head = sorted(
+        (sorted((new_id[a], new_id[b])) + [positions] for (a, b), positions in pairs.items()),
+        key=lambda pair: (-len(pair[2]), pair[0], pair[1])
+    )
+    return {
+        'format': ATHLETE_INDEX_FORMAT,
+        'source': source,
+        'count': len(fights),
+        'athletes': [dict(athletes[old], fights=len(postings[old])) for old in order],
+        'names': names,
+        'postings': [encode_postings(postings[old]) for old in order],
+        'pairs': [[a, b, encode_postings(positions)] for a, b, positions in head_to_head]
+    }
+
+
+def save_athlete_index(fights: List[dict], index_file: str = ATHLETE_INDEX_FILE, source: str = '',
+                       known_athletes: Dict[str, str] = None, compress: bool = True) -> dict:
+    """Resolve athletes and write the index as compact JSON"""
+    index = build_athlete_index(fights, known_athletes, source)
+    save_json(index, index_file, compress=compress)
+    print(f"Athlete index saved to {index_file} ({len(index['athletes'])} athletes, "
+          f"{len(index['pairs'])} head-to-head pairs)")
+    return index
+
+
+def main():
+    """Rebuild the athlete index from an existing fight JSON file"""
+    parser = argparse.ArgumentParser(description="Resolve athlete names and index fights by athlete")
+    parser.add_argument('input', nargs='?', default='fight_simple.json', help="Fight JSON file with 'athletes'")
+    parser.add_argument('--output', default=ATHLETE_INDEX_FILE, help="Athlete index file")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        fights = json.load(f)
+    save_athlete_index(fights, args.output, source=args.input, known_athletes=build_extractor().gazetteer)
+
+
+if __name__ == '__main__':
+    main()
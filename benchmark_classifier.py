@@ -0,0 +1,300 @@
+"""
+BJJ Classifier Benchmark
+Measures classification throughput (videos/sec) and per-video latency (p50/p99)
+on synthetic videos built from the BJJ_GLOSSARY vocabulary, across corpus sizes
+and glossary sizes (the real glossary and synthetic glossaries up to 10x larger)
+Results are compared against the committed benchmark_baseline.json; a throughput
+regression beyond the tolerance makes the run exit with a non-zero status
+--relative compares how throughput scales with the glossary size instead (each
+glossary's throughput relative to the real glossary's on the same corpus), which
+does not depend on the machine, so CI can use a tight tolerance
+The baseline is only ever written by --update-baseline: cases missing from it
+are reported, not silently recorded
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Dict, Iterator, List
+
+from classify_bjj_videos import (
+    BJJ_GLOSSARY,
+    CATEGORY_GROUPS,
+    GUARD_EMOJIS,
+    GlossaryIndex
+)
+from text_normalize import normalize_text
+
+
+BASELINE_FILE = 'benchmark_baseline.json'
+
+# Quick run by default, --full goes up to 1M videos
+DEFAULT_CORPUS_SIZES = [1000, 10000]
+FULL_CORPUS_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_GLOSSARY_SCALES = [1, 10]
+
+# Allowed throughput drop compared to the baseline before the run fails
+DEFAULT_TOLERANCE = 0.25
+
+FILLER_WORDS = [
+    "how", "to", "the", "from", "vs", "and", "with", "a", "of", "for", "my", "best",
+    "bjj", "jiu", "jitsu", "nogi", "gi", "tutorial", "breakdown", "details", "beginners",
+    "advanced", "system", "instructional", "part", "1", "2", "3", "2024", "|", "-", ":",
+    "comment", "faire", "le", "la", "de", "pour", "débutants", "technique", "drill"
+]
+
+DESCRIPTION_WORDS = FILLER_WORDS + [
+    "subscribe", "channel", "link", "https://example.com", "instagram", "patreon",
+    "in", "this", "video", "we", "look", "at", "common", "mistakes", "when", "you"
+]
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    syllables = ["ka", "ri", "mo", "ze", "lu", "ta", "ne", "bo", "shi", "gra", "po", "vel"]
+    return ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+
+def build_scaled_glossary(scale: int, seed: int = 0):
+    """
+    Return (glossary, category_groups) with roughly `scale` times as many terms
+    Extra terms are variants of real keywords with a pseudo-word modifier, so
+    they share prefixes with the real vocabulary like genuine additions would
+    """
+    glossary = {term: list(keywords) for term, keywords in BJJ_GLOSSARY.items()}
+    category_groups = {category: list(terms) for category, terms in CATEGORY_GROUPS.items()}
+    if scale <= 1:
+        return glossary, category_groups
+
+    rng = random.Random(seed)
+    categories = list(category_groups)
+    for copy in range(1, scale):
+        for term, keywords in BJJ_GLOSSARY.items():
+            modifier = _pseudo_word(rng)
+            synthetic_term = f"{term}_{modifier}_{copy}"
+            glossary[synthetic_term] = [f"{keyword} {modifier}" for keyword in keywords]
+            category_groups[rng.choice(categories)].append(synthetic_term)
+    return glossary, category_groups
+
+
+def generate_videos(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield synthetic video records whose titles, descriptions and tags use real glossary keywords"""
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in BJJ_GLOSSARY.values() for keyword in keywords]
+
+    for i in range(count):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(3, 9))]
+        for _ in range(rng.choice([0, 1, 1, 2, 2, 3])):
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        title = ' '.join(words)
+        if rng.random() < 0.3:
+            title = title.title()
+
+        description_words = [rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(20, 120))]
+        for _ in range(rng.randint(0, 4)):
+            description_words.insert(rng.randint(0, len(description_words)), rng.choice(keywords))
+
+        yield {
+            'title': title,
+            'description': ' '.join(description_words),
+            'tags': rng.sample(keywords, rng.randint(0, 5)) + ['bjj'],
+            'youtube_link': f"https://www.youtube.com/watch?v=bench{i:07d}",
+            'view_count': rng.randint(0, 2000000)
+        }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(index: GlossaryIndex, corpus_size: int, text_mode: str, seed: int = 0) -> Dict:
+    """Classify a synthetic corpus with `index` and return throughput/latency figures"""
+    latencies = []
+    classified = 0
+    clock = time.perf_counter
+
+    for video in generate_videos(corpus_size, seed):
+        if text_mode == 'title':
+            raw_text = video['title']
+        else:
+            raw_text = f"{video['title']} {video['description']} {' '.join(video['tags'])}"
+
+        start = clock()
+        if index.classify_text(normalize_text(raw_text)):
+            classified += 1
+        latencies.append(clock() - start)
+
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        'videos': corpus_size,
+        'classified': classified,
+        'seconds': round(total, 4),
+        'videos_per_sec': round(corpus_size / total, 1) if total else 0.0,
+        'p50_us': round(_percentile(latencies, 0.50) * 1e6, 2),
+        'p99_us': round(_percentile(latencies, 0.99) * 1e6, 2)
+    }
+
+
+def run_benchmarks(corpus_sizes: List[int], glossary_scales: List[int], text_mode: str,
+                   repeat: int = 1) -> Dict[str, Dict]:
+    """
+    Run every (glossary scale, corpus size) combination, keyed like 'title/g1/n1000'
+    With repeat > 1 every case runs that many times, in turn with the other cases so
+    they all see the same machine load, and the fastest run is kept
+    """
+    indexes = {}
+    term_counts = {}
+    for scale in glossary_scales:
+        glossary, category_groups = build_scaled_glossary(scale)
+        term_counts[scale] = len(glossary)
+        start = time.perf_counter()
+        indexes[scale] = GlossaryIndex(glossary, category_groups, GUARD_EMOJIS)
+        compile_seconds = time.perf_counter() - start
+        print(f"Glossary x{scale}: {len(glossary)} terms, {len(indexes[scale].automaton.keywords)} keywords "
+              f"(compiled in {compile_seconds:.3f}s)")
+
+    results = {}
+    for _ in range(repeat):
+        for scale, index in indexes.items():
+            for corpus_size in corpus_sizes:
+                result = run_case(index, corpus_size, text_mode)
+                key = f"{text_mode}/g{scale}/n{corpus_size}"
+                if key not in results or result['videos_per_sec'] > results[key]['videos_per_sec']:
+                    result.update({'terms': term_counts[scale], 'keywords': len(index.automaton.keywords),
+                                   'glossary_scale': scale, 'runs': repeat})
+                    results[key] = result
+
+    print()
+    for key, result in results.items():
+        print(f"  {key:<24} {result['videos_per_sec']:>10.1f} videos/sec   "
+              f"p50 {result['p50_us']:>8.2f}us   p99 {result['p99_us']:>8.2f}us")
+    return results
+
+
+def scaling_ratios(results: Dict[str, Dict]) -> Dict[str, float]:
+    """Throughput of each larger glossary relative to the x1 glossary on the same corpus and text"""
+    ratios = {}
+    for key, result in results.items():
+        mode, scale, size = key.split('/')
+        reference = results.get(f"{mode}/g1/{size}")
+        if scale != 'g1' and reference and reference.get('videos_per_sec'):
+            ratios[key] = result['videos_per_sec'] / reference['videos_per_sec']
+    return ratios
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Return a description of every case whose throughput fell below the baseline tolerance"""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if not reference or not reference.get('videos_per_sec'):
+            continue
+        ratio = result['videos_per_sec'] / reference['videos_per_sec']
+        status = "REGRESSION" if ratio < 1 - tolerance else "ok"
+        print(f"  {key:<24} {ratio:>6.2f}x baseline  {status}")
+        if ratio < 1 - tolerance:
+            regressions.append(f"{key}: {result['videos_per_sec']} vs baseline {reference['videos_per_sec']} videos/sec")
+    return regressions
+
+
+def compare_scaling(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Return a description of every case whose glossary scaling ratio fell below the baseline tolerance"""
+    regressions = []
+    reference_ratios = scaling_ratios(baseline)
+    for key, ratio in scaling_ratios(results).items():
+        reference = reference_ratios.get(key)
+        if not reference:
+            continue
+        status = "REGRESSION" if ratio < reference * (1 - tolerance) else "ok"
+        print(f"  {key:<24} {ratio:>6.2f}x the x1 glossary (baseline {reference:.2f}x)  {status}")
+        if ratio < reference * (1 - tolerance):
+            regressions.append(f"{key}: {ratio:.2f}x vs baseline {reference:.2f}x the x1 glossary's throughput")
+    return regressions
+
+
+def save_baseline(baseline_file: str, baseline: Dict[str, Dict]):
+    """Write benchmark results to the baseline file"""
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump({'python': platform.python_version(), 'results': baseline}, f, indent=2)
+    print(f"\nBaseline saved to {baseline_file}")
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the BJJ video classifier")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help=f"Corpus sizes to run (default: {DEFAULT_CORPUS_SIZES})")
+    parser.add_argument('--full', action='store_true',
+                        help=f"Run the full corpus size sweep {FULL_CORPUS_SIZES}")
+    parser.add_argument('--glossary-scales', type=int, nargs='+', default=DEFAULT_GLOSSARY_SCALES,
+                        help=f"Glossary size multipliers (default: {DEFAULT_GLOSSARY_SCALES})")
+    parser.add_argument('--text', choices=['title', 'full'], default='title',
+                        help="Classify titles only (like process_bjj_videos) or title+description+tags")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Run every case this many times and keep the fastest run (default: 1)")
+    parser.add_argument('--relative', action='store_true',
+                        help="Compare throughput relative to the x1 glossary instead of absolute throughput, "
+                             "so the baseline machine does not matter")
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help=f"Baseline results file (default: {BASELINE_FILE})")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Record these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed throughput drop vs baseline (default: {DEFAULT_TOLERANCE})")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main execution function"""
+    args = parse_args()
+    corpus_sizes = args.sizes or (FULL_CORPUS_SIZES if args.full else DEFAULT_CORPUS_SIZES)
+
+    print("BJJ Classifier Benchmark")
+    print("="*60)
+    print(f"Python {platform.python_version()} on {platform.platform()}")
+
+    results = run_benchmarks(corpus_sizes, args.glossary_scales, args.text, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+
+    if args.update_baseline:
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline in {args.baseline}, nothing compared (record one with --update-baseline)")
+        return 0
+
+    regressions = []
+    if any(key in baseline for key in results):
+        print(f"\nComparing to {args.baseline} (tolerance {args.tolerance:.0%}):")
+        compare = compare_scaling if args.relative else compare_to_baseline
+        regressions = compare(results, baseline, args.tolerance)
+
+    missing = [key for key in results if key not in baseline]
+    if missing:
+        print(f"\nNot in the baseline, not compared (record them with --update-baseline): {', '.join(missing)}")
+
+    if regressions:
+        print("\n✗ Classifier performance regressed:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print("\n✓ No performance regression")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,24 @@ Reads bjj_videos_simple.json and classifies videos based on BJJ terminology
 Outputs to bjj_simple_processed.json with classification field
 """
 
+import argparse
+import hashlib
+import itertools
 import json
+import os
+import pickle
 import re
-from typing import Dict, List, Set
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from columnar_dataset import write_columnar
+from inverted_index import InvertedIndexBuilder
+from search_index import SEARCH_INDEX_FILE, SearchIndexBuilder
+from text_normalize import normalize_text
+from json_artifacts import atomic_open, compress_artifact, dumps, remove_compressed, save_json
+from video_shards import SHARDS_DIR, write_shards
 
 
 # BJJ Classification Categories with keywords (English + French)
@@ -1227,18 +1242,600 @@ CATEGORY_GROUPS = {
 }
 
 
-def normalize_text(text: str) -> str:
-    """Normalize text for comparison"""
-    if not text:
-        return ""
-    return text.lower().strip()
+def _is_word_char(char: str) -> bool:
+    """Match the definition of \\w used by the re module for str patterns"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over every glossary keyword
+    Finds all keyword occurrences in a single left-to-right pass over the text,
+    so the cost of a scan no longer grows with the number of keywords
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = []          # pattern id -> keyword
+        self._ids = {}              # keyword -> pattern id
+        self._goto = [{}]           # state -> {char: next state}
+        self._fail = [0]            # state -> failure link
+        self._output = [()]         # state -> ((pattern id, length), ...)
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        if not keyword or keyword in self._ids:
+            return
+        pattern_id = len(self.keywords)
+        self._ids[keyword] = pattern_id
+        self.keywords.append(keyword)
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = ((pattern_id, len(keyword)),)
+
+    def _link(self):
+        # Breadth-first walk so every failure link points at an already linked state
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit the outputs of the failure state (suffix keywords)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def pattern_id(self, keyword: str):
+        """Return the pattern id of a keyword, or None if it was not compiled"""
+        return self._ids.get(keyword)
+
+    def find_all(self, text: str, partial_hits: Dict[int, int] = None) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Return {pattern id: [(start, end), ...]} for every keyword occurrence
+        Spans follow re.finditer(r'\\b' + re.escape(keyword) + r'\\b', text) semantics:
+        word boundaries on both sides and no overlap between spans of the same keyword
+        partial_hits, if given, counts per pattern the occurrences rejected for
+        landing inside a longer word (profiling only)
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        text_length = len(text)
+        spans = {}
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = index + 1
+            for pattern_id, length in output[state]:
+                start = end - length
+                # \\b before and after the keyword
+                if ((start > 0 and _is_word_char(text[start - 1])) == _is_word_char(text[start])
+                        or (end < text_length and _is_word_char(text[end])) == _is_word_char(text[end - 1])):
+                    if partial_hits is not None:
+                        partial_hits[pattern_id] = partial_hits.get(pattern_id, 0) + 1
+                    continue
+                found = spans.get(pattern_id)
+                if found is None:
+                    spans[pattern_id] = [(start, end)]
+                elif start >= found[-1][1]:
+                    found.append((start, end))
+        return spans
+
+
+class ClassifierProfile:
+    """
+    Hot-path counters collected by GlossaryIndex while profiling is enabled
+    The automaton scans every keyword in one shared pass, so scan time is
+    recorded per video; per-term and per-keyword time is the overlap
+    resolution spent on their occurrences
+    Keyword counters are per automaton pattern, which several terms can share
+    """
+
+    def __init__(self):
+        self.texts = 0
+        self.fuzzy = 0                      # highest fuzzy edit distance used (0: fuzzy tier off)
+        self.scan_seconds = 0.0
+        self.fuzzy_seconds = 0.0
+        self.resolve_seconds = 0.0
+        self.keyword_hits = {}              # pattern id -> whole-word occurrences
+        self.keyword_partial_hits = {}      # pattern id -> occurrences inside longer words
+        self.keyword_matches = {}           # pattern id -> occurrences that matched their term
+        self.keyword_rejections = {}        # pattern id -> occurrences overlapping a more specific term
+        self.keyword_seconds = {}           # pattern id -> resolution time
+        self.term_matches = {}              # term -> texts it matched
+        self.term_rejections = {}           # term -> overlap rejections
+        self.term_seconds = {}              # term -> resolution time
+
+    @staticmethod
+    def _add(counter: dict, key, amount=1):
+        counter[key] = counter.get(key, 0) + amount
+
+    def to_dict(self, index: 'GlossaryIndex') -> dict:
+        """
+        Machine-readable report: one entry per term and one per keyword pattern
+        (with the terms sharing it, so its counts appear once); a term's hits are
+        the occurrences of its own patterns
+        """
+        keywords = []
+        for pattern_id, keyword in enumerate(index.automaton.keywords):
+            keywords.append({
+                'pattern_id': pattern_id,
+                'keyword': keyword,
+                'terms': [index.term_priority[rank] for rank in index.pattern_terms[pattern_id]],
+                'hits': self.keyword_hits.get(pattern_id, 0),
+                'partial_hits': self.keyword_partial_hits.get(pattern_id, 0),
+                'matches': self.keyword_matches.get(pattern_id, 0),
+                'overlap_rejections': self.keyword_rejections.get(pattern_id, 0),
+                'resolve_us': round(self.keyword_seconds.get(pattern_id, 0.0) * 1e6, 2)
+            })
+        terms = []
+        for rank, term in enumerate(index.term_priority):
+            terms.append({
+                'term': term,
+                'priority': rank,
+                'hits': sum(keywords[pattern_id]['hits'] for pattern_id in index.term_patterns[rank]),
+                'matches': self.term_matches.get(term, 0),
+                'overlap_rejections': self.term_rejections.get(term, 0),
+                'resolve_us': round(self.term_seconds.get(term, 0.0) * 1e6, 2)
+            })
+        report = {
+            'glossary_version': index.version,
+            'texts': self.texts,
+            'scan_seconds': round(self.scan_seconds, 6),
+            'resolve_seconds': round(self.resolve_seconds, 6),
+            'terms': terms,
+            'keywords': keywords,
+            'dead_keywords': [k['keyword'] for k in keywords if not k['hits']],
+            'dead_terms': [t['term'] for t in terms if not t['hits']]
+        }
+        if self.fuzzy:
+            report['fuzzy'] = self.fuzzy
+            report['fuzzy_seconds'] = round(self.fuzzy_seconds, 6)
+        return report
+
+    def print_report(self, index: 'GlossaryIndex', top: int = 15):
+        """Print the costliest keywords and terms and the patterns that never match"""
+        report = self.to_dict(index)
+        texts = max(report['texts'], 1)
+
+        print("\n" + "="*60)
+        print("Classifier Profile")
+        print("="*60)
+        print(f"Texts classified: {report['texts']}")
+        print(f"Automaton scan:   {report['scan_seconds']:.3f}s ({report['scan_seconds'] / texts * 1e6:.1f}us per text)")
+        if 'fuzzy_seconds' in report:
+            print(f"Fuzzy lookups:    {report['fuzzy_seconds']:.3f}s ({report['fuzzy_seconds'] / texts * 1e6:.1f}us per text)")
+        print(f"Overlap resolve:  {report['resolve_seconds']:.3f}s ({report['resolve_seconds'] / texts * 1e6:.1f}us per text)")
+
+        # Every occurrence (whole-word or not) costs boundary checks in the scan
+        print(f"\nCostliest keywords (occurrences scanned, top {top}):")
+        ranked = sorted(report['keywords'], key=lambda k: (k['hits'] + k['partial_hits'], k['resolve_us']), reverse=True)
+        for k in ranked[:top]:
+            print(f"  {k['keyword'][:30]:<30} {', '.join(k['terms'])[:22]:<22} hits {k['hits']:>7}  partial {k['partial_hits']:>7}  "
+                  f"matched {k['matches']:>7}  rejected {k['overlap_rejections']:>6}  {k['resolve_us']:>10.1f}us")
+
+        print(f"\nCostliest terms (resolution time, top {top}):")
+        for t in sorted(report['terms'], key=lambda t: t['resolve_us'], reverse=True)[:top]:
+            print(f"  {t['term'][:30]:<30} matches {t['matches']:>7}  rejected {t['overlap_rejections']:>6}  "
+                  f"{t['resolve_us']:>10.1f}us")
+
+        print(f"\nDead keywords (never matched): {len(report['dead_keywords'])} of {len(report['keywords'])}")
+        print(f"Dead terms (no keyword ever matched): {len(report['dead_terms'])} of {len(report['terms'])}")
+        for term in report['dead_terms'][:top]:
+            print(f"  {term}")
+
+
+# Classification categories in the order they appear in the output
+CLASSIFICATION_CATEGORIES = [
+    "guard_type",
+    "position",
+    "pass",
+    "sweep",
+    "submission",
+    "technique",
+    "takedown"
+]
+
+# Where compiled glossary indexes are cached between runs
+GLOSSARY_CACHE_DIR = '.bjj_cache'
+
+# Bump when the GlossaryIndex layout or matching rules change to invalidate old caches
+GLOSSARY_INDEX_FORMAT = 3
+
+# Fuzzy tier: only words at least this long are looked up, and only up to edit
+# distance 1 below FUZZY_LONG_WORD characters (2 from there on)
+FUZZY_MIN_WORD = 6
+FUZZY_LONG_WORD = 10
+FUZZY_LOOKUP_CACHE_SIZE = 50000
+
+_WORD = re.compile(r'\w+')
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _bk_insert(tree: list, word: str):
+    # BK-tree nodes are [word, {distance: child node}] so the tree pickles as builtins
+    if not tree:
+        tree.extend([word, {}])
+        return
+    node = tree
+    while True:
+        distance = _edit_distance(word, node[0])
+        if distance == 0:
+            return
+        child = node[1].get(distance)
+        if child is None:
+            node[1][distance] = [word, {}]
+            return
+        node = child
+
+
+def _bk_search(tree: list, word: str, limit: int) -> List[Tuple[int, str]]:
+    """(distance, word) for every word of the tree within limit edits of word"""
+    found = []
+    stack = [tree] if tree else []
+    while stack:
+        node_word, children = stack.pop()
+        distance = _edit_distance(word, node_word)
+        if distance <= limit:
+            found.append((distance, node_word))
+        # Triangle inequality: only children at distance - limit .. distance + limit can match
+        for child_distance, child in children.items():
+            if distance - limit <= child_distance <= distance + limit:
+                stack.append(child)
+    return found
+
+
+def glossary_version(glossary: Dict[str, List[str]] = None,
+                     category_groups: Dict[str, List[str]] = None,
+                     guard_emojis: Dict[str, str] = None) -> str:
+    """Hash everything that influences classification results"""
+    payload = json.dumps({
+        "format": GLOSSARY_INDEX_FORMAT,
+        "glossary": BJJ_GLOSSARY if glossary is None else glossary,
+        "category_groups": CATEGORY_GROUPS if category_groups is None else category_groups,
+        "guard_emojis": GUARD_EMOJIS if guard_emojis is None else guard_emojis
+    }, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GlossaryIndex:
+    """
+    Compiled form of BJJ_GLOSSARY, CATEGORY_GROUPS and GUARD_EMOJIS
+    Holds the term priority order, the keyword automaton, the term -> category
+    reverse map and the formatted display labels, so classify_video only has
+    to scan the text and resolve overlaps
+    """
+
+    # Set to a ClassifierProfile to collect hot-path statistics
+    profile = None
+
+    # Memoized fuzzy lookups, never persisted with the index
+    _fuzzy_lookups = None
+
+    def __init__(self, glossary: Dict[str, List[str]] = None,
+                 category_groups: Dict[str, List[str]] = None,
+                 guard_emojis: Dict[str, str] = None):
+        glossary = BJJ_GLOSSARY if glossary is None else glossary
+        category_groups = CATEGORY_GROUPS if category_groups is None else category_groups
+        guard_emojis = GUARD_EMOJIS if guard_emojis is None else guard_emojis
+
+        self.version = glossary_version(glossary, category_groups, guard_emojis)
+
+        # Keywords are normalized like the text, so accented and unaccented
+        # variants ("clé de talon"/"cle de talon") collapse into one pattern
+        term_keywords = {}
+        for term, keywords in glossary.items():
+            folded = list(dict.fromkeys(normalize_text(keyword) for keyword in keywords))
+            if any(folded):
+                term_keywords[term] = [keyword for keyword in folded if keyword]
+
+        # Priority based on keyword length (longer = more specific = higher priority)
+        # The sort is stable, so ties keep their glossary order
+        # This prevents "single leg" from matching before "single leg x"
+        terms = list(term_keywords)
+        terms.sort(reverse=True, key=lambda term: max(len(kw) for kw in term_keywords[term]))
+        self.term_priority = terms
+
+        self.automaton = KeywordAutomaton(
+            [keyword for term in terms for keyword in term_keywords[term]]
+        )
+
+        # term rank -> pattern ids in keyword order, pattern id -> term ranks using it
+        self.term_patterns = []
+        self.pattern_terms = [[] for _ in self.automaton.keywords]
+        for rank, term in enumerate(terms):
+            pattern_ids = []
+            for keyword in term_keywords[term]:
+                pattern_id = self.automaton.pattern_id(keyword)
+                if pattern_id is not None and pattern_id not in pattern_ids:
+                    pattern_ids.append(pattern_id)
+                    self.pattern_terms[pattern_id].append(rank)
+            self.term_patterns.append(pattern_ids)
+
+        # Fuzzy tier: a BK-tree over single-word keywords, and every word that
+        # appears in some keyword (those are spelled right, never looked up)
+        self.keyword_words = {word for keyword in self.automaton.keywords for word in _WORD.findall(keyword)}
+        self.fuzzy_tree = []
+        for keyword in self.automaton.keywords:
+            if len(keyword) >= FUZZY_MIN_WORD and _WORD.fullmatch(keyword):
+                _bk_insert(self.fuzzy_tree, keyword)
+
+        # Reverse map: term -> [(category order, position in group, category, label), ...]
+        categories = CLASSIFICATION_CATEGORIES + [
+            category for category in category_groups if category not in CLASSIFICATION_CATEGORIES
+        ]
+        self.term_categories = {}
+        for category, group_terms in category_groups.items():
+            category_rank = categories.index(category)
+            for position, term in enumerate(group_terms):
+                self.term_categories.setdefault(term, []).append(
+                    (category_rank, position, category, self._format_label(category, term, guard_emojis))
+                )
+
+    @staticmethod
+    def _format_label(category: str, term: str, guard_emojis: Dict[str, str]) -> str:
+        # Convert underscore to space and title case for readability
+        label = term.replace("_", " ").title()
+
+        # Add emoji for guard types
+        if category == "guard_type" and term in guard_emojis:
+            label = f"{guard_emojis[term]} {label}"
+        return label
 
+    def fuzzy_lookup(self, word: str, max_distance: int) -> Tuple[int, ...]:
+        """
+        Pattern ids of the single-word keywords closest to a misspelled word
+        Candidates must start with the same letter and be within max_distance
+        edits (at most 1 for words shorter than FUZZY_LONG_WORD)
+        """
+        if self._fuzzy_lookups is None:
+            self._fuzzy_lookups = {}
+        key = (word, max_distance)
+        found = self._fuzzy_lookups.get(key)
+        if found is None:
+            limit = min(max_distance, 1 if len(word) < FUZZY_LONG_WORD else 2)
+            candidates = [(distance, keyword) for distance, keyword in _bk_search(self.fuzzy_tree, word, limit)
+                          if keyword[0] == word[0]]
+            best = min((distance for distance, _ in candidates), default=None)
+            found = tuple(sorted(self.automaton.pattern_id(keyword)
+                                 for distance, keyword in candidates if distance == best))
+            if len(self._fuzzy_lookups) >= FUZZY_LOOKUP_CACHE_SIZE:
+                self._fuzzy_lookups.clear()
+            self._fuzzy_lookups[key] = found
+        return found
 
-def classify_video(title: str, description: str = '', tags: List[str] = None) -> Dict[str, List[str]]:
+    def _add_fuzzy_spans(self, text: str, keyword_spans: Dict[int, List[Tuple[int, int]]], max_distance: int):
+        # Only words no exact keyword occurrence touches are looked up; their
+        # spans go after the exact ones, so exact occurrences are claimed first
+        covered = [span for spans in keyword_spans.values() for span in spans]
+        for match in _WORD.finditer(text):
+            word = match.group()
+            if len(word) < FUZZY_MIN_WORD or word in self.keyword_words or word.isdigit():
+                continue
+            start, end = match.span()
+            if any(span_start < end and span_end > start for span_start, span_end in covered):
+                continue
+            for pattern_id in self.fuzzy_lookup(word, max_distance):
+                keyword_spans.setdefault(pattern_id, []).append((start, end))
+
+    def match_terms(self, text: str, fuzzy: int = 0) -> List[str]:
+        """
+        Return the glossary terms found in already normalized text, in priority order
+        Each term claims the first occurrence of its keywords that does not overlap
+        a span claimed by a more specific term
+        fuzzy > 0 also matches single-word keywords misspelled by up to that many edits
+        """
+        if self.profile is not None:
+            return self._match_terms_profiled(text, self.profile, fuzzy)
+
+        keyword_spans = self.automaton.find_all(text)
+        if fuzzy:
+            self._add_fuzzy_spans(text, keyword_spans, fuzzy)
+        if not keyword_spans:
+            return []
+
+        # Only terms with at least one keyword occurrence can match
+        candidates = sorted({rank for pattern_id in keyword_spans
+                             for rank in self.pattern_terms[pattern_id]})
+
+        matched_terms = []
+        matched_positions = []
+        for rank in candidates:
+            for pattern_id in self.term_patterns[rank]:
+                spans = keyword_spans.get(pattern_id)
+                if not spans:
+                    continue
+
+                claimed = None
+                for start, end in spans:
+                    # Check if this text span has already been matched by a more specific term
+                    if not any(start < pos2 and end > pos for pos, pos2 in matched_positions):
+                        claimed = (start, end)
+                        break
+
+                if claimed:
+                    matched_terms.append(self.term_priority[rank])
+                    matched_positions.append(claimed)
+                    break
+        return matched_terms
+
+    def _match_terms_profiled(self, text: str, profile: ClassifierProfile, fuzzy: int = 0) -> List[str]:
+        # Same resolution as match_terms, instrumented per term and per keyword
+        clock = time.perf_counter
+        add = profile._add
+        profile.texts += 1
+
+        scan_start = clock()
+        keyword_spans = self.automaton.find_all(text, profile.keyword_partial_hits)
+        profile.scan_seconds += clock() - scan_start
+        for pattern_id, spans in keyword_spans.items():
+            add(profile.keyword_hits, pattern_id, len(spans))
+        if fuzzy:
+            fuzzy_start = clock()
+            self._add_fuzzy_spans(text, keyword_spans, fuzzy)
+            profile.fuzzy = max(profile.fuzzy, fuzzy)
+            profile.fuzzy_seconds += clock() - fuzzy_start
+        resolve_start = clock()
+
+        candidates = sorted({rank for pattern_id in keyword_spans
+                             for rank in self.pattern_terms[pattern_id]})
+
+        matched_terms = []
+        matched_positions = []
+        for rank in candidates:
+            term = self.term_priority[rank]
+            term_start = clock()
+            for pattern_id in self.term_patterns[rank]:
+                spans = keyword_spans.get(pattern_id)
+                if not spans:
+                    continue
+
+                keyword_start = clock()
+                claimed = None
+                for start, end in spans:
+                    if not any(start < pos2 and end > pos for pos, pos2 in matched_positions):
+                        claimed = (start, end)
+                        break
+                    add(profile.keyword_rejections, pattern_id)
+                    add(profile.term_rejections, term)
+                add(profile.keyword_seconds, pattern_id, clock() - keyword_start)
+
+                if claimed:
+                    matched_terms.append(term)
+                    matched_positions.append(claimed)
+                    add(profile.keyword_matches, pattern_id)
+                    add(profile.term_matches, term)
+                    break
+            add(profile.term_seconds, term, clock() - term_start)
+
+        profile.resolve_seconds += clock() - resolve_start
+        return matched_terms
+
+    def categorize(self, terms: List[str]) -> Dict[str, List[str]]:
+        """Organize matched terms into their display categories, dropping empty ones"""
+        placements = sorted(
+            placement for term in terms for placement in self.term_categories.get(term, ())
+        )
+        classifications = {}
+        for _, _, category, label in placements:
+            classifications.setdefault(category, []).append(label)
+        return classifications
+
+    def classify_text(self, text: str, fuzzy: int = 0) -> Dict[str, List[str]]:
+        """Classify already normalized text"""
+        return self.categorize(self.match_terms(text, fuzzy))
+
+    def _to_state(self) -> dict:
+        # Plain builtins only, so the cache loads whether this file runs as a
+        # script (__main__) or is imported by worker processes and other tools
+        state = dict(vars(self))
+        state['automaton'] = vars(self.automaton)
+        state.pop('_fuzzy_lookups', None)
+        state.pop('profile', None)
+        return state
+
+    @classmethod
+    def _from_state(cls, state: dict) -> 'GlossaryIndex':
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        automaton = KeywordAutomaton.__new__(KeywordAutomaton)
+        automaton.__dict__.update(state['automaton'])
+        index.automaton = automaton
+        return index
+
+    @classmethod
+    def load_or_build(cls, glossary: Dict[str, List[str]] = None,
+                      category_groups: Dict[str, List[str]] = None,
+                      guard_emojis: Dict[str, str] = None,
+                      cache_dir: str = GLOSSARY_CACHE_DIR) -> 'GlossaryIndex':
+        """
+        Load a compiled index from the on-disk cache, building and caching it on a miss
+        The cache file is keyed by the glossary hash, so editing the glossary
+        naturally invalidates it
+        """
+        version = glossary_version(glossary, category_groups, guard_emojis)
+        cache_file = os.path.join(cache_dir, f"glossary_index_{version[:16]}.pickle") if cache_dir else None
+
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    state = pickle.load(f)
+                if state.get('version') == version:
+                    return cls._from_state(state)
+            except Exception as e:
+                print(f"Warning: ignoring unreadable glossary cache '{cache_file}': {e}")
+
+        index = cls(glossary, category_groups, guard_emojis)
+
+        if cache_file:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with atomic_open(cache_file, 'wb') as f:
+                    pickle.dump(index._to_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                print(f"Warning: could not write glossary cache '{cache_file}': {e}")
+        return index
+
+
+_GLOSSARY_INDEX = None
+
+
+def get_glossary_index() -> GlossaryIndex:
+    """Return the process-wide GlossaryIndex, loading or compiling it on first use"""
+    global _GLOSSARY_INDEX
+    if _GLOSSARY_INDEX is None:
+        _GLOSSARY_INDEX = GlossaryIndex.load_or_build()
+    return _GLOSSARY_INDEX
+
+
+def enable_profiling() -> ClassifierProfile:
+    """Start collecting per-term/per-keyword statistics in this process and return the profile"""
+    profile = ClassifierProfile()
+    get_glossary_index().profile = profile
+    return profile
+
+
+def classify_video(title: str, description: str = '', tags: List[str] = None,
+                   fuzzy: int = 0) -> Dict[str, List[str]]:
     """
     Classify a video based on title, description (optional), and tags (optional)
     Returns a dict with classification categories and their matched terms
     Uses priority matching to handle overlapping terms (e.g., "single leg x" vs "single leg")
+    fuzzy > 0 also catches misspelled keywords ("kimora", "omaplata") up to that edit distance
     """
     # Handle optional parameters
     if tags is None:
@@ -1249,80 +1846,433 @@ def classify_video(title: str, description: str = '', tags: List[str] = None) ->
     # Combine all text sources
     combined_text = normalize_text(f"{title} {description} {' '.join(tags)}")
     
-    classifications = {
-        "guard_type": [],
-        "position": [],
-        "pass": [],
-        "sweep": [],
-        "submission": [],
-        "technique": [],
-        "takedown": []
+    return get_glossary_index().classify_text(combined_text, fuzzy)
+
+
+# Field-aware classification: weight of a term match in each field
+FIELD_WEIGHTS = {
+    "title": 1.0,
+    "tags": 0.75,
+    "description": 0.5
+}
+
+# Field-aware classification: default settings
+# A term is kept when the weights of the fields it matched in add up to min_score;
+# only the first description_budget characters of a description are scanned
+DEFAULT_FIELD_CONFIG = {
+    "weights": FIELD_WEIGHTS,
+    "min_score": 0.5,
+    "description_budget": 500
+}
+
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    if budget is None or len(text) <= budget:
+        return text
+    truncated = text[:budget]
+    if _is_word_char(text[budget]):
+        # Drop a word cut in half so it is never matched by its prefix
+        truncated = re.sub(r'\w+$', '', truncated)
+    return truncated
+
+
+def classify_video_fields(title: str, description: str = '', tags: List[str] = None,
+                          field_config: dict = None, fuzzy: int = 0) -> Dict[str, List[str]]:
+    """
+    Classify title, tags and description separately and combine them with per-field weights
+    The description is capped at field_config['description_budget'] characters,
+    which bounds the cost per video however long descriptions get
+    """
+    config = dict(DEFAULT_FIELD_CONFIG, **(field_config or {}))
+    weights = config["weights"]
+    index = get_glossary_index()
+
+    fields = {
+        "title": title or '',
+        # Separate tags with punctuation so keywords never span two tags
+        "tags": ', '.join(tags or []),
+        "description": _truncate_to_budget(description or '', config["description_budget"])
     }
-    
-    matched_terms = set()
-    
-    # Create a priority list - check more specific terms first
-    # This prevents "single leg" from matching before "single leg x"
-    term_priority = []
-    
-    # Calculate priority based on keyword length (longer = more specific = higher priority)
-    for term, keywords in BJJ_GLOSSARY.items():
-        max_keyword_length = max(len(kw) for kw in keywords)
-        term_priority.append((max_keyword_length, term, keywords))
-    
-    # Sort by length (descending) - check longest/most specific terms first
-    term_priority.sort(reverse=True, key=lambda x: x[0])
-    
-    # Track which parts of the text have been matched to avoid double-matching
-    matched_positions = set()
-    
-    # Check each classification category in priority order
-    for _, term, keywords in term_priority:
-        if term in matched_terms:
+
+    scores = {}
+    for field, text in fields.items():
+        weight = weights.get(field, 0)
+        if not weight or not text:
             continue
-            
-        for keyword in keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            matches = re.finditer(pattern, combined_text)
-            
-            for match in matches:
-                start, end = match.span()
-                # Check if this text span has already been matched by a more specific term
-                overlap = any((start < pos2 and end > pos) 
-                             for pos, pos2 in matched_positions)
-                
-                if not overlap:
-                    matched_terms.add(term)
-                    matched_positions.add((start, end))
-                    break
-            
-            if term in matched_terms:
-                break
-    
-    # Organize matched terms into categories
-    for category, terms in CATEGORY_GROUPS.items():
-        for term in terms:
-            if term in matched_terms:
-                # Convert underscore to space and title case for readability
-                formatted_term = term.replace("_", " ").title()
-                
-                # Add emoji for guard types
-                if category == "guard_type" and term in GUARD_EMOJIS:
-                    formatted_term = f"{GUARD_EMOJIS[term]} {formatted_term}"
-                
-                classifications[category].append(formatted_term)
-    
-    # Remove empty categories
-    classifications = {k: v for k, v in classifications.items() if v}
+        for term in index.match_terms(normalize_text(text), fuzzy):
+            scores[term] = scores.get(term, 0) + weight
+
+    return index.categorize([term for term, score in scores.items() if score >= config["min_score"]])
+
+
+# Persistent per-video classification results, reused across runs
+CLASSIFICATION_CACHE_FILE = os.path.join(GLOSSARY_CACHE_DIR, 'classification_cache.json')
+
+
+def get_video_id(video: dict) -> str:
+    """Return the YouTube video ID of a record, falling back to its youtube_link"""
+    video_id = video.get('video_id')
+    if video_id:
+        return video_id
+    m = re.search(r"[?&]v=([A-Za-z0-9_-]+)", video.get('youtube_link') or '')
+    return m.group(1) if m else ''
+
+
+def video_content_hash(video: dict) -> str:
+    """Hash the fields the classifier can read, so edited titles/descriptions/tags are reclassified"""
+    payload = json.dumps(list(_record_fields(video)), ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    On-disk cache of classification results keyed by video_id
+    Each entry stores the content hash it was computed from; the whole cache is
+    scoped to a classifier version, so glossary changes invalidate every entry
+    """
+
+    def __init__(self, path: str = CLASSIFICATION_CACHE_FILE, version: str = ''):
+        self.path = path
+        self.version = version
+        self.entries = {}       # video_id -> [content hash, classification]
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == version:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable classification cache '{path}': {e}")
+
+    def get(self, video: dict):
+        """Return the cached classification of a video, or None if it must be (re)classified"""
+        video_id = get_video_id(video)
+        entry = self.entries.get(video_id) if video_id else None
+        if entry and entry[0] == video_content_hash(video):
+            self._seen.add(video_id)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, video: dict, classification: Dict[str, List[str]]):
+        video_id = get_video_id(video)
+        if video_id:
+            self.entries[video_id] = [video_content_hash(video), classification]
+            self._seen.add(video_id)
+
+    def save(self):
+        """Write the cache atomically, keeping only videos seen during this run"""
+        if not self.path:
+            return
+        entries = {video_id: self.entries[video_id] for video_id in self._seen if video_id in self.entries}
+        try:
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with atomic_open(self.path, 'w') as f:
+                json.dump({'version': self.version, 'entries': entries}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Warning: could not write classification cache '{self.path}': {e}")
+
+
+def classifier_version(field_config: dict = None, fuzzy: int = 0) -> str:
+    """Version of the classification results: glossary hash plus the fields and fuzziness they are computed with"""
+    version = get_glossary_index().version
+    if fuzzy:
+        version += f":fuzzy{fuzzy}"
+    if field_config is None:
+        return f"{version}:title"
+    config = json.dumps(dict(DEFAULT_FIELD_CONFIG, **field_config), sort_keys=True)
+    return f"{version}:fields:{config}"
+
+
+# Videos sent to a worker process per task by classify_many
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _record_fields(video: dict) -> Tuple[str, str, List[str]]:
+    """Extract only the fields the classifier reads, so workers receive small payloads"""
+    return (video.get('title') or '', video.get('description') or '', video.get('tags') or [])
+
+
+def _classify_fields(fields: Tuple[str, str, List[str]], field_config: dict = None,
+                     fuzzy: int = 0) -> Dict[str, List[str]]:
+    title, description, tags = fields
+    if field_config is None:
+        # Default mode: classify the title only
+        return classify_video(title, fuzzy=fuzzy)
+    return classify_video_fields(title, description, tags, field_config, fuzzy)
+
+
+def _classify_chunk(chunk: List[Tuple[str, str, List[str]]],
+                    field_config: dict = None, fuzzy: int = 0) -> List[Dict[str, List[str]]]:
+    return [_classify_fields(fields, field_config, fuzzy) for fields in chunk]
+
+
+def _init_classify_worker():
+    """Load the compiled glossary once per worker process"""
+    get_glossary_index()
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _resolve_chunk(chunk: List[dict], cached: list, fresh: List[Dict[str, List[str]]],
+                   cache: ClassificationCache = None) -> Iterator[Tuple[dict, Dict[str, List[str]]]]:
+    # Merge cache hits and freshly computed results back into input order
+    fresh = iter(fresh)
+    for video, classification in zip(chunk, cached):
+        if classification is None:
+            classification = next(fresh)
+            if cache:
+                cache.put(video, classification)
+        yield video, classification
+
+
+def iter_classify(videos: Iterable[dict], workers: int = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  cache: ClassificationCache = None,
+                  field_config: dict = None,
+                  fuzzy: int = 0) -> Iterator[Tuple[dict, Dict[str, List[str]]]]:
+    """
+    Lazily classify video records, yielding (video, classification) pairs in input order
+    With workers > 1, chunks of chunk_size videos are fanned out to a process pool;
+    at most two chunks per worker are in flight, so the input is consumed incrementally
+    Videos found in cache skip classification, new results are added to it
+    field_config switches from title-only to field-aware classification (see DEFAULT_FIELD_CONFIG)
+    fuzzy is the maximum edit distance of the fuzzy tier (0 disables it)
+    """
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+
+    # Compile (or load) the glossary in the parent first: forked workers inherit it,
+    # spawned workers find it in the on-disk cache
+    get_glossary_index()
+
+    def lookup(chunk):
+        cached = [cache.get(video) for video in chunk] if cache else [None] * len(chunk)
+        misses = [_record_fields(video) for video, hit in zip(chunk, cached) if hit is None]
+        return cached, misses
+
+    if workers == 1:
+        for chunk in _chunked(videos, chunk_size):
+            cached, misses = lookup(chunk)
+            yield from _resolve_chunk(chunk, cached, _classify_chunk(misses, field_config, fuzzy), cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_classify_worker) as executor:
+        pending = deque()
+        for chunk in _chunked(videos, chunk_size):
+            cached, misses = lookup(chunk)
+            future = executor.submit(_classify_chunk, misses, field_config, fuzzy) if misses else None
+            pending.append((chunk, cached, future))
+            if len(pending) >= workers * 2:
+                chunk, cached, future = pending.popleft()
+                yield from _resolve_chunk(chunk, cached, future.result() if future else [], cache)
+        while pending:
+            chunk, cached, future = pending.popleft()
+            yield from _resolve_chunk(chunk, cached, future.result() if future else [], cache)
+
+
+def classify_many(videos: Iterable[dict], workers: int = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  field_config: dict = None,
+                  fuzzy: int = 0) -> List[Dict[str, List[str]]]:
+    """
+    Classify a batch of video records, optionally across a process pool
+    Returns one classification per video, in the same order as the input
+    (workers=None or 0 uses every available core)
+    """
+    return [classification for _, classification
+            in iter_classify(videos, workers=workers, chunk_size=chunk_size,
+                             field_config=field_config, fuzzy=fuzzy)]
+
+
+def _iter_json_lines(buffer: str, f) -> Iterator[dict]:
+    # The first chunk was already read while sniffing the format; finish its last line from the file
+    lines = buffer.split('\n')
+    lines[-1] += f.readline()
+    for line in itertools.chain(lines, f):
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_records(input_file: str, buffer_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Yield records from a JSON array or JSON Lines file without loading it whole
+    The format is detected from the first non-whitespace character
+    """
+    decoder = json.JSONDecoder()
+    with open(input_file, 'r', encoding='utf-8') as f:
+        buffer = f.read(buffer_size)
+        while buffer and not buffer.strip():
+            buffer = f.read(buffer_size)
+        buffer = buffer.lstrip()
+        if not buffer:
+            return
+        if buffer[0] != '[':
+            yield from _iter_json_lines(buffer, f)
+            return
+
+        # JSON array: decode one element at a time from a sliding buffer
+        position = 1
+        expect_value = True
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position >= len(buffer):
+                buffer, position = f.read(buffer_size), 0
+                if not buffer:
+                    raise json.JSONDecodeError("Unterminated array", '', 0)
+                continue
+
+            char = buffer[position]
+            if char == ']':
+                return
+            if not expect_value:
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                position += 1
+                expect_value = True
+                continue
+
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element may continue past the buffer: read more and retry
+                more = f.read(buffer_size)
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+            expect_value = False
+            yield record
+
+
+def write_json_records(records: Iterable[dict], output_file: str, compact: bool = True) -> int:
+    """
+    Write records to output_file as they arrive and return how many were written
+    .jsonl files get one record per line, anything else a compact JSON array,
+    or with compact=False one laid out exactly like json.dump(records, indent=2)
+    The file only replaces output_file once every record is written
+    """
+    count = 0
+    with atomic_open(output_file) as f:
+        if output_file.endswith('.jsonl'):
+            for record in records:
+                f.write(dumps(record))
+                f.write(b'\n')
+                count += 1
+            return count
+
+        for record in records:
+            if compact:
+                f.write(b',' if count else b'[')
+                f.write(dumps(record))
+            else:
+                f.write(b',\n  ' if count else b'[\n  ')
+                f.write(dumps(record, compact=False).replace(b'\n', b'\n  '))
+            count += 1
+        f.write((b']' if compact else b'\n]') if count else b'[]')
+    return count
+
+
+def _print_summary(stats: dict, output_file: str, samples: List[dict]):
+    # Print statistics
+    print("\n" + "="*60)
+    print("Classification Complete!")
+    print("="*60)
+    print(f"Total videos: {stats['total']}")
+    print(f"Classified: {stats['classified']}")
+    print(f"Unclassified: {stats['unclassified']}")
+    print(f"\nOutput saved to: {output_file}")
+    print("="*60)
     
-    return classifications
+    # Show some examples
+    print("\nSample classifications:")
+    print("-"*60)
+    for i, video in enumerate(samples[:5]):
+        if video['classification']:
+            print(f"\n{i+1}. {video['title'][:60]}...")
+            for category, terms in video['classification'].items():
+                print(f"   {category}: {', '.join(terms)}")
+
+
+def iter_unique_videos(videos: Iterable[dict], duplicates: List[int] = None) -> Iterator[dict]:
+    """
+    Yield each video once: records repeating an earlier video_id/youtube_link are dropped
+    duplicates, when given, is a one-item list incremented for every dropped record
+    """
+    seen = set()
+    for video in videos:
+        key = video.get('video_id') or video.get('youtube_link')
+        if key:
+            if key in seen:
+                if duplicates is not None:
+                    duplicates[0] += 1
+                continue
+            seen.add(key)
+        yield video
+
+
+def _load_fight_videos(fight_input: str) -> List[dict]:
+    # The fight dataset is optional: a missing or broken file only skips it
+    if not os.path.exists(fight_input):
+        print(f"No fight videos at {fight_input}, skipping")
+        return []
+    try:
+        with open(fight_input, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: skipping fight videos in '{fight_input}': {e}")
+        return []
 
 
 def process_bjj_videos(input_file: str = 'bjj_videos_simple.json', 
-                       output_file: str = 'bjj_simple_processed.json'):
+                       output_file: str = 'bjj_simple_processed.json',
+                       workers: int = 1,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       cache_file: str = CLASSIFICATION_CACHE_FILE,
+                       field_config: dict = None,
+                       fuzzy: int = 0,
+                       index_file: str = 'bjj_index.json',
+                       search_index_file: str = SEARCH_INDEX_FILE,
+                       shards_dir: str = SHARDS_DIR,
+                       columnar_file: str = None,
+                       compact: bool = True,
+                       compress: bool = True,
+                       fight_input: str = 'fight_simple.json',
+                       fight_output: str = 'fight_processed.json'):
     """
     Read BJJ videos from JSON, classify them, and write to new JSON file
+    workers > 1 classifies in parallel with classify_many's process pool
+    Videos unchanged since the last run are taken from cache_file (None disables the cache)
+    field_config enables field-aware title/tags/description classification
+    fuzzy > 0 enables the fuzzy tier for misspelled keywords, up to that edit distance
+    index_file receives the term/category/channel inverted index built in the same pass
+    search_index_file receives the full-text search index over titles, tags and channels
+    of the technique and fight videos (positions in the web app's combined list)
+    shards_dir receives per-category/per-channel shards and pages sorted by views and
+    by date over the technique and fight videos (see video_shards.py)
+    columnar_file optionally receives a memory-mappable columnar copy (see columnar_dataset.py)
+    JSON artifacts are written atomically, compact unless compact=False, and with
+    pre-compressed .gz/.br siblings unless compress=False (see json_artifacts.py)
+    fight_input videos are classified in the same pass (same compiled glossary,
+    cache and worker pool) and written to fight_output; the inverted index and the
+    columnar copy only cover the technique videos
     """
     try:
         # Read input file
@@ -1330,63 +2280,93 @@ def process_bjj_videos(input_file: str = 'bjj_videos_simple.json',
         with open(input_file, 'r', encoding='utf-8') as f:
             videos = json.load(f)
         
-        print(f"Processing {len(videos)} videos...")
+        # Fight videos are appended to the same classification stream
+        fight_videos = _load_fight_videos(fight_input) if fight_input and fight_output else []
+        
+        # A video is classified and written once per dataset
+        duplicates = [0]
+        videos = list(iter_unique_videos(videos, duplicates))
+        fight_videos = list(iter_unique_videos(fight_videos, duplicates))
+        if duplicates[0]:
+            print(f"Skipping {duplicates[0]} duplicate videos")
+        total = len(videos) + len(fight_videos)
+        
+        print(f"Processing {len(videos)} videos" +
+              (f" and {len(fight_videos)} fight videos..." if fight_videos else "..."))
         
         # Process each video
         processed_videos = []
+        processed_fights = []
         stats = {
             "total": len(videos),
             "classified": 0,
             "unclassified": 0
         }
+        fight_stats = {
+            "total": len(fight_videos),
+            "classified": 0,
+            "unclassified": 0
+        }
         
-        for idx, video in enumerate(videos, 1):
-            # Get video details
-            title = video.get('title', '')
-            description = video.get('description', '')
-            tags = video.get('tags', [])
-            
-            # Classify video (use title, description and tags)
-            classification = classify_video(title)
-            
+        # Reuse classifications of videos that did not change since the last run
+        cache = ClassificationCache(cache_file, classifier_version(field_config, fuzzy)) if cache_file else None
+        index_builder = InvertedIndexBuilder() if index_file else None
+        search_builder = SearchIndexBuilder(normalize_text) if search_index_file else None
+        if search_builder:
+            search_builder.mark_fights(len(videos))
+        
+        if workers != 1:
+            print(f"Classifying with {workers or os.cpu_count()} worker processes...")
+        
+        classified = iter_classify(itertools.chain(videos, fight_videos), workers=workers, chunk_size=chunk_size,
+                                   cache=cache, field_config=field_config, fuzzy=fuzzy)
+        for idx, (video, classification) in enumerate(classified, 1):
             # Add classification to video
             video['classification'] = classification
+            is_fight = idx > len(videos)
             
             # Update stats
+            video_stats = fight_stats if is_fight else stats
             if classification:
-                stats['classified'] += 1
+                video_stats['classified'] += 1
             else:
-                stats['unclassified'] += 1
+                video_stats['unclassified'] += 1
             
-            processed_videos.append(video)
+            if is_fight:
+                processed_fights.append(video)
+            else:
+                processed_videos.append(video)
+                if index_builder:
+                    index_builder.add(idx - 1, video)
+            if search_builder:
+                search_builder.add(idx - 1, video)
             
             # Print progress
-            if idx % 10 == 0 or idx == len(videos):
-                print(f"  Processed {idx}/{len(videos)} videos...")
+            if idx % 10 == 0 or idx == total:
+                print(f"  Processed {idx}/{total} videos...")
+        
+        if cache:
+            print(f"Cache: {cache.hits} unchanged, {cache.misses} new or changed videos classified")
+            cache.save()
         
         # Write output file
         print(f"\nWriting results to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(processed_videos, f, indent=2, ensure_ascii=False)
+        save_json(processed_videos, output_file, compact=compact, compress=compress)
+        if index_builder:
+            index_builder.save(index_file, source=output_file, compress=compress)
+        if search_builder:
+            search_builder.save(search_index_file, source=output_file, compress=compress)
+        if shards_dir:
+            write_shards(processed_videos + processed_fights, shards_dir, source=output_file, compress=compress)
+        if columnar_file:
+            write_columnar(processed_videos, columnar_file)
+        if fight_videos:
+            save_json(processed_fights, fight_output, compact=compact, compress=compress)
         
-        # Print statistics
-        print("\n" + "="*60)
-        print("Classification Complete!")
-        print("="*60)
-        print(f"Total videos: {stats['total']}")
-        print(f"Classified: {stats['classified']}")
-        print(f"Unclassified: {stats['unclassified']}")
-        print(f"\nOutput saved to: {output_file}")
-        print("="*60)
-        
-        # Show some examples
-        print("\nSample classifications:")
-        print("-"*60)
-        for i, video in enumerate(processed_videos[:5]):
-            if video['classification']:
-                print(f"\n{i+1}. {video['title'][:60]}...")
-                for category, terms in video['classification'].items():
-                    print(f"   {category}: {', '.join(terms)}")
+        _print_summary(stats, output_file, processed_videos)
+        if fight_videos:
+            print(f"Fight videos: {fight_stats['classified']} classified, "
+                  f"{fight_stats['unclassified']} unclassified -> {fight_output}")
         
         return processed_videos
         
@@ -1402,13 +2382,196 @@ def process_bjj_videos(input_file: str = 'bjj_videos_simple.json',
         return None
 
 
+def stream_bjj_videos(input_file: str = 'bjj_videos_simple.json',
+                      output_file: str = 'bjj_simple_processed.json',
+                      workers: int = 1,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      cache_file: str = CLASSIFICATION_CACHE_FILE,
+                      field_config: dict = None,
+                      fuzzy: int = 0,
+                      index_file: str = None,
+                      search_index_file: str = None,
+                      compact: bool = True,
+                      compress: bool = True):
+    """
+    Streaming variant of process_bjj_videos
+    Reads a JSON array or JSON Lines input record by record, classifies records as
+    they arrive and writes them straight out (JSON Lines when output_file ends in
+    .jsonl), so the videos themselves are never all held in memory
+    Memory is only flat with cache_file=None and no index files: the classification
+    cache and the inverted/search index builders keep an entry per video, so they
+    are off by default (index_file, search_index_file) or reported (cache_file)
+    Sorted shards need the whole dataset, so they (and fight_processed.json) are only
+    written by process_bjj_videos; the search index covers the technique videos only
+    Returns the classification stats, or None on error
+    """
+    stats = {
+        "total": 0,
+        "classified": 0,
+        "unclassified": 0
+    }
+    samples = []
+    
+    try:
+        print(f"Streaming {input_file} -> {output_file}...")
+        if cache_file:
+            print("Note: the classification cache is held in memory and grows with the archive "
+                  "(use --no-cache for flat memory use)")
+        cache = ClassificationCache(cache_file, classifier_version(field_config, fuzzy)) if cache_file else None
+        index_builder = InvertedIndexBuilder() if index_file else None
+        search_builder = SearchIndexBuilder(normalize_text) if search_index_file else None
+        duplicates = [0]
+        
+        def classified_records():
+            records = iter_unique_videos(iter_json_records(input_file), duplicates)
+            for video, classification in iter_classify(records, workers=workers, chunk_size=chunk_size,
+                                                       cache=cache, field_config=field_config,
+                                                       fuzzy=fuzzy):
+                video['classification'] = classification
+                
+                stats['total'] += 1
+                if classification:
+                    stats['classified'] += 1
+                else:
+                    stats['unclassified'] += 1
+                
+                if index_builder:
+                    index_builder.add(stats['total'] - 1, video)
+                if search_builder:
+                    search_builder.add(stats['total'] - 1, video)
+                if len(samples) < 5:
+                    samples.append(video)
+                if stats['total'] % 1000 == 0:
+                    print(f"  Processed {stats['total']} videos...")
+                yield video
+        
+        write_json_records(classified_records(), output_file, compact=compact)
+        if duplicates[0]:
+            print(f"Skipped {duplicates[0]} duplicate videos")
+        if compress:
+            compress_artifact(output_file)
+        else:
+            remove_compressed(output_file)
+        if index_builder:
+            index_builder.save(index_file, source=output_file, compress=compress)
+        if search_builder:
+            search_builder.save(search_index_file, source=output_file, compress=compress)
+        
+        if cache:
+            print(f"Cache: {cache.hits} unchanged, {cache.misses} new or changed videos classified")
+            cache.save()
+        
+        _print_summary(stats, output_file, samples)
+        
+        return stats
+        
+    except FileNotFoundError:
+        print(f"Error: Could not find file '{input_file}'")
+        print("Make sure bjj_videos_simple.json exists in the current directory")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in '{input_file}': {e}")
+        return None
+    except Exception as e:
+        print(f"Error processing videos: {e}")
+        return None
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Classify BJJ videos using the BJJ glossary")
+    parser.add_argument('--input', default='bjj_videos_simple.json',
+                        help="Input JSON file (default: bjj_videos_simple.json)")
+    parser.add_argument('--output', default='bjj_simple_processed.json',
+                        help="Output JSON file (default: bjj_simple_processed.json)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Worker processes for classification (default: 0 = all cores, 1 = no pool)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Videos per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--index-output', default=None,
+                        help="Inverted index file for the web app filters "
+                             "(default: bjj_index.json, none with --stream; '' to skip)")
+    parser.add_argument('--search-index-output', default=None,
+                        help="Full-text search index for the web app search box "
+                             f"(default: {SEARCH_INDEX_FILE}, none with --stream; '' to skip)")
+    parser.add_argument('--shards-dir', default=SHARDS_DIR,
+                        help=f"Directory for sharded, pre-sorted artifacts (default: {SHARDS_DIR}, '' to skip)")
+    parser.add_argument('--fight-input', default='fight_simple.json',
+                        help="Fight videos classified in the same run (default: fight_simple.json, '' to skip)")
+    parser.add_argument('--fight-output', default='fight_processed.json',
+                        help="Output JSON file for the classified fight videos (default: fight_processed.json)")
+    parser.add_argument('--columnar-output', default=None,
+                        help="Also write a columnar binary copy of the processed videos to this file")
+    parser.add_argument('--profile', nargs='?', const='classifier_profile.json', default=None,
+                        help="Profile per-term/per-keyword cost and write the report to this JSON file "
+                             "(default: classifier_profile.json); runs in one process without the cache")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Reclassify every video instead of reusing cached results")
+    parser.add_argument('--fields', action='store_true',
+                        help="Classify title, tags and description separately with per-field weights")
+    parser.add_argument('--description-budget', type=int, default=DEFAULT_FIELD_CONFIG['description_budget'],
+                        help="Characters of each description scanned in --fields mode "
+                             f"(default: {DEFAULT_FIELD_CONFIG['description_budget']})")
+    parser.add_argument('--fuzzy', type=int, nargs='?', const=2, default=0, metavar='DISTANCE',
+                        help="Also match misspelled keywords up to this edit distance "
+                             f"(default when given: 2; words shorter than {FUZZY_LONG_WORD} letters allow 1)")
+    parser.add_argument('--pretty', action='store_true',
+                        help="Indent the output JSON instead of writing it compact")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="Do not write pre-compressed .gz/.br copies of the JSON artifacts")
+    parser.add_argument('--stream', action='store_true',
+                        help="Stream records from input to output (JSON array or JSON Lines); "
+                             "memory stays flat with --no-cache and no index outputs")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main execution function"""
+    args = parse_args()
+    
     print("BJJ Video Classification Script")
     print("="*60)
     
+    profile = None
+    if args.profile:
+        # Counters live in this process and cached videos would skip classification
+        profile = enable_profiling()
+        args.workers = 1
+        args.no_cache = True
+    
+    field_config = None
+    if args.fields:
+        field_config = dict(DEFAULT_FIELD_CONFIG, description_budget=args.description_budget)
+    
+    # Streaming only writes the indexes on request: their builders grow with the archive
+    if args.index_output is None:
+        args.index_output = None if args.stream else 'bjj_index.json'
+    if args.search_index_output is None:
+        args.search_index_output = None if args.stream else SEARCH_INDEX_FILE
+    
     # Process videos
-    result = process_bjj_videos()
+    options = dict(workers=args.workers, chunk_size=args.chunk_size,
+                   cache_file=None if args.no_cache else CLASSIFICATION_CACHE_FILE,
+                   field_config=field_config,
+                   fuzzy=args.fuzzy,
+                   index_file=args.index_output,
+                   search_index_file=args.search_index_output,
+                   compact=not args.pretty,
+                   compress=not args.no_compress)
+    if args.stream:
+        result = stream_bjj_videos(args.input, args.output, **options)
+    else:
+        result = process_bjj_videos(args.input, args.output, shards_dir=args.shards_dir,
+                                    columnar_file=args.columnar_output,
+                                    fight_input=args.fight_input, fight_output=args.fight_output,
+                                    **options)
+    
+    if profile:
+        index = get_glossary_index()
+        profile.print_report(index)
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            json.dump(profile.to_dict(index), f, indent=2, ensure_ascii=False)
+        print(f"\nProfile saved to {args.profile}")
     
     if result:
         print("\n✓ Classification completed successfully!")
@@ -0,0 +1,311 @@
+"""
+Columnar binary format for processed BJJ videos
+Fixed-width numeric columns (views, likes, durations, publish times), dictionary
+encoded channels/languages/classification terms and an offset-indexed UTF-8
+string heap, laid out so ColumnarDataset can memory-map a file and expose every
+column without parsing or copying it
+
+Layout: MAGIC, uint32 header length, JSON header, then 8-byte aligned sections
+starting at the first 8-byte boundary after the header, described by the
+header as {name: [type code, offset, byte length]}
+"""
+
+import argparse
+import json
+import mmap
+import re
+import sys
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+
+from json_artifacts import atomic_open
+
+
+MAGIC = b'BJJCOL01'
+FORMAT_VERSION = 1
+
+# Numeric columns: name -> array type code
+NUMERIC_COLUMNS = {
+    'view_count': 'q',
+    'like_count': 'q',
+    'comment_count': 'q',
+    'duration_seconds': 'i',
+    'published_at': 'q'        # Unix timestamp, 0 when unknown
+}
+
+# String heap columns
+STRING_COLUMNS = ['title', 'description', 'youtube_link', 'video_id', 'tags']
+
+# Tags are stored as a single string joined by this separator
+TAG_SEPARATOR = '\x1f'
+
+_DURATION = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+
+def parse_duration(duration: str) -> int:
+    """Convert an ISO 8601 YouTube duration (PT1H2M3S) to seconds"""
+    m = _DURATION.match(duration or '')
+    if not m:
+        return 0
+    days, hours, minutes, seconds = (int(part or 0) for part in m.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_timestamp(published_at: str) -> int:
+    """Convert a YouTube publishedAt string to a Unix timestamp"""
+    if not published_at:
+        return 0
+    try:
+        return int(datetime.fromisoformat(published_at.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return 0
+
+
+def _int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _video_id(video: dict) -> str:
+    if video.get('video_id'):
+        return video['video_id']
+    m = re.search(r"[?&]v=([A-Za-z0-9_-]+)", video.get('youtube_link') or '')
+    return m.group(1) if m else ''
+
+
+def _data_start(header_length: int) -> int:
+    end = len(MAGIC) + 4 + header_length
+    return end + (-end % 8)
+
+
+class _Dictionary:
+    """Assigns stable integer codes to repeated values"""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def write_columnar(videos: List[dict], output_file: str) -> Dict:
+    """Write processed videos to the columnar format (atomically) and return its header"""
+    numeric = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+    channels = _Dictionary()
+    languages = _Dictionary()
+    terms = _Dictionary()
+    channel_codes = array('I')
+    language_codes = array('I')
+    term_offsets = array('Q', [0])
+    term_codes = array('I')
+    heaps = {name: bytearray() for name in STRING_COLUMNS}
+    string_offsets = {name: array('Q', [0]) for name in STRING_COLUMNS}
+
+    for video in videos:
+        numeric['view_count'].append(_int(video.get('view_count')))
+        numeric['like_count'].append(_int(video.get('like_count')))
+        numeric['comment_count'].append(_int(video.get('comment_count')))
+        numeric['duration_seconds'].append(parse_duration(video.get('duration')))
+        numeric['published_at'].append(parse_timestamp(video.get('published_at')))
+
+        channel_codes.append(channels.code(video.get('channel_name') or ''))
+        language_codes.append(languages.code(video.get('language') or video.get('default_language') or 'unknown'))
+
+        for category, labels in (video.get('classification') or {}).items():
+            for label in labels:
+                term_codes.append(terms.code((category, label)))
+        term_offsets.append(len(term_codes))
+
+        strings = {
+            'title': video.get('title') or '',
+            'description': video.get('description') or '',
+            'youtube_link': video.get('youtube_link') or '',
+            'video_id': _video_id(video),
+            'tags': TAG_SEPARATOR.join(video.get('tags') or [])
+        }
+        for name, value in strings.items():
+            heaps[name] += value.encode('utf-8')
+            string_offsets[name].append(len(heaps[name]))
+
+    sections = [(name, column.typecode, column.tobytes()) for name, column in numeric.items()]
+    sections += [
+        ('channel', 'I', channel_codes.tobytes()),
+        ('language', 'I', language_codes.tobytes()),
+        ('term_offsets', 'Q', term_offsets.tobytes()),
+        ('term_codes', 'I', term_codes.tobytes())
+    ]
+    for name in STRING_COLUMNS:
+        sections.append((f"{name}_offsets", 'Q', string_offsets[name].tobytes()))
+        sections.append((f"{name}_heap", 'B', bytes(heaps[name])))
+
+    header = {
+        'format': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'rows': len(channel_codes),
+        'channels': channels.values,
+        'languages': languages.values,
+        'terms': [list(term) for term in terms.values],
+        'string_columns': STRING_COLUMNS,
+        'sections': {}
+    }
+
+    # Section offsets are relative to the first 8-byte boundary after the header
+    relative = 0
+    for name, code, data in sections:
+        header['sections'][name] = [code, relative, len(data)]
+        relative += len(data) + (-len(data) % 8)
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _data_start(len(header_bytes))
+
+    with atomic_open(output_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(4, 'little'))
+        f.write(header_bytes)
+        f.write(b'\0' * (data_start - f.tell()))
+        for name, code, data in sections:
+            f.write(data)
+            f.write(b'\0' * (-len(data) % 8))
+
+    print(f"Columnar dataset saved to {output_file} ({header['rows']} videos, "
+          f"{len(channels.values)} channels, {len(terms.values)} terms)")
+    return header
+
+
+class ColumnarDataset:
+    """
+    Memory-mapped reader for files written by write_columnar
+    Numeric columns are returned as memoryviews straight over the mapped file,
+    strings are decoded only when a row asks for them
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        self._columns = {}
+
+        if bytes(self._buffer[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a BJJ columnar dataset")
+        header_length = int.from_bytes(self._buffer[len(MAGIC):len(MAGIC) + 4], 'little')
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(bytes(self._buffer[header_start:header_start + header_length]).decode('utf-8'))
+        self._data_start = _data_start(header_length)
+
+        self.rows = self.header['rows']
+        self.channels = self.header['channels']
+        self.languages = self.header['languages']
+        self.terms = [tuple(term) for term in self.header['terms']]
+        self._native = self.header['byteorder'] == sys.byteorder
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release every view and unmap the file"""
+        for view in self._columns.values():
+            if isinstance(view, memoryview):
+                view.release()
+        self._columns.clear()
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def column(self, name: str):
+        """
+        Return a section as a typed sequence: a zero-copy memoryview on files
+        written with this machine's byte order, an array copy otherwise
+        """
+        view = self._columns.get(name)
+        if view is None:
+            code, offset, length = self.header['sections'][name]
+            start = self._data_start + offset
+            raw = self._buffer[start:start + length]
+            if code == 'B':
+                view = raw
+            elif self._native:
+                view = raw.cast(code)
+            else:
+                view = array(code, raw.tobytes())
+                view.byteswap()
+            self._columns[name] = view
+        return view
+
+    def string(self, name: str, row: int) -> str:
+        """Decode one value of a string column"""
+        offsets = self.column(f"{name}_offsets")
+        return bytes(self.column(f"{name}_heap")[offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def row_terms(self, row: int) -> List[Tuple[str, str]]:
+        """(category, label) pairs of one video"""
+        offsets = self.column('term_offsets')
+        codes = self.column('term_codes')
+        return [self.terms[code] for code in codes[offsets[row]:offsets[row + 1]]]
+
+    def row(self, row: int) -> dict:
+        """Rebuild a processed-video record"""
+        classification = {}
+        for category, label in self.row_terms(row):
+            classification.setdefault(category, []).append(label)
+        tags = self.string('tags', row)
+        record = {
+            'channel_name': self.channels[self.column('channel')[row]],
+            'title': self.string('title', row),
+            'description': self.string('description', row),
+            'tags': tags.split(TAG_SEPARATOR) if tags else [],
+            'youtube_link': self.string('youtube_link', row),
+            'video_id': self.string('video_id', row),
+            'language': self.languages[self.column('language')[row]],
+            'classification': classification
+        }
+        for name in NUMERIC_COLUMNS:
+            record[name] = self.column(name)[row]
+        return record
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in range(self.rows):
+            yield self.row(row)
+
+
+def main():
+    """Convert a processed JSON file to the columnar format, or describe an existing file"""
+    parser = argparse.ArgumentParser(description="Columnar export of processed BJJ videos")
+    parser.add_argument('input', help="Processed JSON file to convert, or a columnar file with --info")
+    parser.add_argument('output', nargs='?', default='bjj_videos.col', help="Columnar output file")
+    parser.add_argument('--info', action='store_true', help="Describe a columnar file instead of writing one")
+    args = parser.parse_args()
+
+    if args.info:
+        with ColumnarDataset(args.input) as dataset:
+            views = dataset.column('view_count')
+            print(f"{args.input}: {len(dataset)} videos, {len(dataset.channels)} channels, {len(dataset.terms)} terms")
+            print(f"Total views: {sum(views)}")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        videos = json.load(f)
+    write_columnar(videos, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Inverted index over classified BJJ videos
+Maps every classification label, category and channel to a posting list of
+video positions in the processed JSON, so the web app can answer any filter
+combination with posting-list intersections instead of a full scan
+Posting lists are delta-encoded (first position, then gaps) to stay compact
+"""
+
+from typing import Iterable, List
+
+from json_artifacts import save_json
+
+
+INDEX_FORMAT = 1
+
+
+def encode_postings(positions: List[int]) -> List[int]:
+    """Delta-encode a sorted list of positions"""
+    encoded = []
+    previous = 0
+    for position in positions:
+        encoded.append(position - previous)
+        previous = position
+    return encoded
+
+
+def decode_postings(deltas: List[int]) -> List[int]:
+    """Turn a delta-encoded posting list back into positions"""
+    positions = []
+    position = 0
+    for delta in deltas:
+        position += delta
+        positions.append(position)
+    return positions
+
+
+def intersect_postings(*posting_lists: List[int]) -> List[int]:
+    """Intersect sorted (decoded) posting lists, smallest first"""
+    if not posting_lists:
+        return []
+    ordered = sorted(posting_lists, key=len)
+    result = ordered[0]
+    for other in ordered[1:]:
+        if not result:
+            break
+        matches = []
+        i = j = 0
+        while i < len(result) and j < len(other):
+            if result[i] == other[j]:
+                matches.append(result[i])
+                i += 1
+                j += 1
+            elif result[i] < other[j]:
+                i += 1
+            else:
+                j += 1
+        result = matches
+    return result
+
+
+class InvertedIndexBuilder:
+    """
+    Accumulates posting lists while videos are classified
+    Keys are lowercased the same way the web app lowercases filter values
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.terms = {}         # category -> label -> [positions]
+        self.categories = {}    # category -> [positions]
+        self.channels = {}      # channel -> [positions]
+
+    def add(self, position: int, video: dict):
+        """Index one processed video at its position in the output file"""
+        self.count = max(self.count, position + 1)
+
+        for category, labels in (video.get('classification') or {}).items():
+            if not labels:
+                continue
+            self.categories.setdefault(category, []).append(position)
+            category_terms = self.terms.setdefault(category, {})
+            for label in labels:
+                postings = category_terms.setdefault(label.lower(), [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+
+        channel = (video.get('channel_name') or '').strip().lower()
+        if channel:
+            self.channels.setdefault(channel, []).append(position)
+
+    def add_all(self, videos: Iterable[dict]):
+        for position, video in enumerate(videos):
+            self.add(position, video)
+
+    def to_dict(self, source: str = '') -> dict:
+        return {
+            'format': INDEX_FORMAT,
+            'source': source,
+            'count': self.count,
+            'terms': {
+                category: {label: encode_postings(postings) for label, postings in labels.items()}
+                for category, labels in self.terms.items()
+            },
+            'categories': {category: encode_postings(postings) for category, postings in self.categories.items()},
+            'channels': {channel: encode_postings(postings) for channel, postings in self.channels.items()}
+        }
+
+    def save(self, index_file: str, source: str = '', compress: bool = True):
+        """Write the index as compact JSON (atomically, with .gz/.br siblings unless compress=False)"""
+        save_json(self.to_dict(source), index_file, compress=compress)
+        print(f"Inverted index saved to {index_file} "
+              f"({sum(len(labels) for labels in self.terms.values())} terms, {len(self.channels)} channels)")
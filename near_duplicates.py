@@ -0,0 +1,237 @@
+"""
+Near-duplicate detection for reuploads (the same technique as a short, a clip
+and a full video with nearly identical titles and descriptions)
+- every video becomes a set of word 3-gram shingles over its title + description;
+  shingles shared by many videos (channel boilerplate, sponsor links) are dropped
+- a MinHash signature of NUM_PERM values estimates the Jaccard similarity of two sets
+- LSH splits signatures into BANDS bands; only videos sharing a whole band are
+  compared, so the work is linear in the corpus instead of all pairs
+- pairs whose estimated similarity reaches the threshold are merged into clusters
+
+NumPy is optional: it vectorizes the signatures and the banding, and the
+pure-Python fallback (much slower on large corpora) produces the same clusters
+"""
+
+import argparse
+import re
+import time
+import zlib
+from collections import Counter
+from random import Random
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from classify_bjj_videos import iter_json_records
+from json_artifacts import save_json
+from text_normalize import normalize_text
+
+
+NEAR_DUPLICATES_FORMAT = 1
+NEAR_DUPLICATES_FILE = 'near_duplicates.json'
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard share a band with high probability
+BANDS = 16
+THRESHOLD = 0.7
+# Shingles in more videos than this are boilerplate, not evidence of a reupload
+MAX_SHINGLE_DF = 50
+SEED = 1
+
+_URL = re.compile(r"https?://\S+")
+_WORD = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+
+
+def shingles(video: dict, size: int = SHINGLE_SIZE) -> List[int]:
+    """Sorted 32-bit hashes of the word shingles of a video's title and description"""
+    text = f"{video.get('title') or ''} {video.get('description') or ''}"
+    words = _WORD.findall(normalize_text(_URL.sub(' ', text)))
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return sorted({zlib.crc32(gram.encode('utf-8')) for gram in grams})
+
+
+def _permutations(num_perm: int, seed: int) -> List[tuple]:
+    # Multiply-shift hashes ((a * x + b) mod 2^64) >> 32 with odd a
+    rng = Random(seed)
+    return [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+
+
+def _drop_common(docs: List[List[int]], max_df: int) -> List[List[int]]:
+    if not max_df:
+        return docs
+    df = Counter(h for doc in docs for h in doc)
+    common = {h for h, count in df.items() if count > max_df}
+    if not common:
+        return docs
+    return [[h for h in doc if h not in common] for doc in docs]
+
+
+def _signatures_python(docs: List[List[int]], permutations: List[tuple]) -> List[tuple]:
+    return [tuple(min(((a * x + b) & _MASK64) >> 32 for x in doc) for a, b in permutations)
+            for doc in docs]
+
+
+def _signatures_numpy(docs: List[List[int]], permutations: List[tuple], chunk: int = 1 << 20):
+    lengths = np.array([len(doc) for doc in docs], dtype=np.int64)
+    flat = np.fromiter((h for doc in docs for h in doc), dtype=np.uint64, count=int(lengths.sum()))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    a = np.array([p[0] for p in permutations], dtype=np.uint64)
+    b = np.array([p[1] for p in permutations], dtype=np.uint64)
+
+    signatures = np.empty((len(docs), len(permutations)), dtype=np.uint64)
+    # Blocks of whole documents with about `chunk` shingles each bound the temporary arrays
+    row = 0
+    while row < len(docs):
+        end = int(np.searchsorted(starts, starts[row] + chunk, side='right'))
+        end = max(end, row + 1)
+        lo, hi = starts[row], starts[end - 1] + lengths[end - 1]
+        block = flat[lo:hi]
+        for i in range(len(permutations)):
+            hashed = (a[i] * block + b[i]) >> np.uint64(32)
+            signatures[row:end, i] = np.minimum.reduceat(hashed, starts[row:end] - lo)
+        row = end
+    return signatures
+
+
+def _candidates_python(signatures: List[tuple], bands: int) -> List[tuple]:
+    rows = len(signatures[0]) // bands if signatures else 0
+    pairs = []
+    for band in range(bands):
+        first = {}
+        for doc, signature in enumerate(signatures):
+            key = signature[band * rows:(band + 1) * rows]
+            leader = first.setdefault(key, doc)
+            if leader != doc:
+                pairs.append((leader, doc))
+    return pairs
+
+
+def _candidates_numpy(signatures, bands: int) -> List[tuple]:
+    rows = signatures.shape[1] // bands
+    pairs = []
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * rows))).ravel()
+        _, leaders, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        leader = leaders[inverse.ravel()]
+        members = np.nonzero(leader != np.arange(len(keys)))[0]
+        pairs.extend(zip(leader[members].tolist(), members.tolist()))
+    return pairs
+
+
+def find_clusters(videos: Sequence[dict], threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+                  bands: int = BANDS, max_df: int = MAX_SHINGLE_DF, seed: int = SEED,
+                  backend: str = None) -> List[List[int]]:
+    """
+    Clusters (lists of video positions, ascending) of videos whose title +
+    description shingles are estimated to be at least `threshold` similar
+    Each video in a shared LSH bucket is compared with the bucket's first video
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+    backend = backend or ('numpy' if np is not None else 'python')
+
+    docs = _drop_common([shingles(video) for video in videos], max_df)
+    # Videos without distinctive shingles cannot be compared
+    positions = [i for i, doc in enumerate(docs) if doc]
+    docs = [docs[i] for i in positions]
+    if not docs:
+        return []
+
+    permutations = _permutations(num_perm, seed)
+    if backend == 'numpy':
+        signatures = _signatures_numpy(docs, permutations)
+        pairs = _candidates_numpy(signatures, bands)
+    else:
+        signatures = _signatures_python(docs, permutations)
+        pairs = _candidates_python(signatures, bands)
+
+    parent = list(range(len(docs)))
+
+    def find(doc):
+        while parent[doc] != doc:
+            parent[doc] = parent[parent[doc]]
+            doc = parent[doc]
+        return doc
+
+    min_equal = threshold * num_perm
+    checked = set()
+    for pair in pairs:
+        if pair in checked:
+            continue
+        checked.add(pair)
+        first, second = pair
+        if backend == 'numpy':
+            equal = int(np.count_nonzero(signatures[first] == signatures[second]))
+        else:
+            equal = sum(x == y for x, y in zip(signatures[first], signatures[second]))
+        if equal >= min_equal:
+            parent[find(second)] = find(first)
+
+    clusters = {}
+    for doc in range(len(docs)):
+        clusters.setdefault(find(doc), []).append(positions[doc])
+    return sorted(members for members in clusters.values() if len(members) > 1)
+
+
+def build_near_duplicates(videos: Sequence[dict], source: str = '', **options) -> Dict:
+    """Near-duplicate artifact: clusters of positions in the source file"""
+    clusters = find_clusters(videos, **options)
+    return {
+        'format': NEAR_DUPLICATES_FORMAT,
+        'source': source,
+        'count': len(videos),
+        'threshold': options.get('threshold', THRESHOLD),
+        'duplicates': sum(len(members) - 1 for members in clusters),
+        'clusters': clusters
+    }
+
+
+def save_near_duplicates(videos: Sequence[dict], output_file: str = NEAR_DUPLICATES_FILE, source: str = '',
+                         compress: bool = True, **options) -> Dict:
+    """Detect near-duplicates and write the artifact as compact JSON"""
+    artifact = build_near_duplicates(videos, source, **options)
+    save_json(artifact, output_file, compress=compress)
+    return artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect near-duplicate videos with MinHash/LSH")
+    parser.add_argument('input', nargs='?', default='bjj_simple_processed.json',
+                        help="Processed (or simplified) JSON/JSON Lines file")
+    parser.add_argument('--output', default=NEAR_DUPLICATES_FILE, help="Near-duplicate clusters artifact")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f"Minimum estimated Jaccard similarity (default: {THRESHOLD})")
+    parser.add_argument('--max-df', type=int, default=MAX_SHINGLE_DF,
+                        help=f"Ignore shingles found in more videos than this (default: {MAX_SHINGLE_DF}, 0 keeps all)")
+    parser.add_argument('--backend', choices=['numpy', 'python'], default=None,
+                        help="Force a backend (default: numpy when installed)")
+    parser.add_argument('--no-compress', action='store_true', help="Skip the .gz/.br copies")
+    args = parser.parse_args()
+
+    if args.backend == 'numpy' and np is None:
+        parser.error("backend 'numpy' is not installed")
+
+    start = time.perf_counter()
+    videos = list(iter_json_records(args.input))
+    artifact = save_near_duplicates(videos, args.output, source=args.input, compress=not args.no_compress,
+                                    threshold=args.threshold, max_df=args.max_df, backend=args.backend)
+    elapsed = time.perf_counter() - start
+
+    print(f"Found {len(artifact['clusters'])} near-duplicate clusters "
+          f"({artifact['duplicates']} redundant videos) in {artifact['count']} videos in {elapsed:.2f}s")
+    for members in sorted(artifact['clusters'], key=len, reverse=True)[:5]:
+        print(f"  {len(members)}x {videos[members[0]].get('title', '')[:70]}")
+    print(f"Near-duplicates saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
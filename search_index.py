@@ -0,0 +1,154 @@
+"""
+Full-text search index over video titles, tags and channel names
+Text is normalized like the classifier does (lowercase, accents folded) and
+split into word tokens. The artifact holds:
+- a sorted term dictionary: autocomplete and prefix search are a binary search
+  for the prefix range
+- precomputed completions (most frequent terms) for every prefix of up to
+  COMPLETION_PREFIX_LENGTH characters, whose ranges are too wide to scan per keystroke
+- one delta-encoded posting list of video positions per term
+Positions follow the web app's combined list: technique videos first, then
+the fight videos classified in the same run (see fight_start)
+"""
+
+import argparse
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List
+
+from inverted_index import decode_postings, encode_postings, intersect_postings
+from json_artifacts import save_json
+from text_normalize import normalize_text
+
+
+SEARCH_INDEX_FORMAT = 1
+SEARCH_INDEX_FILE = 'bjj_search.json'
+
+COMPLETION_PREFIX_LENGTH = 2
+COMPLETIONS = 8
+# Shorter query tokens must match a term exactly, longer ones match as prefixes
+MIN_PREFIX_LENGTH = 3
+
+_WORD = re.compile(r"\w+")
+
+
+class SearchIndexBuilder:
+    """
+    Accumulates term posting lists while videos are processed
+    normalize is the text normalization shared with the classifier (normalize_text)
+    """
+
+    def __init__(self, normalize: Callable[[str], str]):
+        self.normalize = normalize
+        self.count = 0
+        self.fight_start = None
+        self.postings = {}      # term -> [positions]
+
+    def tokenize(self, text: str) -> List[str]:
+        return _WORD.findall(self.normalize(text))
+
+    def add(self, position: int, video: dict):
+        """Index the title, tags and channel name of one video at its position"""
+        self.count = max(self.count, position + 1)
+        text = ' '.join([video.get('title') or '', video.get('channel_name') or '', *(video.get('tags') or [])])
+        for term in set(self.tokenize(text)):
+            self.postings.setdefault(term, []).append(position)
+
+    def add_all(self, videos: Iterable[dict]):
+        for position, video in enumerate(videos):
+            self.add(position, video)
+
+    def mark_fights(self, position: int):
+        """Positions from here on are fight videos"""
+        self.fight_start = position
+
+    def to_dict(self, source: str = '') -> dict:
+        terms = sorted(self.postings)
+        counts = [len(self.postings[term]) for term in terms]
+
+        # Most frequent terms for each short prefix (ties in dictionary order)
+        completions = {}
+        for term_id in sorted(range(len(terms)), key=lambda i: -counts[i]):
+            term = terms[term_id]
+            for length in range(1, min(len(term), COMPLETION_PREFIX_LENGTH) + 1):
+                top = completions.setdefault(term[:length], [])
+                if len(top) < COMPLETIONS:
+                    top.append(term_id)
+
+        return {
+            'format': SEARCH_INDEX_FORMAT,
+            'source': source,
+            'count': self.count,
+            'fight_start': self.count if self.fight_start is None else self.fight_start,
+            'min_prefix': MIN_PREFIX_LENGTH,
+            'terms': terms,
+            'counts': counts,
+            'completions': completions,
+            'postings': [encode_postings(sorted(self.postings[term])) for term in terms]
+        }
+
+    def save(self, index_file: str, source: str = '', compress: bool = True):
+        """Write the search index as compact JSON (atomically, with .gz/.br siblings unless compress=False)"""
+        save_json(self.to_dict(source), index_file, compress=compress)
+        print(f"Search index saved to {index_file} ({len(self.postings)} terms)")
+
+
+def prefix_range(terms: List[str], prefix: str) -> range:
+    """Ids of the sorted terms starting with prefix"""
+    start = bisect_left(terms, prefix)
+    end = bisect_left(terms, prefix + '\U0010ffff', start)
+    return range(start, end)
+
+
+def complete(index: Dict, prefix: str, limit: int = COMPLETIONS) -> List[str]:
+    """Most frequent terms starting with prefix"""
+    terms = index['terms']
+    if prefix in index['completions']:
+        return [terms[i] for i in index['completions'][prefix][:limit]]
+    ids = sorted(prefix_range(terms, prefix), key=lambda i: -index['counts'][i])
+    return [terms[i] for i in ids[:limit]]
+
+
+def search(index: Dict, query: str, normalize: Callable[[str], str]) -> List[int]:
+    """Positions of the videos matching every query token (long tokens as prefixes)"""
+    terms = index['terms']
+    lists = []
+    for token in _WORD.findall(normalize(query)):
+        if len(token) < index['min_prefix']:
+            term_id = bisect_left(terms, token)
+            ids = [term_id] if term_id < len(terms) and terms[term_id] == token else []
+        else:
+            ids = prefix_range(terms, token)
+        positions = sorted({position for i in ids for position in decode_postings(index['postings'][i])})
+        if not positions:
+            return []
+        lists.append(positions)
+    return intersect_postings(*lists) if lists else []
+
+
+def main():
+    """Build the search index from an existing processed file (technique videos only)"""
+    from classify_bjj_videos import iter_json_records
+
+    parser = argparse.ArgumentParser(description="Build the full-text search index")
+    parser.add_argument('input', nargs='?', default='bjj_simple_processed.json',
+                        help="Processed (or simplified) JSON/JSON Lines file")
+    parser.add_argument('--output', default=SEARCH_INDEX_FILE, help="Search index file")
+    parser.add_argument('--query', default=None, help="Also run a test query against the new index")
+    args = parser.parse_args()
+
+    builder = SearchIndexBuilder(normalize_text)
+    builder.add_all(iter_json_records(args.input))
+    builder.save(args.output, source=args.input)
+
+    if args.query:
+        index = builder.to_dict(args.input)
+        positions = search(index, args.query, normalize_text)
+        words = _WORD.findall(normalize_text(args.query))
+        print(f"'{args.query}': {len(positions)} videos")
+        if words:
+            print(f"Completions of '{words[-1]}': {', '.join(complete(index, words[-1]))}")
+
+
+if __name__ == '__main__':
+    main()
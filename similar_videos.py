@@ -0,0 +1,204 @@
+"""
+Precomputed "more like this" lists
+Every video becomes a TF-IDF vector over three kinds of features: title words,
+tags and classification terms (weighted higher, they are the glossary's view of
+the technique). Vectors are L2-normalized, so a dot product is the cosine.
+
+Blocking keeps this far from all-pairs: candidates only meet through features
+shared by at most max_df videos. Very common features ("bjj", "Closed Guard")
+have a low IDF anyway, and skipping them bounds the work per video. The
+resulting scores are the cosine restricted to those features.
+
+SciPy computes the scores as sparse products over row chunks. The pure-Python
+fallback accumulates them over posting lists and produces the same neighbours,
+only much more slowly on large catalogues.
+"""
+
+import argparse
+import math
+import re
+import time
+from typing import Callable, Dict, List, Sequence
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+from json_artifacts import save_json
+from text_normalize import normalize_text
+
+
+SIMILAR_VIDEOS_FORMAT = 1
+SIMILAR_VIDEOS_FILE = 'similar_videos.json'
+
+NEIGHBOURS = 10
+# Features in more videos than this do not generate candidates (see module docstring)
+MAX_BLOCK_DF = 1000
+FEATURE_WEIGHTS = {'title': 1.0, 'tag': 1.0, 'term': 1.5}
+# Scores are compared at this precision, so both backends rank ties the same way
+SCORE_DIGITS = 6
+ROW_CHUNK = 2000
+
+_WORD = re.compile(r"\w+")
+
+
+def video_features(video: dict, normalize: Callable[[str], str]) -> Dict[str, int]:
+    """Feature -> term frequency for one video ('title:...', 'tag:...', 'term:category:label')"""
+    features = {}
+    for word in _WORD.findall(normalize(video.get('title') or '')):
+        key = f"title:{word}"
+        features[key] = features.get(key, 0) + 1
+    for tag in video.get('tags') or []:
+        tag = ' '.join(_WORD.findall(normalize(tag)))
+        if tag:
+            features[f"tag:{tag}"] = 1
+    for category, labels in (video.get('classification') or {}).items():
+        for label in labels:
+            features[f"term:{category}:{label}"] = 1
+    return features
+
+
+def tfidf_vectors(videos: Sequence[dict], normalize: Callable[[str], str]):
+    """(feature names, per-video lists of (feature id, weight) with unit length, document frequencies)"""
+    vocabulary = {}
+    docs = []
+    for video in videos:
+        doc = {}
+        for feature, tf in video_features(video, normalize).items():
+            feature_id = vocabulary.setdefault(feature, len(vocabulary))
+            doc[feature_id] = tf
+        docs.append(doc)
+
+    df = [0] * len(vocabulary)
+    for doc in docs:
+        for feature_id in doc:
+            df[feature_id] += 1
+    weights = [FEATURE_WEIGHTS[feature.split(':', 1)[0]] for feature in vocabulary]
+
+    n = len(docs)
+    vectors = []
+    for doc in docs:
+        vector = [(feature_id, (1 + math.log(tf)) * (math.log((1 + n) / (1 + df[feature_id])) + 1) * weights[feature_id])
+                  for feature_id, tf in sorted(doc.items())]
+        norm = math.sqrt(sum(weight * weight for _, weight in vector)) or 1.0
+        vectors.append([(feature_id, weight / norm) for feature_id, weight in vector])
+    return list(vocabulary), vectors, df
+
+
+def _top_k(candidates, k: int) -> List[int]:
+    # candidates: (position, score); best scores first, then lowest position
+    ranked = sorted(((-round(score, SCORE_DIGITS), position) for position, score in candidates if score > 0))
+    return [position for _, position in ranked[:k]]
+
+
+def _neighbours_python(vectors, df, k: int, max_df: int) -> List[List[int]]:
+    postings = {}
+    for position, vector in enumerate(vectors):
+        for feature_id, weight in vector:
+            if df[feature_id] <= max_df:
+                postings.setdefault(feature_id, []).append((position, weight))
+
+    neighbours = []
+    for position, vector in enumerate(vectors):
+        scores = {}
+        for feature_id, weight in vector:
+            for other, other_weight in postings.get(feature_id, ()):
+                if other != position:
+                    scores[other] = scores.get(other, 0.0) + weight * other_weight
+        neighbours.append(_top_k(scores.items(), k))
+    return neighbours
+
+
+def _neighbours_scipy(vectors, df, k: int, max_df: int) -> List[List[int]]:
+    kept = np.array(df) <= max_df
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(vector) for vector in vectors])
+    indices = np.fromiter((f for vector in vectors for f, _ in vector), dtype=np.int64, count=int(indptr[-1]))
+    data = np.fromiter((w for vector in vectors for _, w in vector), dtype=np.float64, count=int(indptr[-1]))
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), len(df)))
+    blocked = (matrix @ sparse.diags(kept.astype(np.float64))).tocsr()
+    blocked.eliminate_zeros()
+    transposed = blocked.T.tocsr()
+
+    neighbours = []
+    for start in range(0, len(vectors), ROW_CHUNK):
+        scores = (blocked[start:start + ROW_CHUNK] @ transposed).tocsr()
+        for row in range(scores.shape[0]):
+            lo, hi = scores.indptr[row], scores.indptr[row + 1]
+            columns, values = scores.indices[lo:hi], scores.data[lo:hi]
+            keep = columns != start + row
+            columns, values = columns[keep], values[keep]
+            if len(values) > k:
+                # Keep every candidate tied with the k-th score, ties are broken by position
+                cutoff = np.partition(np.round(values, SCORE_DIGITS), len(values) - k)[len(values) - k]
+                keep = np.round(values, SCORE_DIGITS) >= cutoff
+                columns, values = columns[keep], values[keep]
+            neighbours.append(_top_k(zip(columns.tolist(), values.tolist()), k))
+    return neighbours
+
+
+def find_similar(videos: Sequence[dict], normalize: Callable[[str], str], k: int = NEIGHBOURS,
+                 max_df: int = MAX_BLOCK_DF, backend: str = None) -> List[List[int]]:
+    """Positions of the k most similar videos of every video, most similar first"""
+    backend = backend or ('scipy' if sparse is not None else 'python')
+    _, vectors, df = tfidf_vectors(videos, normalize)
+    if backend == 'scipy':
+        return _neighbours_scipy(vectors, df, k, max_df)
+    return _neighbours_python(vectors, df, k, max_df)
+
+
+def save_similar_videos(videos: Sequence[dict], normalize: Callable[[str], str],
+                        output_file: str = SIMILAR_VIDEOS_FILE, source: str = '',
+                        compress: bool = True, **options) -> Dict:
+    """Compute the neighbour lists and write them as compact JSON"""
+    neighbours = find_similar(videos, normalize, **options)
+    artifact = {
+        'format': SIMILAR_VIDEOS_FORMAT,
+        'source': source,
+        'count': len(videos),
+        'k': options.get('k', NEIGHBOURS),
+        'neighbours': neighbours
+    }
+    save_json(artifact, output_file, compress=compress)
+    return artifact
+
+
+def main():
+    from classify_bjj_videos import iter_json_records
+
+    parser = argparse.ArgumentParser(description="Precompute similar videos (TF-IDF top-k neighbours)")
+    parser.add_argument('input', nargs='?', default='bjj_simple_processed.json',
+                        help="Processed JSON/JSON Lines file")
+    parser.add_argument('--output', default=SIMILAR_VIDEOS_FILE, help="Neighbours artifact")
+    parser.add_argument('-k', type=int, default=NEIGHBOURS, help=f"Neighbours per video (default: {NEIGHBOURS})")
+    parser.add_argument('--max-df', type=int, default=MAX_BLOCK_DF,
+                        help=f"Features in more videos than this do not generate candidates (default: {MAX_BLOCK_DF})")
+    parser.add_argument('--backend', choices=['scipy', 'python'], default=None,
+                        help="Force a backend (default: scipy when installed)")
+    parser.add_argument('--no-compress', action='store_true', help="Skip the .gz/.br copies")
+    args = parser.parse_args()
+
+    if args.backend == 'scipy' and sparse is None:
+        parser.error("backend 'scipy' is not installed")
+
+    start = time.perf_counter()
+    videos = list(iter_json_records(args.input))
+    artifact = save_similar_videos(videos, normalize_text, args.output, source=args.input,
+                                   compress=not args.no_compress, k=args.k, max_df=args.max_df,
+                                   backend=args.backend)
+    elapsed = time.perf_counter() - start
+
+    with_neighbours = sum(1 for neighbours in artifact['neighbours'] if neighbours)
+    print(f"Computed neighbours for {with_neighbours}/{artifact['count']} videos in {elapsed:.2f}s")
+    if videos and artifact['neighbours'][0]:
+        print(f"  '{videos[0].get('title', '')[:60]}' is like:")
+        for position in artifact['neighbours'][0][:3]:
+            print(f"    {videos[position].get('title', '')[:60]}")
+    print(f"Similar videos saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""
+Term co-occurrence and channel x term analytics over classified BJJ videos
+Builds a sparse video x term incidence matrix (CSR: row offsets + term codes)
+from the classification output, then derives:
+- term co-occurrence counts (which guards lead to which submissions)
+- channel x term counts (which channels focus on what)
+
+NumPy/SciPy are optional. With SciPy the counts are sparse matrix products,
+with NumPy alone they are vectorized pair encodings + np.unique, and without
+either a pure-Python Counter fallback produces the same artifact
+Reading a columnar file (columnar_dataset.py) skips JSON parsing entirely,
+its term_offsets/term_codes sections already are the CSR arrays
+"""
+
+import argparse
+import time
+from collections import Counter
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+from json_artifacts import save_json
+
+
+ANALYTICS_FORMAT = 1
+ANALYTICS_FILE = 'bjj_analytics.json'
+
+
+class TermMatrix:
+    """
+    Video x term incidence in CSR form
+    Row i holds the codes of the (category, label) terms of video i in
+    indices[indptr[i]:indptr[i + 1]]; channel_codes[i] is its channel
+    """
+
+    def __init__(self, terms: List[Tuple[str, str]], channels: List[str],
+                 indptr, indices, channel_codes):
+        self.terms = terms
+        self.channels = channels
+        self.indptr = indptr
+        self.indices = indices
+        self.channel_codes = channel_codes
+
+    @property
+    def rows(self) -> int:
+        return len(self.channel_codes)
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[dict]) -> 'TermMatrix':
+        """Build from processed video records (one linear pass)"""
+        term_codes = {}
+        channel_codes = {}
+        indptr = [0]
+        indices = []
+        channels = []
+        for video in videos:
+            for category, labels in (video.get('classification') or {}).items():
+                for label in labels:
+                    term = (category, label)
+                    code = term_codes.get(term)
+                    if code is None:
+                        code = term_codes[term] = len(term_codes)
+                    indices.append(code)
+            indptr.append(len(indices))
+            channel = video.get('channel_name') or ''
+            code = channel_codes.get(channel)
+            if code is None:
+                code = channel_codes[channel] = len(channel_codes)
+            channels.append(code)
+
+        if np is not None:
+            indptr = np.array(indptr, dtype=np.int64)
+            indices = np.array(indices, dtype=np.int64)
+            channels = np.array(channels, dtype=np.int64)
+        return cls(list(term_codes), list(channel_codes), indptr, indices, channels)
+
+    @classmethod
+    def from_columnar(cls, path: str) -> 'TermMatrix':
+        """Build from a columnar dataset without decoding any record"""
+        from columnar_dataset import ColumnarDataset
+
+        with ColumnarDataset(path) as dataset:
+            columns = [dataset.column(name) for name in ('term_offsets', 'term_codes', 'channel')]
+            if np is not None:
+                # Copy out of the mapping so the arrays outlive the file
+                indptr, indices, channels = (np.array(column, dtype=np.int64) for column in columns)
+            else:
+                indptr, indices, channels = (list(column) for column in columns)
+            del columns
+            return cls(list(dataset.terms), list(dataset.channels), indptr, indices, channels)
+
+
+def _sparse_counts(keys, width: int) -> Tuple[list, list, list]:
+    # keys encode (row, col) as row * width + col
+    keys, counts = np.unique(keys, return_counts=True)
+    return (keys // width).tolist(), (keys % width).tolist(), counts.tolist()
+
+
+def _coo_lists(matrix, upper: bool = False) -> Tuple[list, list, list]:
+    coo = matrix.tocoo()
+    rows, cols, counts = coo.row, coo.col, coo.data
+    if upper:
+        keep = rows < cols
+        rows, cols, counts = rows[keep], cols[keep], counts[keep]
+    order = np.lexsort((cols, rows))
+    return rows[order].tolist(), cols[order].tolist(), counts[order].tolist()
+
+
+def _compute_scipy(matrix: TermMatrix) -> Dict:
+    n_terms = len(matrix.terms)
+    data = np.ones(len(matrix.indices), dtype=np.int64)
+    videos = sparse.csr_matrix((data, matrix.indices, matrix.indptr), shape=(matrix.rows, n_terms))
+    channels = sparse.csr_matrix(
+        (np.ones(matrix.rows, dtype=np.int64), (np.arange(matrix.rows), matrix.channel_codes)),
+        shape=(matrix.rows, len(matrix.channels))
+    )
+    cooccurrence = (videos.T @ videos).tocsr()
+    return {
+        'term_counts': cooccurrence.diagonal().tolist(),
+        'cooccurrence': _coo_lists(cooccurrence, upper=True),
+        'channel_term': _coo_lists(channels.T @ videos)
+    }
+
+
+def _compute_numpy(matrix: TermMatrix) -> Dict:
+    n_terms = len(matrix.terms)
+    lengths = np.diff(matrix.indptr)
+
+    # Rows with the same number of terms are processed together as a 2-D block
+    pair_keys = []
+    for length in np.unique(lengths):
+        if length < 2:
+            continue
+        starts = matrix.indptr[:-1][lengths == length]
+        block = matrix.indices[starts[:, None] + np.arange(length)]
+        for a, b in combinations(range(length), 2):
+            first = np.minimum(block[:, a], block[:, b])
+            second = np.maximum(block[:, a], block[:, b])
+            pair_keys.append(first * n_terms + second)
+    pair_keys = np.concatenate(pair_keys) if pair_keys else np.empty(0, dtype=np.int64)
+
+    entry_channels = np.repeat(matrix.channel_codes, lengths)
+    return {
+        'term_counts': np.bincount(matrix.indices, minlength=n_terms).tolist(),
+        'cooccurrence': _sparse_counts(pair_keys, n_terms),
+        'channel_term': _sparse_counts(entry_channels * n_terms + matrix.indices, n_terms)
+    }
+
+
+def _compute_python(matrix: TermMatrix) -> Dict:
+    term_counts = [0] * len(matrix.terms)
+    pairs = Counter()
+    channel_term = Counter()
+    indptr, indices = matrix.indptr, matrix.indices
+    for row, channel in enumerate(matrix.channel_codes):
+        codes = sorted(indices[indptr[row]:indptr[row + 1]])
+        for code in codes:
+            term_counts[code] += 1
+            channel_term[channel, code] += 1
+        pairs.update(combinations(codes, 2))
+
+    def triplets(counter: Counter) -> Tuple[list, list, list]:
+        keys = sorted(counter)
+        return [k[0] for k in keys], [k[1] for k in keys], [counter[k] for k in keys]
+
+    return {
+        'term_counts': term_counts,
+        'cooccurrence': triplets(pairs),
+        'channel_term': triplets(channel_term)
+    }
+
+
+def backend_name() -> str:
+    if np is not None and sparse is not None:
+        return 'scipy'
+    return 'numpy' if np is not None else 'python'
+
+
+def compute_analytics(matrix: TermMatrix, backend: str = None) -> Dict:
+    """
+    Term frequencies, upper-triangular term co-occurrence counts and
+    channel x term counts, as (rows, cols, counts) triplets sorted by row/col
+    """
+    backend = backend or backend_name()
+    compute = {'scipy': _compute_scipy, 'numpy': _compute_numpy, 'python': _compute_python}[backend]
+    result = compute(matrix)
+
+    def as_dict(triplets):
+        rows, cols, counts = triplets
+        return {'rows': rows, 'cols': cols, 'counts': counts}
+
+    return {
+        'format': ANALYTICS_FORMAT,
+        'videos': matrix.rows,
+        'terms': [list(term) for term in matrix.terms],
+        'channels': matrix.channels,
+        'term_counts': result['term_counts'],
+        'cooccurrence': as_dict(result['cooccurrence']),
+        'channel_term': as_dict(result['channel_term'])
+    }
+
+
+def top_pairs(analytics: Dict, first_category: str, second_category: str, limit: int = 10) -> List[Tuple[str, str, int]]:
+    """Most frequent (first category label, second category label) co-occurrences"""
+    terms = analytics['terms']
+    pairs = []
+    matrix = analytics['cooccurrence']
+    for row, col, count in zip(matrix['rows'], matrix['cols'], matrix['counts']):
+        for a, b in ((row, col), (col, row)):
+            if terms[a][0] == first_category and terms[b][0] == second_category:
+                pairs.append((terms[a][1], terms[b][1], count))
+    pairs.sort(key=lambda pair: pair[2], reverse=True)
+    return pairs[:limit]
+
+
+def channel_focus(analytics: Dict, limit: int = 3) -> Dict[str, List[Tuple[str, float]]]:
+    """Each channel's top terms with the share of its classified term mentions"""
+    terms = analytics['terms']
+    by_channel = {}
+    matrix = analytics['channel_term']
+    for row, col, count in zip(matrix['rows'], matrix['cols'], matrix['counts']):
+        by_channel.setdefault(row, []).append((count, col))
+
+    focus = {}
+    for row, entries in by_channel.items():
+        total = sum(count for count, _ in entries)
+        entries.sort(reverse=True)
+        focus[analytics['channels'][row]] = [(terms[col][1], count / total) for count, col in entries[:limit]]
+    return focus
+
+
+def _print_report(analytics: Dict, elapsed: float, backend: str):
+    print(f"Analyzed {analytics['videos']} videos, {len(analytics['terms'])} terms, "
+          f"{len(analytics['channels'])} channels in {elapsed:.2f}s ({backend})")
+    print(f"Non-zero co-occurrences: {len(analytics['cooccurrence']['counts'])}, "
+          f"channel x term cells: {len(analytics['channel_term']['counts'])}")
+
+    print("\nTop guard -> submission pairs:")
+    for guard, submission, count in top_pairs(analytics, 'guard_type', 'submission'):
+        print(f"  {guard} -> {submission}: {count}")
+
+    print("\nChannel focus (top 3 terms):")
+    for channel, focus in list(channel_focus(analytics).items())[:10]:
+        summary = ', '.join(f"{label} {share:.0%}" for label, share in focus)
+        print(f"  {channel or '(unknown)'}: {summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Term co-occurrence and channel x term matrices")
+    parser.add_argument('input', nargs='?', default='bjj_simple_processed.json',
+                        help="Processed JSON/JSON Lines file, or a columnar file (.col)")
+    parser.add_argument('--output', default=ANALYTICS_FILE, help="Analytics JSON artifact")
+    parser.add_argument('--npz', default=None,
+                        help="Also save the matrices as a compressed NumPy archive (requires NumPy)")
+    parser.add_argument('--backend', choices=['scipy', 'numpy', 'python'], default=None,
+                        help="Force a backend (default: best available)")
+    args = parser.parse_args()
+
+    backend = args.backend or backend_name()
+    if (backend != 'python' and np is None) or (backend == 'scipy' and sparse is None):
+        parser.error(f"backend '{backend}' is not installed")
+
+    start = time.perf_counter()
+    if args.input.endswith('.col'):
+        matrix = TermMatrix.from_columnar(args.input)
+    else:
+        from classify_bjj_videos import iter_json_records
+        matrix = TermMatrix.from_videos(iter_json_records(args.input))
+    analytics = compute_analytics(matrix, backend)
+    analytics['source'] = args.input
+    elapsed = time.perf_counter() - start
+
+    save_json(analytics, args.output)
+
+    if args.npz:
+        if np is None:
+            parser.error("--npz requires NumPy")
+        np.savez_compressed(
+            args.npz,
+            term_counts=np.array(analytics['term_counts'], dtype=np.int64),
+            **{f"{name}_{part}": np.array(analytics[name][part], dtype=np.int64)
+               for name in ('cooccurrence', 'channel_term') for part in ('rows', 'cols', 'counts')}
+        )
+
+    _print_report(analytics, elapsed, backend)
+    print(f"\nAnalytics saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
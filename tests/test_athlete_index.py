@@ -0,0 +1,59 @@
+"""Athlete name resolution and the athlete / head-to-head indexes"""
+
+from collections import Counter
+
+from athlete_index import _within_one_edit, build_athlete_index, resolve_athletes, soundex
+from inverted_index import decode_postings
+
+
+def test_soundex():
+    assert soundex('ryan') == 'R500'
+    assert soundex('ashcraft') == 'A261'   # 'h' does not separate s and c
+    assert soundex('tymczak') == 'T522'
+    assert soundex('pfister') == 'P236'    # first letter's code is not repeated
+
+
+def test_within_one_edit():
+    assert _within_one_edit('ryan', 'ryan')
+    assert _within_one_edit('ryan', 'rayn')     # swap
+    assert _within_one_edit('ryan', 'ryann')    # insertion
+    assert _within_one_edit('ryan', 'rian')     # substitution
+    assert not _within_one_edit('ryan', 'rain')
+    assert not _within_one_edit('ryan', 'ryanss')
+
+
+def test_spellings_initials_and_typos_resolve_to_one_athlete():
+    mentions = Counter({'Gordon Ryan': 5, 'G. Ryan': 2, 'Gordon Rayn': 1, 'Gordon Ryan (USA)': 1,
+                        'Felipe Pena': 2, 'Felipe Pena Jr.': 1})
+    athletes, ids = resolve_athletes(mentions)
+    assert athletes[ids['Gordon Ryan']] == {
+        'name': 'Gordon Ryan', 'aliases': ['G. Ryan', 'Gordon Rayn', 'Gordon Ryan (USA)']}
+    assert ids['Felipe Pena Jr.'] == ids['Felipe Pena']
+    assert len(athletes) == 2
+
+
+def test_ambiguous_initial_stays_separate():
+    athletes, ids = resolve_athletes(Counter({'Craig Jones': 3, 'Chris Jones': 1, 'C. Jones': 1}))
+    assert len({ids['Craig Jones'], ids['Chris Jones'], ids['C. Jones']}) == 3
+
+
+def test_known_athletes_give_the_display_name():
+    athletes, _ = resolve_athletes(Counter({'gordon ryan': 3}), {'gordon ryan': 'Gordon Ryan'})
+    assert athletes == [{'name': 'Gordon Ryan', 'aliases': ['gordon ryan']}]
+
+
+def test_build_athlete_index_postings_and_pairs():
+    fights = [
+        {'athletes': ['Gordon Ryan', 'Craig Jones']},
+        {'athletes': ['G. Ryan']},
+        {'athletes': ['Craig Jones', 'Gordon Rayn']},
+        {'athletes': []},
+    ]
+    index = build_athlete_index(fights)
+    assert index['count'] == 4
+    # Most active athlete first
+    assert [(a['name'], a['fights']) for a in index['athletes']] == [('Gordon Ryan', 3), ('Craig Jones', 2)]
+    assert index['names']['g ryan'] == index['names']['gordon rayn'] == 0
+    assert index['names']['craig jones'] == 1
+    assert [decode_postings(postings) for postings in index['postings']] == [[0, 1, 2], [0, 2]]
+    assert [[a, b, decode_postings(positions)] for a, b, positions in index['pairs']] == [[0, 1, [0, 2]]]
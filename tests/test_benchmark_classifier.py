@@ -0,0 +1,32 @@
+"""Baseline comparisons of the classifier benchmark"""
+
+from benchmark_classifier import compare_scaling, compare_to_baseline, run_benchmarks, scaling_ratios
+
+
+def results(g1, g10, size=10000):
+    return {f"title/g1/n{size}": {'videos_per_sec': g1}, f"title/g10/n{size}": {'videos_per_sec': g10}}
+
+
+def test_scaling_ratios_are_relative_to_the_real_glossary():
+    assert scaling_ratios(results(20000.0, 18000.0)) == {'title/g10/n10000': 0.9}
+    assert scaling_ratios({'title/g10/n1000': {'videos_per_sec': 5.0}}) == {}
+
+
+def test_relative_comparison_ignores_machine_speed():
+    baseline = results(30000.0, 27000.0)
+    # A machine half as fast is an absolute regression, but scales the same
+    slower_machine = results(15000.0, 13500.0)
+    assert compare_to_baseline(slower_machine, baseline, 0.25)
+    assert compare_scaling(slower_machine, baseline, 0.25) == []
+
+
+def test_relative_comparison_catches_matching_that_grows_with_the_glossary():
+    regressions = compare_scaling(results(30000.0, 6000.0), results(30000.0, 27000.0), 0.25)
+    assert len(regressions) == 1 and regressions[0].startswith('title/g10/n10000')
+
+
+def test_run_benchmarks_keeps_the_fastest_run():
+    benchmark = run_benchmarks([50], [1, 2], 'title', repeat=2)
+    assert set(benchmark) == {'title/g1/n50', 'title/g2/n50'}
+    assert benchmark['title/g2/n50']['runs'] == 2
+    assert benchmark['title/g2/n50']['terms'] > benchmark['title/g1/n50']['terms']
@@ -0,0 +1,87 @@
+"""Classification cache invalidation on content and classifier version changes"""
+
+import pytest
+
+from classify_bjj_videos import (
+    BJJ_GLOSSARY,
+    CATEGORY_GROUPS,
+    GUARD_EMOJIS,
+    ClassificationCache,
+    GlossaryIndex,
+    classifier_version,
+    glossary_version,
+    process_bjj_videos
+)
+from json_artifacts import save_json
+
+
+VIDEO = {'title': 'Knee cut pass', 'description': '', 'tags': [],
+         'youtube_link': 'https://www.youtube.com/watch?v=abc123'}
+RESULT = {'pass': ['Knee Cut']}
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / 'cache.json')
+
+
+def saved_cache(cache_file, version='v1', videos=(VIDEO,)):
+    cache = ClassificationCache(cache_file, version)
+    for video in videos:
+        cache.put(video, RESULT)
+    cache.save()
+    return ClassificationCache(cache_file, version)
+
+
+def test_unchanged_video_is_a_hit(cache_file):
+    cache = saved_cache(cache_file)
+    assert cache.get(dict(VIDEO, view_count=10)) == RESULT   # fields the classifier ignores
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+@pytest.mark.parametrize('field, value', [('title', 'Knee cut pass v2'), ('description', 'new'), ('tags', ['bjj'])])
+def test_content_change_is_a_miss(cache_file, field, value):
+    cache = saved_cache(cache_file)
+    assert cache.get(dict(VIDEO, **{field: value})) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_version_change_drops_every_entry(cache_file):
+    saved_cache(cache_file, version='v1')
+    assert ClassificationCache(cache_file, 'v2').get(VIDEO) is None
+
+
+def test_save_keeps_only_videos_seen_this_run(cache_file):
+    other = dict(VIDEO, youtube_link='https://www.youtube.com/watch?v=def456')
+    cache = saved_cache(cache_file, videos=(VIDEO, other))
+    cache.get(VIDEO)
+    cache.save()
+    reloaded = ClassificationCache(cache_file, 'v1')
+    assert reloaded.get(VIDEO) == RESULT and reloaded.get(other) is None
+
+
+def test_unreadable_cache_is_ignored(cache_file):
+    with open(cache_file, 'w') as f:
+        f.write('{not json')
+    assert ClassificationCache(cache_file, 'v1').get(VIDEO) is None
+
+
+def test_glossary_fields_and_fuzziness_change_the_version():
+    term = next(iter(BJJ_GLOSSARY))
+    glossary = dict(BJJ_GLOSSARY, **{term: BJJ_GLOSSARY[term] + ['brand new keyword']})
+    assert glossary_version(glossary, CATEGORY_GROUPS, GUARD_EMOJIS) != \
+        GlossaryIndex(BJJ_GLOSSARY, CATEGORY_GROUPS, GUARD_EMOJIS).version
+    versions = {classifier_version(), classifier_version(fuzzy=1), classifier_version({})}
+    assert len(versions) == 3
+
+
+def test_process_reuses_the_cache_between_runs(tmp_path, capsys):
+    input_file = str(tmp_path / 'in.json')
+    save_json([VIDEO, dict(VIDEO, title='Hip bump sweep', youtube_link='https://www.youtube.com/watch?v=def456')],
+              input_file, compress=False)
+    options = dict(workers=1, cache_file=str(tmp_path / 'cache.json'), index_file=None, search_index_file=None,
+                   shards_dir='', compress=False, fight_input='')
+    first = process_bjj_videos(input_file, str(tmp_path / 'out.json'), **options)
+    assert 'Cache: 0 unchanged, 2 new or changed' in capsys.readouterr().out
+    assert process_bjj_videos(input_file, str(tmp_path / 'out.json'), **options) == first
+    assert 'Cache: 2 unchanged, 0 new or changed' in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""Columnar export and the memory-mapped reader"""
+
+import pytest
+
+from columnar_dataset import MAGIC, ColumnarDataset, parse_duration, parse_timestamp, write_columnar
+
+
+VIDEOS = [
+    {'title': 'Berimbolo from De La Riva', 'description': 'Détails du berimbolo', 'tags': ['bjj', 'berimbolo'],
+     'youtube_link': 'https://www.youtube.com/watch?v=abc123', 'channel_name': 'Mikey Musumeci',
+     'view_count': '120000', 'like_count': '3400', 'comment_count': None, 'duration': 'PT12M5S',
+     'published_at': '2024-05-01T12:00:00Z', 'language': 'en',
+     'classification': {'guard_type': ['De La Riva'], 'sweep': ['Berimbolo']}},
+    {'title': 'Passagem de guarda', 'video_id': 'xyz789', 'channel_name': 'Mikey Musumeci', 'view_count': 'n/a',
+     'default_language': 'pt', 'classification': {}},
+    {'title': '', 'youtube_link': '', 'classification': {'sweep': ['Berimbolo']}},
+]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = str(tmp_path / 'videos.col')
+    write_columnar(VIDEOS, path)
+    with ColumnarDataset(path) as dataset:
+        yield dataset
+
+
+def test_parsers():
+    assert parse_duration('PT1H2M3S') == 3723
+    assert parse_duration('P1DT1S') == 86401
+    assert parse_duration('') == parse_duration('garbage') == 0
+    assert parse_timestamp('1970-01-01T00:01:00Z') == 60
+    assert parse_timestamp('') == parse_timestamp('not a date') == 0
+
+
+def test_round_trip(dataset):
+    assert len(dataset) == 3
+    first = dataset.row(0)
+    assert first['title'] == 'Berimbolo from De La Riva'
+    assert first['description'] == 'Détails du berimbolo'
+    assert first['tags'] == ['bjj', 'berimbolo']
+    assert first['video_id'] == 'abc123'
+    assert first['classification'] == {'guard_type': ['De La Riva'], 'sweep': ['Berimbolo']}
+    assert (first['view_count'], first['like_count'], first['comment_count']) == (120000, 3400, 0)
+    assert first['duration_seconds'] == 725
+    assert first['published_at'] == parse_timestamp('2024-05-01T12:00:00Z')
+
+    second, third = dataset.row(1), dataset.row(2)
+    assert (second['video_id'], second['language'], second['view_count'], second['tags']) == ('xyz789', 'pt', 0, [])
+    assert (third['channel_name'], third['language'], third['title']) == ('', 'unknown', '')
+    assert [row['title'] for row in dataset] == [video['title'] for video in VIDEOS]
+
+
+def test_repeated_values_are_dictionary_encoded(dataset):
+    assert dataset.channels == ['Mikey Musumeci', '']
+    assert list(dataset.column('channel')) == [0, 0, 1]
+    assert dataset.terms.count(('sweep', 'Berimbolo')) == 1
+    assert dataset.row_terms(2) == [('sweep', 'Berimbolo')]
+
+
+def test_numeric_columns_are_aligned_views_over_the_file(dataset):
+    views = dataset.column('view_count')
+    assert isinstance(views, memoryview) and views.format == 'q'
+    assert list(views) == [120000, 0, 0]
+    assert all(offset % 8 == 0 for _, offset, _ in dataset.header['sections'].values())
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'not_columnar.col'
+    path.write_bytes(b'{"json": true}' + bytes(len(MAGIC)))
+    with pytest.raises(ValueError):
+        ColumnarDataset(str(path))
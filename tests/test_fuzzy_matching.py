@@ -0,0 +1,81 @@
+"""Fuzzy tier of the classifier: BK-tree lookups of misspelled keywords"""
+
+import itertools
+import random
+
+import pytest
+
+from classify_bjj_videos import (
+    BJJ_GLOSSARY,
+    CATEGORY_GROUPS,
+    FUZZY_MIN_WORD,
+    GUARD_EMOJIS,
+    GlossaryIndex,
+    _bk_insert,
+    _bk_search,
+    _edit_distance
+)
+
+
+@pytest.fixture(scope='module')
+def index():
+    return GlossaryIndex(BJJ_GLOSSARY, CATEGORY_GROUPS, GUARD_EMOJIS)
+
+
+def reference_distance(a, b):
+    # Plain recursive Levenshtein, for short words only
+    if not a or not b:
+        return len(a) + len(b)
+    return min(reference_distance(a[1:], b) + 1, reference_distance(a, b[1:]) + 1,
+               reference_distance(a[1:], b[1:]) + (a[0] != b[0]))
+
+
+def test_edit_distance():
+    assert _edit_distance('kimura', 'kimora') == 1
+    assert _edit_distance('omoplata', 'omaplata') == 1
+    assert _edit_distance('ab', 'ba') == 2
+    assert _edit_distance('', 'abc') == 3
+    for a, b in itertools.product(['', 'a', 'ab', 'abc', 'bca', 'cab', 'abcd'], repeat=2):
+        assert _edit_distance(a, b) == reference_distance(a, b)
+
+
+def test_bk_search_matches_brute_force():
+    rng = random.Random(0)
+    words = {''.join(rng.choice('abcde') for _ in range(rng.randint(3, 8))) for _ in range(400)}
+    tree = []
+    for word in words:
+        _bk_insert(tree, word)
+    for _ in range(100):
+        query = ''.join(rng.choice('abcde') for _ in range(rng.randint(3, 8)))
+        distances = [(_edit_distance(query, word), word) for word in words]
+        for limit in (0, 1, 2):
+            expected = sorted((distance, word) for distance, word in distances if distance <= limit)
+            assert sorted(_bk_search(tree, query, limit)) == expected
+
+
+@pytest.mark.parametrize('misspelled, exact', [
+    ('berimboloo', 'berimbolo'),
+    ('kimora', 'kimura'),
+    ('omaplata', 'omoplata'),
+])
+def test_misspellings_are_only_caught_by_the_fuzzy_tier(index, misspelled, exact):
+    assert index.match_terms(misspelled) == []
+    assert index.match_terms(misspelled, fuzzy=1) == index.match_terms(exact)
+
+
+def test_short_words_and_other_first_letters_are_not_looked_up(index):
+    assert len('kimra') < FUZZY_MIN_WORD
+    assert index.match_terms('kimra', fuzzy=2) == []
+    assert index.match_terms('xberimbolo', fuzzy=2) == []
+
+
+def test_two_edits_only_for_long_words(index):
+    # 'hammerlokc' has 10 letters: its two edits need fuzzy=2, 6-letter words never allow more than one
+    assert index.match_terms('hammerlokc', fuzzy=1) == []
+    assert index.match_terms('hammerlokc', fuzzy=2) == index.match_terms('hammerlock')
+    assert index.match_terms('kmiora', fuzzy=2) == []
+
+
+def test_words_of_exact_occurrences_are_not_looked_up(index):
+    text = 'omoplata from closed guard'
+    assert index.match_terms(text, fuzzy=2) == index.match_terms(text)
@@ -0,0 +1,176 @@
+"""Incremental scraping and dataset merging against a fake YouTube service"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('googleapiclient')
+
+import youtube_scraper
+from googleapiclient.errors import HttpError
+from youtube_scraper import ChannelCache, RateLimiter, ScrapeState, merge_videos, scrape_channels, video_id_of
+
+
+CHANNEL = 'UCfakechannel0000000000'
+TITLE = 'Fake BJJ'
+
+
+class FakeRequest:
+    def __init__(self, respond):
+        self.respond = respond
+
+    def execute(self):
+        return self.respond()
+
+
+class FakeYouTube:
+    """Uploads playlist of `uploads` (newest first), `page_size` IDs per page"""
+
+    def __init__(self, uploads, page_size=2, fail_at_page=None, private=()):
+        self.uploads = list(uploads)
+        self.page_size = page_size
+        self.fail_at_page = fail_at_page
+        self.private = set(private)
+        self.pages_listed = 0
+        self.fetched_ids = []
+
+    def channels(self):
+        return SimpleNamespace(list=lambda **kwargs: FakeRequest(lambda: {
+            'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + kwargs['id'][2:]}}}]
+        }))
+
+    def playlistItems(self):
+        return SimpleNamespace(list=self._list_page)
+
+    def videos(self):
+        return SimpleNamespace(list=self._list_videos)
+
+    def _list_page(self, pageToken=None, **kwargs):
+        def respond():
+            page = int(pageToken or 0)
+            if page == self.fail_at_page:
+                raise HttpError(SimpleNamespace(status=403, reason='quotaExceeded'), b'quota exceeded')
+            self.pages_listed += 1
+            start = page * self.page_size
+            ids = self.uploads[start:start + self.page_size]
+            response = {'items': [{'snippet': {'resourceId': {'videoId': video_id}}} for video_id in ids]}
+            if start + self.page_size < len(self.uploads):
+                response['nextPageToken'] = str(page + 1)
+            return response
+        return FakeRequest(respond)
+
+    def _list_videos(self, id, **kwargs):
+        def respond():
+            ids = [video_id for video_id in id.split(',') if video_id not in self.private]
+            self.fetched_ids.extend(ids)
+            return {'items': [{
+                'id': video_id,
+                'snippet': {
+                    'title': f"Technique {video_id}",
+                    'description': '',
+                    'channelTitle': TITLE,
+                    'publishedAt': '2024-01-01T00:00:00Z',
+                    'thumbnails': {'high': {'url': ''}}
+                },
+                'contentDetails': {'duration': 'PT5M'},
+                'statistics': {'viewCount': '10'}
+            } for video_id in ids]}
+        return FakeRequest(respond)
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """Scraper with its caches in tmp_path, no rate limit, and a settable fake service"""
+    monkeypatch.setattr(youtube_scraper, '_channel_cache', ChannelCache(str(tmp_path / 'channel_cache.json')))
+    monkeypatch.setattr(youtube_scraper, '_scrape_state', ScrapeState(str(tmp_path / 'scrape_state.json')))
+    monkeypatch.setattr(youtube_scraper, '_rate_limiter', RateLimiter(1e6))
+    service = SimpleNamespace(youtube=None)
+    monkeypatch.setattr(youtube_scraper, 'get_thread_service', lambda: service.youtube)
+
+    def run(youtube, existing, skip_ids=()):
+        # One scrape + merge, like the incremental branch of main()
+        service.youtube = youtube
+        known_ids = {video_id_of(video) for video in existing}
+        new_videos = scrape_channels([CHANNEL], skip_ids=skip_ids, known_ids=known_ids, workers=1)
+        return merge_videos([youtube_scraper.simplify_video(video) for video in new_videos], existing, [CHANNEL])
+    return run
+
+
+def ids(videos):
+    return [video_id_of(video) for video in videos]
+
+
+def record(video_id, channel_name=TITLE):
+    return {'channel_name': channel_name, 'title': video_id,
+            'youtube_link': f"https://www.youtube.com/watch?v={video_id}"}
+
+
+def force_full_refresh():
+    youtube_scraper.get_scrape_state().channels[youtube_scraper.channel_key(CHANNEL)]['full_at'] = 0
+
+
+def test_merge_videos_puts_new_records_first_and_replaces_existing(scraper):
+    existing = [record('a'), record('b')]
+    merged = merge_videos([record('c'), dict(record('a'), title='updated')], existing, [CHANNEL])
+    assert ids(merged) == ['c', 'a', 'b']
+    assert merged[1]['title'] == 'updated'
+
+
+def test_merge_videos_drops_channels_no_longer_listed(scraper):
+    state = youtube_scraper.get_scrape_state()
+    state.record('@gone', [record('x', 'Gone Channel')], full=False)
+    state.record(CHANNEL, [record('a')], full=False)
+    merged = merge_videos([], [record('a'), record('x', 'Gone Channel')], [CHANNEL])
+    assert ids(merged) == ['a']
+
+
+def test_first_run_walks_the_whole_playlist(scraper):
+    youtube = FakeYouTube(['e', 'd', 'c', 'b', 'a'])
+    assert ids(scraper(youtube, [])) == ['e', 'd', 'c', 'b', 'a']
+    assert youtube_scraper.get_scrape_state().needs_full_scrape(CHANNEL) is False
+
+
+def test_incremental_run_stops_at_the_first_known_upload(scraper):
+    dataset = scraper(FakeYouTube(['c', 'b', 'a']), [])
+
+    youtube = FakeYouTube(['f', 'e', 'd', 'c', 'b', 'a'])
+    dataset = scraper(youtube, dataset)
+    assert ids(dataset) == ['f', 'e', 'd', 'c', 'b', 'a']
+    assert youtube.fetched_ids == ['f', 'e', 'd']
+    assert youtube.pages_listed == 2
+
+
+def test_complete_full_walk_drops_deleted_and_private_uploads(scraper):
+    dataset = scraper(FakeYouTube(['d', 'c', 'b', 'a']), [])
+
+    # 'c' was deleted and 'a' went private since the last full walk
+    force_full_refresh()
+    dataset = scraper(FakeYouTube(['e', 'd', 'b', 'a'], private={'a'}), dataset)
+    assert ids(dataset) == ['e', 'd', 'b']
+
+
+def test_interrupted_full_walk_keeps_records_and_is_not_a_full_refresh(scraper):
+    dataset = scraper(FakeYouTube(['d', 'c', 'b', 'a']), [])
+
+    force_full_refresh()
+    dataset = scraper(FakeYouTube(['e', 'd', 'b', 'a'], fail_at_page=1), dataset)
+    # The walk failed before reaching 'c': nothing is dropped, the next run walks in full again
+    assert ids(dataset) == ['e', 'd', 'c', 'b', 'a']
+    assert youtube_scraper.get_scrape_state().needs_full_scrape(CHANNEL) is True
+
+
+def test_walk_cut_by_max_results_is_incomplete(scraper):
+    youtube = FakeYouTube(['d', 'c', 'b', 'a'])
+    videos, complete = youtube_scraper.get_channel_videos(youtube, CHANNEL, max_results=2)
+    assert ids(videos) == ['d', 'c'] and complete is False
+
+    videos, complete = youtube_scraper.get_channel_videos(youtube, CHANNEL, max_results=10)
+    assert ids(videos) == ['d', 'c', 'b', 'a'] and complete is True
+
+
+def test_skipped_ids_count_as_present(scraper):
+    dataset = scraper(FakeYouTube(['c', 'b', 'a']), [])
+
+    # 'b' is skipped (e.g. already in the fight dataset) but still exists on the channel
+    force_full_refresh()
+    assert ids(scraper(FakeYouTube(['c', 'b', 'a']), dataset, skip_ids={'b'})) == ['c', 'a', 'b']
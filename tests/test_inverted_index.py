@@ -0,0 +1,57 @@
+"""Posting-list encoding and the inverted index artifact"""
+
+import json
+
+from inverted_index import InvertedIndexBuilder, decode_postings, encode_postings, intersect_postings
+
+
+VIDEOS = [
+    {'channel_name': 'Lachlan Giles', 'classification': {'guard_type': ['🦋 Butterfly Guard'], 'sweep': ['Hook Sweep']}},
+    {'channel_name': ' lachlan giles ', 'classification': {'guard_type': ['🦋 Butterfly Guard']}},
+    {'channel_name': 'BJJ Fanatics', 'classification': {}},
+    {'channel_name': None, 'classification': {'sweep': ['Hook Sweep', 'hook sweep']}},
+]
+
+
+def test_postings_round_trip():
+    positions = [0, 3, 4, 10, 250]
+    assert encode_postings(positions) == [0, 3, 1, 6, 240]
+    assert decode_postings(encode_postings(positions)) == positions
+    assert decode_postings([]) == []
+
+
+def test_intersect_postings():
+    assert intersect_postings([1, 3, 5, 7], [3, 4, 5], [0, 3, 5, 9]) == [3, 5]
+    assert intersect_postings([1, 2], []) == []
+    assert intersect_postings() == []
+
+
+def test_builder_indexes_terms_categories_and_channels():
+    builder = InvertedIndexBuilder()
+    builder.add_all(VIDEOS)
+    index = builder.to_dict('processed.json')
+
+    assert index['count'] == 4 and index['source'] == 'processed.json'
+    assert decode_postings(index['terms']['guard_type']['🦋 butterfly guard']) == [0, 1]
+    # A label listed twice (in any case) is posted once per video
+    assert decode_postings(index['terms']['sweep']['hook sweep']) == [0, 3]
+    assert decode_postings(index['categories']['sweep']) == [0, 3]
+    assert 'pass' not in index['categories']
+
+
+def test_channel_keys_are_trimmed_and_lowercased():
+    builder = InvertedIndexBuilder()
+    builder.add_all(VIDEOS)
+    channels = builder.to_dict()['channels']
+    assert {key: decode_postings(postings) for key, postings in channels.items()} == {
+        'lachlan giles': [0, 1],
+        'bjj fanatics': [2]
+    }
+
+
+def test_save_writes_the_index(tmp_path):
+    builder = InvertedIndexBuilder()
+    builder.add_all(VIDEOS)
+    path = tmp_path / 'bjj_index.json'
+    builder.save(str(path), source='processed.json', compress=False)
+    assert json.loads(path.read_text(encoding='utf-8')) == builder.to_dict('processed.json')
@@ -0,0 +1,54 @@
+"""Streaming reads of JSON arrays and JSON Lines files"""
+
+import json
+
+import pytest
+
+from classify_bjj_videos import iter_json_records
+
+
+RECORDS = [
+    {'title': 'Armbar from guard', 'tags': ['bjj', 'armbar'], 'view_count': 10},
+    {'title': 'Garde fermée — balayage', 'description': 'line one\nline two', 'tags': []},
+    {'title': 'Brackets ] and braces } in "strings"', 'nested': {'a': [1, 2, {'b': None}]}},
+    {'title': 'x' * 300},
+]
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(name, text):
+        path = tmp_path / name
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize('buffer_size', [1, 7, 64, 1 << 16])
+def test_compact_array(write, buffer_size):
+    path = write('videos.json', json.dumps(RECORDS, ensure_ascii=False))
+    assert list(iter_json_records(path, buffer_size)) == RECORDS
+
+
+@pytest.mark.parametrize('buffer_size', [1, 7, 64, 1 << 16])
+def test_indented_array(write, buffer_size):
+    path = write('videos.json', '\n\n  ' + json.dumps(RECORDS, indent=2) + '\n')
+    assert list(iter_json_records(path, buffer_size)) == RECORDS
+
+
+@pytest.mark.parametrize('buffer_size', [1, 7, 64, 1 << 16])
+def test_json_lines(write, buffer_size):
+    text = '\n'.join(json.dumps(record, ensure_ascii=False) for record in RECORDS)
+    path = write('videos.jsonl', '\n' + text.replace('\n', '\n\n', 1) + '\n')
+    assert list(iter_json_records(path, buffer_size)) == RECORDS
+
+
+@pytest.mark.parametrize('text', ['', '   \n', '[]', ' [ ] '])
+def test_empty_inputs(write, text):
+    assert list(iter_json_records(write('empty.json', text), 4)) == []
+
+
+@pytest.mark.parametrize('text', ['[{"a": 1}', '[{"a": 1} {"b": 2}]', '[{"a": 1},'])
+def test_malformed_array(write, text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(write('broken.json', text), 4))
@@ -0,0 +1,120 @@
+"""The Aho-Corasick scan and the priority resolution against the per-keyword \\b regexes they replaced"""
+
+import random
+import re
+
+import pytest
+
+from classify_bjj_videos import BJJ_GLOSSARY, CATEGORY_GROUPS, GUARD_EMOJIS, GlossaryIndex, KeywordAutomaton
+from text_normalize import normalize_text
+
+
+FILLER = ["how", "to", "the", "vs", "bjj", "nogi", "guardian", "passing", "armbarr", "x", "é", "2024"]
+GLUE = [" ", " ", " ", "", "-", "_", "/", ".", "é", "x", "(", ") "]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return GlossaryIndex(BJJ_GLOSSARY, CATEGORY_GROUPS, GUARD_EMOJIS)
+
+
+@pytest.fixture(scope='module')
+def patterns(index):
+    return word_patterns(index.automaton.keywords)
+
+
+def word_patterns(keywords):
+    # Pattern id -> the \b regex of its keyword (more than re's internal cache holds)
+    return [re.compile(r'\b' + re.escape(keyword) + r'\b') for keyword in keywords]
+
+
+def regex_spans(patterns, text):
+    spans = {}
+    for pattern_id, pattern in enumerate(patterns):
+        found = [m.span() for m in pattern.finditer(text)]
+        if found:
+            spans[pattern_id] = found
+    return spans
+
+
+def random_texts(keywords, count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            word = rng.choice(keywords) if rng.random() < 0.6 else rng.choice(FILLER)
+            if rng.random() < 0.15:
+                # Cut keywords so that prefixes and suffixes of them show up too
+                cut = rng.randint(1, len(word))
+                word = word[:cut] if rng.random() < 0.5 else word[cut - 1:]
+            parts.append(word)
+            parts.append(rng.choice(GLUE))
+        yield ''.join(parts)
+
+
+@pytest.mark.parametrize('text', [
+    "x guard x guard x",
+    "half guardhalf guard",
+    "50/50 guard from 50/50",
+    "arm-bar vs armbar vs arm bar",
+    "de la riva, reverse de la riva and dlr",
+    "single leg x or single leg",
+    "",
+])
+def test_find_all_matches_word_boundary_regex_on_edge_cases(index, patterns, text):
+    assert index.automaton.find_all(text) == regex_spans(patterns, text)
+
+
+def test_find_all_matches_word_boundary_regex_on_glossary(index, patterns):
+    for text in random_texts(index.automaton.keywords, 300):
+        assert index.automaton.find_all(text) == regex_spans(patterns, text), text
+
+
+def test_find_all_keeps_occurrences_of_one_keyword_apart():
+    # Like re.finditer, a keyword does not match again inside its previous occurrence
+    automaton = KeywordAutomaton(["x guard x"])
+    assert automaton.find_all("x guard x guard x") == {0: [(0, 9)]}
+
+
+def test_find_all_handles_keywords_with_non_word_edges():
+    keywords = ["x", "x guard", "x guard x", "(dlr)", "-", "- -", "guard x", "a_b"]
+    automaton = KeywordAutomaton(keywords)
+    for text in random_texts(keywords, 500, seed=1):
+        assert automaton.find_all(text) == regex_spans(word_patterns(automaton.keywords), text), text
+
+
+def test_partial_hits_count_occurrences_inside_longer_words():
+    automaton = KeywordAutomaton(["guard"])
+    partial = {}
+    assert automaton.find_all("guardian guard vanguard", partial) == {0: [(9, 14)]}
+    assert partial == {0: 2}
+
+
+def reference_match_terms(index, patterns, text):
+    # The per-term regex loop the automaton replaced: terms in priority order,
+    # each claiming its first occurrence that does not overlap a claimed span
+    matched_terms = []
+    claimed_spans = []
+    for rank, term in enumerate(index.term_priority):
+        for pattern_id in index.term_patterns[rank]:
+            claimed = None
+            for m in patterns[pattern_id].finditer(text):
+                if not any(m.start() < end and m.end() > start for start, end in claimed_spans):
+                    claimed = m.span()
+                    break
+            if claimed:
+                matched_terms.append(term)
+                claimed_spans.append(claimed)
+                break
+    return matched_terms
+
+
+def test_match_terms_matches_per_term_regex_resolution(index, patterns):
+    for text in random_texts(index.automaton.keywords, 200, seed=2):
+        assert index.match_terms(text) == reference_match_terms(index, patterns, text), text
+
+
+def test_match_terms_prefers_more_specific_terms(index, patterns):
+    text = normalize_text("Single Leg X Guard Sweep")
+    assert index.match_terms(text) == reference_match_terms(index, patterns, text)
+    assert index.match_terms(text)
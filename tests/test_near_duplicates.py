@@ -0,0 +1,74 @@
+"""MinHash/LSH near-duplicate clusters"""
+
+from random import Random
+
+import pytest
+
+from near_duplicates import _permutations, _signatures_python, build_near_duplicates, find_clusters, shingles
+
+
+VOCABULARY = [f"word{i}" for i in range(500)]
+
+
+def random_video(rng, words=40):
+    return {'title': ' '.join(rng.choice(VOCABULARY) for _ in range(8)),
+            'description': ' '.join(rng.choice(VOCABULARY) for _ in range(words))}
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    """60 unrelated videos, then a light edit of videos 3 and 10 and a second copy of video 3"""
+    rng = Random(0)
+    videos = [random_video(rng) for _ in range(60)]
+    videos.append(dict(videos[3], title=videos[3]['title'] + ' #shorts'))
+    videos.append(dict(videos[10], description=videos[10]['description'] + ' https://example.com/link'))
+    videos.append(dict(videos[3]))
+    return videos
+
+
+def test_shingles_ignore_urls_case_and_accents():
+    video = {'title': 'Passagem de Guarda', 'description': 'https://example.com/x'}
+    assert shingles(video) == shingles({'title': 'passagem de guarda'})
+    assert len(shingles({'title': 'a b c d'})) == 2
+    assert len(shingles({'title': 'hi'})) == 1
+    assert shingles({}) == []
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = Random(1)
+    base = rng.sample(range(1 << 32), 200)
+    other = base[:150] + rng.sample(range(1 << 32), 50)
+    jaccard = 150 / 250
+    first, second = _signatures_python([base, other], _permutations(256, seed=1))
+    assert abs(sum(x == y for x, y in zip(first, second)) / 256 - jaccard) < 0.1
+
+
+def test_reuploads_cluster_and_unrelated_videos_do_not(corpus):
+    assert find_clusters(corpus, backend='python') == [[3, 60, 62], [10, 61]]
+
+
+def test_threshold_controls_how_close_videos_must_be(corpus):
+    # The link added to video 10's copy is not part of its shingles
+    assert find_clusters(corpus, threshold=1.0, backend='python') == [[3, 62], [10, 61]]
+
+
+def test_boilerplate_shared_by_many_videos_is_not_evidence():
+    boilerplate = 'subscribe to my channel and follow me on instagram for more bjj'
+    videos = [{'title': f"technique{i}", 'description': boilerplate} for i in range(30)]
+    assert find_clusters(videos, max_df=10, backend='python') == []
+    assert find_clusters(videos, max_df=0, backend='python') != []
+
+
+def test_numpy_backend_gives_the_same_clusters(corpus):
+    pytest.importorskip('numpy')
+    assert find_clusters(corpus, backend='numpy') == find_clusters(corpus, backend='python')
+
+
+def test_bands_must_divide_the_permutations(corpus):
+    with pytest.raises(ValueError):
+        find_clusters(corpus, num_perm=100, bands=16)
+
+
+def test_artifact_counts_hidden_duplicates(corpus):
+    artifact = build_near_duplicates(corpus, source='videos.json', backend='python')
+    assert (artifact['count'], artifact['duplicates'], artifact['source']) == (63, 3, 'videos.json')
@@ -0,0 +1,103 @@
+"""Full-text search index: prefix search, exact short tokens and autocomplete"""
+
+import re
+from random import Random
+
+from inverted_index import decode_postings
+from search_index import (
+    COMPLETION_PREFIX_LENGTH,
+    MIN_PREFIX_LENGTH,
+    SearchIndexBuilder,
+    complete,
+    prefix_range,
+    search
+)
+from text_normalize import normalize_text
+
+
+VIDEOS = [
+    {'title': 'Passagem de guarda: toreando', 'channel_name': 'Mendes Bros', 'tags': ['passing']},
+    {'title': 'Guard passing concepts', 'channel_name': 'Lachlan Giles', 'tags': ['bjj', 'Guard']},
+    {'title': 'Garde fermée: balayage', 'channel_name': 'JJB France', 'tags': []},
+    {'title': 'Gi guard retention', 'channel_name': 'Mendes Bros', 'tags': None},
+]
+
+
+def build(videos, fights=()):
+    builder = SearchIndexBuilder(normalize_text)
+    builder.add_all(videos)
+    if fights:
+        builder.mark_fights(len(videos))
+        for position, video in enumerate(fights, len(videos)):
+            builder.add(position, video)
+    return builder.to_dict('videos.json')
+
+
+def test_terms_are_sorted_normalized_and_posted_once():
+    index = build(VIDEOS)
+    assert index['terms'] == sorted(index['terms'])
+    assert 'fermee' in index['terms'] and 'fermée' not in index['terms']
+    # 'guard' is in both the title and the tags of video 1
+    assert decode_postings(index['postings'][index['terms'].index('guard')]) == [1, 3]
+    assert index['counts'][index['terms'].index('guard')] == 2
+    assert (index['count'], index['fight_start']) == (4, 4)
+
+
+def test_fight_positions_follow_the_technique_videos():
+    index = build(VIDEOS, fights=[{'title': 'Gordon Ryan vs Felipe Pena'}])
+    assert (index['count'], index['fight_start']) == (5, 4)
+    assert search(index, 'ryan', normalize_text) == [4]
+
+
+def test_prefix_range():
+    terms = ['garde', 'gi', 'guard', 'guarda', 'passing']
+    assert list(prefix_range(terms, 'gua')) == [2, 3]
+    assert list(prefix_range(terms, 'g')) == [0, 1, 2, 3]
+    assert list(prefix_range(terms, 'z')) == []
+
+
+def test_search_long_tokens_are_prefixes_short_ones_exact():
+    index = build(VIDEOS)
+    assert search(index, 'pass', normalize_text) == [0, 1]            # passagem, passing
+    assert search(index, 'GUARD pass', normalize_text) == [0, 1]      # guarda, guard
+    assert search(index, 'Fermée', normalize_text) == [2]
+    assert search(index, 'gi', normalize_text) == [3]                 # not 'giles'
+    assert search(index, 'de', normalize_text) == [0]                 # not 'de'-prefixed words
+    assert search(index, 'guard nothing', normalize_text) == []
+    assert search(index, '!!', normalize_text) == []
+
+
+def test_search_matches_a_scan_of_every_video():
+    rng = Random(0)
+    words = ['guard', 'guarda', 'gi', 'giles', 'pass', 'passing', 'sweep', 'de', 'la', 'riva', 'x']
+    videos = [{'title': ' '.join(rng.choice(words) for _ in range(rng.randint(1, 5))),
+               'tags': [rng.choice(words)]} for _ in range(200)]
+    index = build(videos)
+
+    def matches(video, token):
+        video_words = re.findall(r"\w+", normalize_text(' '.join([video['title'], *video['tags']])))
+        return any(word == token if len(token) < MIN_PREFIX_LENGTH else word.startswith(token)
+                   for word in video_words)
+
+    for query in ['gi', 'gua', 'guard', 'pass de', 'riva x', 'giles sweep', 'la', 'swe']:
+        tokens = query.split()
+        expected = [i for i, video in enumerate(videos) if all(matches(video, token) for token in tokens)]
+        assert search(index, query, normalize_text) == expected, query
+
+
+def test_completions_rank_terms_by_frequency():
+    videos = [{'title': 'guard'}] * 3 + [{'title': 'guarda'}] * 2 + [{'title': 'gi garde'}]
+    index = build(videos)
+    assert complete(index, 'gu') == ['guard', 'guarda']
+    assert complete(index, 'g', limit=2) == ['guard', 'guarda']
+    assert complete(index, 'guarda') == ['guarda']
+    assert complete(index, 'xyz') == []
+
+
+def test_precomputed_completions_match_the_prefix_scan():
+    index = build(VIDEOS * 2 + [{'title': 'guard guard guarding gable grip'}])
+    precomputed = index['completions']
+    assert all(len(prefix) <= COMPLETION_PREFIX_LENGTH for prefix in precomputed)
+    without = dict(index, completions={})
+    for prefix in precomputed:
+        assert complete(index, prefix) == complete(without, prefix), prefix
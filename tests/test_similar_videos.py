@@ -0,0 +1,79 @@
+"""TF-IDF "more like this" neighbours"""
+
+import math
+from random import Random
+
+import pytest
+
+from similar_videos import SCORE_DIGITS, find_similar, save_similar_videos, tfidf_vectors, video_features
+from text_normalize import normalize_text
+
+
+WORDS = ['guard', 'pass', 'sweep', 'berimbolo', 'kimura', 'toreando', 'knee', 'cut', 'leg', 'drag', 'x', 'retention']
+LABELS = [('guard_type', 'De La Riva'), ('pass', 'Knee Cut'), ('sweep', 'Hook Sweep'), ('submission', 'Kimura')]
+
+
+@pytest.fixture(scope='module')
+def videos():
+    rng = Random(0)
+    corpus = []
+    for _ in range(150):
+        classification = {}
+        for category, label in rng.sample(LABELS, rng.randint(0, 2)):
+            classification.setdefault(category, []).append(label)
+        corpus.append({'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))),
+                       'tags': rng.sample(WORDS, rng.randint(0, 3)),
+                       'classification': classification})
+    return corpus
+
+
+def brute_force(videos, k):
+    # Cosine of every pair, best first, ties by position
+    _, vectors, _ = tfidf_vectors(videos, normalize_text)
+    dense = [dict(vector) for vector in vectors]
+    neighbours = []
+    for i, vector in enumerate(dense):
+        scores = [(-round(sum(w * dense[j].get(f, 0.0) for f, w in vector.items()), SCORE_DIGITS), j)
+                  for j in range(len(dense)) if j != i]
+        neighbours.append([j for score, j in sorted(scores) if score < 0][:k])
+    return neighbours
+
+
+def test_video_features():
+    video = {'title': 'Guard guard pass', 'tags': ['Leg Drag', '!!'],
+             'classification': {'pass': ['Leg Drag'], 'guard_type': []}}
+    assert video_features(video, normalize_text) == {
+        'title:guard': 2, 'title:pass': 1, 'tag:leg drag': 1, 'term:pass:Leg Drag': 1}
+
+
+def test_vectors_have_unit_length(videos):
+    _, vectors, df = tfidf_vectors(videos, normalize_text)
+    for vector in vectors:
+        if vector:
+            assert math.isclose(math.sqrt(sum(weight * weight for _, weight in vector)), 1.0)
+    assert max(df) <= len(videos)
+
+
+def test_top_k_matches_the_brute_force_cosine(videos):
+    assert find_similar(videos, normalize_text, k=5, max_df=len(videos), backend='python') == brute_force(videos, 5)
+
+
+def test_common_features_do_not_make_candidates():
+    videos = [{'title': 'guard pass'}, {'title': 'guard sweep'}, {'title': 'guard kimura'}, {'title': 'kimura'}]
+    # 'guard' is in 3 videos: with max_df=2 only the shared 'kimura' links two videos
+    assert find_similar(videos, normalize_text, k=3, max_df=2, backend='python') == [[], [], [3], [2]]
+    assert sorted(find_similar(videos, normalize_text, k=3, max_df=3, backend='python')[0]) == [1, 2]
+
+
+def test_scipy_backend_gives_the_same_neighbours(videos):
+    pytest.importorskip('scipy')
+    for max_df in (20, len(videos)):
+        assert find_similar(videos, normalize_text, k=5, max_df=max_df, backend='scipy') == \
+            find_similar(videos, normalize_text, k=5, max_df=max_df, backend='python')
+
+
+def test_artifact(tmp_path, videos):
+    artifact = save_similar_videos(videos, normalize_text, str(tmp_path / 'similar.json'), source='videos.json',
+                                   compress=False, k=3, backend='python')
+    assert (artifact['count'], artifact['k']) == (150, 3)
+    assert all(len(neighbours) <= 3 and i not in neighbours for i, neighbours in enumerate(artifact['neighbours']))
@@ -0,0 +1,80 @@
+"""Per-category/channel shards, sorted pages and the manifest the web app loads lazily"""
+
+import json
+import os
+
+from video_shards import SHARD_FIELDS, shard_slug, write_shards
+
+
+def video(title, views, channel='Lachlan Giles', published_at=None, **classification):
+    record = {'title': title, 'view_count': views, 'channel_name': channel, 'description': 'long text',
+              'classification': classification}
+    if published_at:
+        record['published_at'] = published_at
+    return record
+
+
+VIDEOS = [
+    video('Hook sweep', '300', published_at='2024-03-01', sweep=['Hook Sweep'], guard_type=['Butterfly Guard']),
+    video('Knee cut', '1000', channel='BJJ Fanatics ', published_at='2024-01-01', **{'pass': ['Knee Cut']}),
+    video('Butterfly basics', 'n/a', channel=' bjj fanatics', guard_type=['Butterfly Guard']),
+    video('Heel hook', '500', channel='FloGrappling', published_at='2024-02-01', submission=['Heel Hook']),
+]
+
+
+def load(shards_dir, relative):
+    with open(os.path.join(shards_dir, relative), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def titles(shards_dir, relative):
+    return [card['title'] for card in load(shards_dir, relative)]
+
+
+def test_shard_slug_is_readable_and_collision_free():
+    assert shard_slug('Lachlan Giles').startswith('lachlan-giles-')
+    assert shard_slug('a/b') != shard_slug('a b')
+    assert len(shard_slug('柔術')) == 8
+
+
+def test_pages_are_sorted_by_views_and_by_date(tmp_path):
+    manifest = write_shards(VIDEOS, str(tmp_path), page_size=3, compress=False)
+    assert manifest['total'] == 4
+    assert manifest['pages']['views'] == ['views/page-0001.json', 'views/page-0002.json']
+    assert titles(tmp_path, 'views/page-0001.json') == ['Knee cut', 'Heel hook', 'Hook sweep']
+    assert titles(tmp_path, 'views/page-0002.json') == ['Butterfly basics']
+    # Newest first, undated last
+    assert [title for page in manifest['pages']['date'] for title in titles(tmp_path, page)] == [
+        'Hook sweep', 'Heel hook', 'Knee cut', 'Butterfly basics']
+
+
+def test_category_and_channel_shards(tmp_path):
+    manifest = write_shards(VIDEOS, str(tmp_path), compress=False)
+    guard = manifest['categories']['guard_type']
+    assert guard['count'] == 2
+    assert titles(tmp_path, guard['file']) == ['Hook sweep', 'Butterfly basics']
+
+    # Keyed like the app's channel filter values: spellings of a channel share one shard
+    fanatics = manifest['channels']['bjj fanatics']
+    assert fanatics['name'] == 'BJJ Fanatics' and fanatics['count'] == 2
+    assert titles(tmp_path, fanatics['file']) == ['Knee cut', 'Butterfly basics']
+    # Most videos first, then by the views of their top video
+    assert list(manifest['channels']) == ['bjj fanatics', 'flograppling', 'lachlan giles']
+
+
+def test_manifest_counts_labels_and_cards_keep_only_card_fields(tmp_path):
+    manifest = write_shards(VIDEOS, str(tmp_path), compress=False)
+    assert manifest['labels']['guard_type'] == {'Butterfly Guard': 2}
+    assert load(tmp_path, 'manifest.json') == manifest
+    card = load(tmp_path, 'views/page-0001.json')[0]
+    assert 'description' not in card and set(card) <= set(SHARD_FIELDS)
+
+
+def test_stale_shards_are_removed(tmp_path):
+    write_shards(VIDEOS, str(tmp_path), page_size=1, compress=False)
+    stale = os.path.join(tmp_path, 'channel', shard_slug('flograppling') + '.json')
+    assert os.path.exists(stale)
+
+    write_shards(VIDEOS[:2], str(tmp_path), page_size=1, compress=False)
+    assert not os.path.exists(stale)
+    assert sorted(os.listdir(os.path.join(tmp_path, 'views'))) == ['page-0001.json', 'page-0002.json']
@@ -0,0 +1,22 @@
+"""
+Text normalization shared by the classifier, the indexes and the scraper
+Kept free of other imports, so modules that only compare text do not load the
+classifier and its glossary
+"""
+
+import unicodedata
+
+
+def fold_accents(text: str) -> str:
+    """Strip diacritics so "garde fermée" and "garde fermee" compare equal"""
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return unicodedata.normalize('NFC', ''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for comparison: lowercase, accent-folded and stripped"""
+    if not text:
+        return ""
+    return fold_accents(text.lower().strip())
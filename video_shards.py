@@ -0,0 +1,155 @@
+"""
+Sharded, pre-sorted artifacts for lazy loading in the web app
+Splits the classified videos (technique videos, then fights, like the app's
+combined list) into per-category and per-channel shards and into pages sorted
+by views and by publish date, sized to the number of cards the app renders,
+plus a small manifest that points at all of them
+The manifest also carries the label and channel counts of the filter menus, so
+the app can paint, fill its menus and answer a channel or category filter
+without downloading the full catalogue
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, List
+
+from json_artifacts import COMPRESSED_SUFFIXES, save_json
+
+
+SHARDS_DIR = 'shards'
+
+# Matches DEFAULT_MAX_CARDS for desktop in app.js (mobile shows the first 50 of a page)
+DEFAULT_PAGE_SIZE = 200
+
+# Fields a video card needs; descriptions and tags stay in the full dataset
+SHARD_FIELDS = [
+    'title', 'youtube_link', 'channel_name', 'view_count', 'language', 'published_at', 'classification', 'athletes'
+]
+
+MANIFEST_FORMAT = 3
+
+SHARD_SUBDIRS = ('category', 'channel', 'views', 'date')
+
+
+def shard_slug(name: str) -> str:
+    """File-system friendly, collision-free name for a channel or category"""
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')[:40]
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}" if slug else digest
+
+
+def channel_key(name: str) -> str:
+    """Channel key of the manifest: trimmed and lowercased, like the app's channel filter values"""
+    return (name or '').strip().lower()
+
+
+def _views(video: dict) -> int:
+    try:
+        return int(video.get('view_count') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _card(video: dict) -> dict:
+    return {field: video[field] for field in SHARD_FIELDS if field in video}
+
+
+def _write_json(path: str, data, compress: bool = True) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    save_json(data, path, compress=compress)
+
+
+def _write_pages(videos: List[dict], shards_dir: str, name: str, page_size: int,
+                 compress: bool = True) -> List[str]:
+    files = []
+    for start in range(0, len(videos), page_size):
+        relative = f"{name}/page-{start // page_size + 1:04d}.json"
+        _write_json(os.path.join(shards_dir, relative), [_card(video) for video in videos[start:start + page_size]],
+                    compress)
+        files.append(relative)
+    return files
+
+
+def _by_count(counts: Dict[str, int]) -> Dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def write_shards(videos: List[dict], shards_dir: str = SHARDS_DIR,
+                 page_size: int = DEFAULT_PAGE_SIZE, source: str = '', compress: bool = True) -> Dict:
+    """
+    Write category/channel shards and views/date pages, then the manifest
+    Shards are sorted by view count (highest first), like the app's default order
+    Each file gets .gz/.br siblings unless compress=False
+    Returns the manifest
+    """
+    by_views = sorted(videos, key=_views, reverse=True)
+
+    categories = {}
+    channels = {}
+    channel_names = {}
+    labels = {}
+    for video in by_views:
+        for category, category_labels in (video.get('classification') or {}).items():
+            if not category_labels:
+                continue
+            categories.setdefault(category, []).append(video)
+            counts = labels.setdefault(category, {})
+            for label in category_labels:
+                label = label.strip()
+                if label:
+                    counts[label] = counts.get(label, 0) + 1
+        key = channel_key(video.get('channel_name'))
+        if key:
+            channels.setdefault(key, []).append(video)
+            # Shown under the spelling of its most viewed video
+            channel_names.setdefault(key, video['channel_name'].strip())
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'source': source,
+        'total': len(videos),
+        'page_size': page_size,
+        'labels': {category: _by_count(counts) for category, counts in labels.items()},
+        'categories': {},
+        'channels': {},
+        'pages': {}
+    }
+    written = set()
+
+    for category, shard in categories.items():
+        relative = f"category/{shard_slug(category)}.json"
+        _write_json(os.path.join(shards_dir, relative), [_card(video) for video in shard], compress)
+        manifest['categories'][category] = {'file': relative, 'count': len(shard)}
+        written.add(relative)
+
+    for key, shard in sorted(channels.items(), key=lambda item: -len(item[1])):
+        relative = f"channel/{shard_slug(key)}.json"
+        _write_json(os.path.join(shards_dir, relative), [_card(video) for video in shard], compress)
+        manifest['channels'][key] = {'name': channel_names[key], 'file': relative, 'count': len(shard)}
+        written.add(relative)
+
+    # Newest first; videos without a publish date go last
+    by_date = sorted(by_views, key=lambda video: video.get('published_at') or '', reverse=True)
+    for name, ordered in (('views', by_views), ('date', by_date)):
+        pages = _write_pages(ordered, shards_dir, name, page_size, compress)
+        manifest['pages'][name] = pages
+        written.update(pages)
+
+    # Remove shards (and their compressed siblings) of channels or pages that no longer exist
+    for subdir in SHARD_SUBDIRS:
+        directory = os.path.join(shards_dir, subdir)
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            shard = filename
+            for suffix in COMPRESSED_SUFFIXES:
+                if shard.endswith(suffix):
+                    shard = shard[:-len(suffix)]
+            if shard.endswith('.json') and f"{subdir}/{shard}" not in written:
+                os.remove(os.path.join(directory, filename))
+
+    _write_json(os.path.join(shards_dir, 'manifest.json'), manifest, compress)
+    print(f"Shards saved to {shards_dir}/ ({len(categories)} categories, {len(channels)} channels, "
+          f"{len(manifest['pages']['views'])} pages of {page_size})")
+    return manifest
@@ -4,18 +4,38 @@ Requires: google-api-python-client
 Install with: pip install google-api-python-client
 """
 
-import json
 import sys
 import re
+import json
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import os
 import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from athlete_extractor import build_extractor
+from athlete_index import ATHLETE_INDEX_FILE, save_athlete_index
+from json_artifacts import atomic_open, save_json
 
 # Read API key from environment variable (for CI/CD) or use hardcoded value (for local dev)
 API_KEY = os.environ.get('YOUTUBE_API_KEY')
 
+# Channels scraped concurrently, and the API request rate shared by all of them
+SCRAPE_WORKERS = int(os.environ.get('SCRAPE_WORKERS', 8))
+MAX_REQUESTS_PER_SECOND = float(os.environ.get('YOUTUBE_MAX_QPS', 10))
+
+# Handle -> channel ID and channel ID -> uploads playlist resolutions, reused across runs
+CHANNEL_CACHE_FILE = os.path.join('.bjj_cache', 'channel_cache.json')
+CHANNEL_CACHE_TTL_DAYS = float(os.environ.get('CHANNEL_CACHE_TTL_DAYS', 30))
+
+# Incremental runs only fetch uploads newer than the existing dataset; each
+# channel is still walked fully every FULL_REFRESH_DAYS to refresh view counts
+INCREMENTAL = os.environ.get('SCRAPE_MODE', 'incremental') != 'full'
+SCRAPE_STATE_FILE = os.path.join('.bjj_cache', 'scrape_state.json')
+FULL_REFRESH_DAYS = float(os.environ.get('FULL_REFRESH_DAYS', 7))
+
 # List of BJJ channels to scrape
 BJJ_CHANNELS = ["@JonThomasBJJ",
     "@TarikBJJ"
@@ -23,7 +43,7 @@ BJJ_CHANNELS = ["@JonThomasBJJ",
     "@InvisibleJiuJitsu", "@kurtosiander", "@Chewjitsu", "@BJJFanatics", "@BJJScout", "@LEONLARMAN", "@DubiousDom", "@Heather_MorganBJJ",
     "@GracieBreakdown", "@BJJLibrary", "@BernardoFariaBJJ", "@MMALeech", "@ZombieProofBJJ", #
     "@Wardziak", "@EnergiaMartialArts", "@vincenguyenbjj", "@Grapplers_Guide", "@atosjiujitsuhq", "@bzglick", "@Shigashi84",
-    "@BTeamJiuJitsu", "@BJJGlobetrotters", "@JiuJitsuInMinutesbyJasonScully", "@SticksandStonesBJJ", "@EnergiaMartialArts"
+    "@BTeamJiuJitsu", "@BJJGlobetrotters", "@JiuJitsuInMinutesbyJasonScully", "@SticksandStonesBJJ",
     "@nathanorchard10p", "@ArnaudPiétéUnidade", "@YoshiJiuJitsuTech", "@zukaBJJ", "@yogaforbjj", "@darkhorsemartialarts","@roydean", "@1MinuteJiuJitsu","@samir.bensaid", "@ArtofJiuJitsu", "@mendesbros", "@Submissions101", "@DeepDiveJJ",
 "@BJJTrickster", "@poundforpoundmunich", "@BirdWiltseBjj", "@10thplanetnetwork42", "@brandonmcninja", "@10thPlanetBathNY", "@twistereddie","@Gordonlovesjiujitsu", "@lutaonthemat", "@JiuJitsuFlo" ,  "@TeachMeGrapping"#, "UCBNsOFfO-TZDIpygfz5paa"
 ]
@@ -38,6 +58,68 @@ FIGHT_CHANNELS = [
     # "@UFC"  # optional — replace with whatever fight/match channels you want
 ]
 
+# Channels in both lists (e.g. @ArtofJiuJitsu) are scraped on both days; their
+# matches are kept in the fight dataset only (technique runs skip these IDs)
+FIGHT_DATASET = 'fight_simple.json'
+
+_VIDEO_ID = re.compile(r"[?&]v=([A-Za-z0-9_-]+)")
+
+
+def channel_key(channel_input):
+    """Comparable form of a channel handle, name or ID ('@BTeamJiuJitsu' == 'bteamjiujitsu')"""
+    return str(channel_input).strip().lstrip('@').lower()
+
+
+def dedupe_channels(channel_names):
+    """Drop repeated channels from a list, keeping the first occurrence"""
+    seen = set()
+    unique = []
+    for channel_name in channel_names:
+        key = channel_key(channel_name)
+        if key in seen:
+            print(f"Skipping duplicate channel: {channel_name}")
+            continue
+        seen.add(key)
+        unique.append(channel_name)
+    return unique
+
+
+def video_id_of(video):
+    """YouTube ID of a full or simplified video record (parsed from youtube_link if needed)"""
+    video_id = video.get('video_id')
+    if video_id:
+        return video_id
+    m = _VIDEO_ID.search(video.get('youtube_link') or '')
+    return m.group(1) if m else None
+
+
+def dedupe_videos(videos):
+    """Keep the first record of each video ID (records without an ID are kept)"""
+    seen = set()
+    unique = []
+    for video in videos:
+        video_id = video_id_of(video)
+        if video_id is not None:
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+        unique.append(video)
+    return unique
+
+
+def load_videos(filename):
+    """Records of a previously saved dataset (empty if it doesn't exist)"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+def load_video_ids(filename):
+    """Video IDs stored in a previously saved dataset (empty if it doesn't exist)"""
+    return {video_id for video_id in map(video_id_of, load_videos(filename)) if video_id}
+
 
 def get_youtube_service():
     """Initialize YouTube API service"""
@@ -50,6 +132,201 @@ def get_youtube_service():
         raise
 
 
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_call = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ChannelCache:
+    """
+    On-disk cache of channel resolutions: handle -> channel ID (a 100-unit
+    search().list call) and channel ID -> uploads playlist ID (a channels().list call)
+    Entries older than ttl_days are resolved again; lookups are thread-safe
+    """
+
+    def __init__(self, path=CHANNEL_CACHE_FILE, ttl_days=CHANNEL_CACHE_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.channel_ids = {}   # channel_key(handle) -> [channel ID, resolved at]
+        self.uploads = {}       # channel ID -> [uploads playlist ID, resolved at]
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._dirty = False
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.channel_ids = data.get('channel_ids', {})
+                self.uploads = data.get('uploads', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable channel cache '{path}': {e}")
+
+    def _get(self, table, key):
+        with self.lock:
+            entry = table.get(key)
+            if entry and time.time() - entry[1] < self.ttl:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def _put(self, table, key, value):
+        with self.lock:
+            table[key] = [value, int(time.time())]
+            self._dirty = True
+
+    def get_channel_id(self, channel_input):
+        return self._get(self.channel_ids, channel_key(channel_input))
+
+    def put_channel_id(self, channel_input, channel_id):
+        self._put(self.channel_ids, channel_key(channel_input), channel_id)
+
+    def get_uploads(self, channel_id):
+        return self._get(self.uploads, channel_id)
+
+    def put_uploads(self, channel_id, playlist_id):
+        self._put(self.uploads, channel_id, playlist_id)
+
+    def save(self):
+        """Write the cache atomically if anything was resolved during this run"""
+        if not self.path or not self._dirty:
+            return
+        try:
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with self.lock, atomic_open(self.path, 'w') as f:
+                json.dump({'channel_ids': self.channel_ids, 'uploads': self.uploads}, f, ensure_ascii=False)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: could not write channel cache '{self.path}': {e}")
+
+
+class ScrapeState:
+    """
+    Per-channel state of incremental scraping: the channel's title (the
+    channel_name of its records) and when its uploads were last walked in full
+    The IDs found by this run's complete walks are kept in memory (refreshed),
+    so merge_videos can drop the records of deleted or private uploads
+    """
+
+    def __init__(self, path=SCRAPE_STATE_FILE):
+        self.path = path
+        self.channels = {}      # channel_key(handle) -> {'title': ..., 'full_at': ...}
+        self.refreshed = {}     # title -> IDs of the uploads found by a complete walk in this run
+        self.lock = threading.Lock()
+        self._dirty = False
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.channels = json.load(f).get('channels', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable scrape state '{path}': {e}")
+
+    def needs_full_scrape(self, channel_input, max_age_days=FULL_REFRESH_DAYS):
+        with self.lock:
+            entry = self.channels.get(channel_key(channel_input))
+            return not entry or time.time() - entry.get('full_at', 0) >= max_age_days * 86400
+
+    def record(self, channel_input, videos, full, present_ids=None):
+        """Remember a channel's title, and the time and uploads of a complete full walk
+
+        full must only be set when the walk listed the whole uploads playlist;
+        present_ids are then the IDs of all its uploads that still exist
+        """
+        with self.lock:
+            entry = self.channels.setdefault(channel_key(channel_input), {})
+            if videos:
+                entry['title'] = videos[0].get('channel_name')
+            if full:
+                entry['full_at'] = int(time.time())
+                if entry.get('title') and present_ids is not None:
+                    self.refreshed[entry['title']] = set(present_ids)
+            self._dirty = True
+
+    def refreshed_ids(self):
+        """Title -> IDs of the existing uploads, for the channels walked in full in this run"""
+        with self.lock:
+            return {title: set(ids) for title, ids in self.refreshed.items()}
+
+    def removed_titles(self, channel_names):
+        """Titles of channels scraped before that are no longer in channel_names"""
+        keys = {channel_key(name) for name in channel_names}
+        with self.lock:
+            current = {entry.get('title') for key, entry in self.channels.items() if key in keys}
+            return {entry['title'] for key, entry in self.channels.items()
+                    if key not in keys and entry.get('title') and entry['title'] not in current}
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        try:
+            state_dir = os.path.dirname(self.path)
+            if state_dir:
+                os.makedirs(state_dir, exist_ok=True)
+            with self.lock, atomic_open(self.path, 'w') as f:
+                json.dump({'channels': self.channels}, f, ensure_ascii=False)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: could not write scrape state '{self.path}': {e}")
+
+
+_channel_cache = None
+_scrape_state = None
+_state_lock = threading.Lock()
+
+
+def get_channel_cache():
+    """The channel resolution cache of this process (loaded on first use)"""
+    global _channel_cache
+    with _state_lock:
+        if _channel_cache is None:
+            _channel_cache = ChannelCache()
+        return _channel_cache
+
+
+def get_scrape_state():
+    """The incremental scrape state of this process (loaded on first use)"""
+    global _scrape_state
+    with _state_lock:
+        if _scrape_state is None:
+            _scrape_state = ScrapeState()
+        return _scrape_state
+
+
+_rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+_thread_state = threading.local()
+
+
+def execute(request):
+    """Execute an API request once the shared rate limiter allows it"""
+    _rate_limiter.wait()
+    return request.execute()
+
+
+def get_thread_service():
+    """YouTube service of the current thread (httplib2 connections are not thread-safe)"""
+    service = getattr(_thread_state, 'youtube', None)
+    if service is None:
+        service = _thread_state.youtube = get_youtube_service()
+    return service
+
+
 def get_channel_id(youtube, channel_name):
     """Get channel ID from channel name"""
     try:
@@ -59,7 +336,7 @@ def get_channel_id(youtube, channel_name):
             type='channel',
             maxResults=1
         )
-        response = request.execute()
+        response = execute(request)
         
         if response['items']:
             channel_id = response['items'][0]['snippet']['channelId']
@@ -103,28 +380,58 @@ def resolve_channel_identifier(youtube, channel_input):
         print(f"Using provided channel ID: {raw}")
         return raw
 
+    # Handles resolved by an earlier run cost no quota
+    cache = get_channel_cache()
+    channel_id = cache.get_channel_id(raw)
+    if channel_id:
+        return channel_id
+
     # Otherwise assume it's a handle or display name; strip leading @ if present
     search_name = raw.lstrip('@')
-    return get_channel_id(youtube, search_name)
-
-
-def get_channel_videos(youtube, channel_id, max_results=5000):
-    """Fetch all videos and shorts from a channel"""
+    channel_id = get_channel_id(youtube, search_name)
+    if channel_id:
+        cache.put_channel_id(raw, channel_id)
+    return channel_id
+
+
+def get_channel_videos(youtube, channel_id, max_results=5000, seen_ids=None, known_ids=None, present_ids=None):
+    """Fetch all videos and shorts from a channel
+
+    Returns (videos, complete): complete is False when the walk was cut short
+    (API error, max_results reached), so the videos are not all of the channel's
+    uploads (or all of its new uploads with known_ids)
+    seen_ids is a set of video IDs to skip (e.g. videos already in another dataset):
+    IDs are filtered per playlist page before the videos.list call, and the IDs
+    fetched here are added to it
+    known_ids are the IDs of the dataset being updated: uploads are listed newest
+    first, so paging stops at the first known upload (incremental mode)
+    present_ids, if given, is filled with the IDs of the uploads that exist: the
+    fetched videos and the skipped ones (private or deleted uploads are not returned)
+    """
     videos = []
+    skipped = 0
+    reached_known = False
+    complete = False
+    if seen_ids is None:
+        seen_ids = set()
     
     try:
-        # Get uploads playlist ID
-        request = youtube.channels().list(
-            part='contentDetails',
-            id=channel_id
-        )
-        response = request.execute()
-        
-        if not response['items']:
-            print(f"No channel found with ID: {channel_id}")
-            return videos
-        
-        uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        # Get uploads playlist ID (cached across runs)
+        cache = get_channel_cache()
+        uploads_playlist_id = cache.get_uploads(channel_id)
+        if not uploads_playlist_id:
+            request = youtube.channels().list(
+                part='contentDetails',
+                id=channel_id
+            )
+            response = execute(request)
+            
+            if not response['items']:
+                print(f"No channel found with ID: {channel_id}")
+                return videos, complete
+            
+            uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            cache.put_uploads(channel_id, uploads_playlist_id)
         
         # Fetch videos from uploads playlist
         next_page_token = None
@@ -136,17 +443,31 @@ def get_channel_videos(youtube, channel_id, max_results=5000):
                 maxResults=5000,
                 pageToken=next_page_token
             )
-            playlist_response = playlist_request.execute()
+            playlist_response = execute(playlist_request)
             
-            video_ids = [item['snippet']['resourceId']['videoId'] 
-                        for item in playlist_response['items']]
+            video_ids = []
+            for item in playlist_response['items']:
+                video_id = item['snippet']['resourceId']['videoId']
+                if known_ids is not None and video_id in known_ids:
+                    # Everything from here on is older and already in the dataset
+                    reached_known = True
+                    break
+                if video_id in seen_ids:
+                    skipped += 1
+                    if present_ids is not None:
+                        present_ids.add(video_id)
+                    continue
+                seen_ids.add(video_id)
+                video_ids.append(video_id)
             
-            # Get detailed video information
-            videos_request = youtube.videos().list(
-                part='snippet,contentDetails,statistics',
-                id=','.join(video_ids)
-            )
-            videos_response = videos_request.execute()
+            # Get detailed video information (only for IDs not seen yet)
+            videos_response = {'items': []}
+            if video_ids:
+                videos_request = youtube.videos().list(
+                    part='snippet,contentDetails,statistics',
+                    id=','.join(video_ids)
+                )
+                videos_response = execute(videos_request)
             
             # Extract video details
             for video in videos_response['items']:
@@ -169,146 +490,165 @@ def get_channel_videos(youtube, channel_id, max_results=5000):
                 # Add channel name explicitly
                 video_data['channel_name'] = video['snippet']['channelTitle']
                 videos.append(video_data)
+                if present_ids is not None:
+                    present_ids.add(video['id'])
             
             next_page_token = playlist_response.get('nextPageToken')
             
-            # Check if we've reached the max results or no more pages
-            if not next_page_token or (max_results and len(videos) >= max_results):
+            # Check if we've reached known uploads, the max results or no more pages
+            if reached_known or not next_page_token:
+                complete = not (max_results and len(videos) > max_results)
+                break
+            if max_results and len(videos) >= max_results:
                 break
         
-        print(f"Fetched {len(videos)} videos from channel")
-        return videos[:max_results] if max_results else videos
+        print(f"Fetched {len(videos)} {'new ' if reached_known else ''}videos from channel"
+              + (f" (skipped {skipped} already collected)" if skipped else "")
+              + ("" if complete else " (incomplete)"))
+        return (videos[:max_results] if max_results else videos), complete
         
     except HttpError as e:
         print(f"An HTTP error occurred: {e}")
-        return videos
+        return videos, False
 
 
-def scrape_all_channels(channel_names, max_results_per_channel= 5000):
-    """Scrape videos from all specified channels"""
-    youtube = get_youtube_service()
-    all_videos = []
-    
-    for channel_name in channel_names:
-        print(f"\n{'='*60}")
-        print(f"Processing channel: {channel_name}")
-        print(f"{'='*60}")
+def _scrape_channel(channel_name, max_results, skip_ids, known_ids):
+    # Runs in a worker thread, with that thread's own service object
+    youtube = get_thread_service()
+
+    # Resolve channel identifier (accept raw IDs, channel URLs, or handles)
+    channel_id = resolve_channel_identifier(youtube, channel_name)
+    if not channel_id:
+        return []
 
-        # Resolve channel identifier (accept raw IDs, channel URLs, or handles)
-        channel_id = resolve_channel_identifier(youtube, channel_name)
+    state = get_scrape_state()
+    full = known_ids is None or state.needs_full_scrape(channel_name)
+    present_ids = set()
+    videos, complete = get_channel_videos(youtube, channel_id, max_results, set(skip_ids),
+                                          None if full else known_ids, present_ids)
+    # A walk cut short (quota error, max_results) neither counts as a full refresh
+    # nor tells which of the channel's records were deleted
+    state.record(channel_name, videos, full and complete, present_ids)
+    return videos
+
+
+def scrape_channels(channel_names, max_results_per_channel=5000, skip_ids=(), workers=SCRAPE_WORKERS,
+                    known_ids=None):
+    """Scrape channels concurrently with up to `workers` threads
+
+    Results are collected in channel order, and a video listed by several
+    channels is kept once (for the first channel), so the output does not
+    depend on thread timing; IDs in skip_ids are not fetched
+    With known_ids (the IDs of the dataset being updated), channels walked in
+    full within FULL_REFRESH_DAYS only fetch uploads newer than the dataset
+    """
+    channel_names = dedupe_channels(channel_names)
+    skip_ids = frozenset(skip_ids)
+    known_ids = frozenset(known_ids) if known_ids is not None else None
+    all_videos = []
 
-        if channel_id:
-            # Get videos from channel
-            videos = get_channel_videos(youtube, channel_id, max_results_per_channel)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda name: _scrape_channel(name, max_results_per_channel, skip_ids, known_ids),
+                               channel_names)
+        for channel_name, videos in zip(channel_names, results):
             all_videos.extend(videos)
-            print(f"Total videos collected so far: {len(all_videos)}")
-    
-    return all_videos
+            print(f"{channel_name}: {len(videos)} videos (total collected: {len(all_videos)})")
+
+    cache = get_channel_cache()
+    print(f"Channel resolution cache: {cache.hits} hits, {cache.misses} API lookups")
+    cache.save()
+    get_scrape_state().save()
+
+    return dedupe_videos(all_videos)
 
 
-def save_to_json(data, filename='bjj_videos.json'):
-    """Save video data to JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def scrape_all_channels(channel_names, max_results_per_channel= 5000, skip_ids=(), workers=SCRAPE_WORKERS,
+                        known_ids=None):
+    """Scrape videos from all specified channels
+
+    Each video ID is fetched once per channel and kept once per run; IDs in
+    skip_ids (e.g. videos already in the fight dataset) are not fetched, and
+    known_ids enables incremental scraping (see scrape_channels)
+    """
+    print(f"\nScraping {len(channel_names)} channels with {workers} workers...")
+    return scrape_channels(channel_names, max_results_per_channel, skip_ids, workers, known_ids)
+
+
+def merge_videos(new_videos, existing_videos, channel_names):
+    """Merge freshly scraped records into an existing dataset
+
+    New records come first and replace existing records of the same video;
+    records of channels no longer in channel_names are dropped, and so are the
+    records of channels walked in full in this run whose uploads were not found
+    (deleted or private videos)
+    """
+    state = get_scrape_state()
+    removed = state.removed_titles(channel_names)
+    refreshed = state.refreshed_ids()
+    kept = [video for video in existing_videos
+            if video.get('channel_name') not in removed
+            and (video.get('channel_name') not in refreshed or video_id_of(video) in refreshed[video['channel_name']])]
+    if len(kept) < len(existing_videos):
+        print(f"Dropped {len(existing_videos) - len(kept)} videos of removed channels or no longer on YouTube")
+    return dedupe_videos(list(new_videos) + kept)
+
+
+def simplify_video(video):
+    """Fields of the simplified dataset the classifier and the web app read"""
+    return {
+        'channel_name': video['channel_name'],
+        'title': video['title'],
+        'description': video['description'],
+        'tags': video['tags'],
+        'youtube_link': video['youtube_link'],
+        'view_count': int(video.get('view_count', 0)),
+        'language': video.get('default_audio_language', video.get('default_language', 'unknown')),
+        'published_at': video.get('published_at')
+    }
+
+
+def save_to_json(data, filename='bjj_videos.json', compact=True, compress=True):
+    """Save video data to JSON file (atomically, with pre-compressed .gz/.br copies)
+
+    Repeated video IDs are dropped, keeping the first record of each video;
+    returns the records that were written
+    """
+    unique = dedupe_videos(data)
+    if len(unique) != len(data):
+        print(f"Dropped {len(data) - len(unique)} duplicate videos")
+    data = unique
+    save_json(data, filename, compact=compact, compress=compress)
     print(f"\n{'='*60}")
     print(f"Data saved to {filename}")
     print(f"Total videos: {len(data)}")
     print(f"{'='*60}")
+    return data
 
 
-def scrape_and_save_fight_channels(channel_names, max_results_per_channel=5000, output_file='fight_simple.json'):
+def scrape_and_save_fight_channels(channel_names, max_results_per_channel=5000, output_file=FIGHT_DATASET,
+                                   workers=SCRAPE_WORKERS, incremental=INCREMENTAL):
     """Scrape fight/match channels and save a simplified JSON file.
 
     This re-uses existing scraping helpers and writes a minimal JSON similar to the
     simplified BJJ output (channel_name, title, description, tags, youtube_link, view_count, language).
+    In incremental mode only new uploads are fetched and merged into output_file.
     """
-    print('\nStarting fight/match channels scrape...')
-    youtube = get_youtube_service()
-    all_videos = []
-
-    for channel_name in channel_names:
-        print(f"\n{'='*60}")
-        print(f"Processing fight channel: {channel_name}")
-        print(f"{'='*60}")
+    print(f'\nStarting fight/match channels scrape with {workers} workers...')
+    existing = load_videos(output_file) if incremental else []
+    known_ids = {video_id_of(video) for video in existing} if incremental else None
+    all_videos = scrape_channels(channel_names, max_results_per_channel, workers=workers, known_ids=known_ids)
 
-        channel_id = resolve_channel_identifier(youtube, channel_name)
-        if channel_id:
-            videos = get_channel_videos(youtube, channel_id, max_results_per_channel)
-            all_videos.extend(videos)
-
-    if not all_videos:
+    if not all_videos and not existing:
         print('No fight/match videos collected.')
         return None
 
-    def extract_athletes_from_title(title: str):
-        """Try to extract athlete names from titles using common separators like 'vs', 'v.', 'vs.' or '-'.
-
-        This function aggressively strips trailing event info from each side. It:
-        - removes parenthetical content
-        - splits on common separators (|, -, :, —, –) and keeps the first segment
-        - removes trailing keywords like 'Highlights', 'Full Match', event names like 'IBJJF', 'ADCC'
-        - strips year tokens like '2023'
-        - attempts to capture a leading name phrase using a capitalized-word heuristic
-        """
-        if not title:
-            return []
-
-        # Normalize spacing / NBSP
-        t = title.replace('\xa0', ' ').strip()
-
-        # Acceptable separators to split the main title into two sides
-        separators = [r" vs ", r" v. ", r" vs. ", r" v "]
-
-        def remove_parens(s: str) -> str:
-            return re.sub(r"\(.*?\)", "", s).strip()
-
-        def remove_trailing_event_info(s: str) -> str:
-            # Cut on common secondary separators and keep the first chunk
-            s = re.split(r"\|| — | – | - |:|\u2013|\u2014", s)[0]
-            # Remove common trailing words that indicate events or extras
-            s = re.sub(r"\b(Highlights|Highlight|Full Match|Full Fight|Replay|Semifinal|Final|Quarterfinal|Quarter-finals|Round\s*\d+|ADCC|IBJJF|Polaris|Eternal|202\d)\b", "", s, flags=re.I)
-            # Remove standalone year tokens
-            s = re.sub(r"\b20\d{2}\b", "", s)
-            return s.strip()
-
-        def leading_name_hint(s: str) -> str:
-            # Try to extract a leading name (allow small particles like 'de', 'da', 'van') up to 5 words
-            m = re.match(r"^([A-Z][\w'\.-]+(?:\s+(?:[A-Z][\w'\.-]+|de|da|do|dos|van|von|la|le|del|di)){0,4})", s)
-            if m:
-                return m.group(1).strip()
-            # If no capitalized match, fallback to the cleaned string
-            return s.strip()
-
-        # Try separators in order
-        for sep in separators:
-            if sep in t:
-                parts = [p.strip() for p in re.split(re.escape(sep), t, maxsplit=1) if p.strip()]
-                if len(parts) >= 2:
-                    left = remove_parens(parts[0])
-                    right = remove_parens(parts[1])
-
-                    left = remove_trailing_event_info(left)
-                    right = remove_trailing_event_info(right)
-
-                    # Try to extract a more focused name from each side
-                    a1 = leading_name_hint(left)
-                    a2 = leading_name_hint(right)
-
-                    # Validate that these look like names (contain letters)
-                    if re.search(r"[A-Za-z]", a1) and re.search(r"[A-Za-z]", a2):
-                        return [a1, a2]
-
-        # Fallback regex: 'Name1 vs Name2' anywhere in title
-        m = re.search(r"([A-Z][\w'\.-]+(?:\s+[A-Z][\w'\.-]+)*)\s+vs\.?\s+([A-Z][\w'\.-]+(?:\s+[A-Z][\w'\.-]+)*)", t, flags=re.I)
-        if m:
-            return [m.group(1).strip(), m.group(2).strip()]
-
-        return []
+    # One gazetteer-backed extractor for the whole batch, seeded from the previous output
+    extractor = build_extractor(past_files=(output_file,))
+    athletes_per_video = extractor.extract_batch(v.get('title', '') for v in all_videos)
 
     simplified = []
-    for v in all_videos:
+    for v, athletes in zip(all_videos, athletes_per_video):
         title = v.get('title', '')
-        athletes = extract_athletes_from_title(title)
         simplified.append({
             'channel_name': v.get('channel_name'),
             'title': title,
@@ -317,10 +657,18 @@ def scrape_and_save_fight_channels(channel_names, max_results_per_channel=5000,
             'youtube_link': v.get('youtube_link'),
             'view_count': int(v.get('view_count', 0)) if v.get('view_count') is not None else 0,
             'language': v.get('default_audio_language', v.get('default_language', 'unknown')),
+            'published_at': v.get('published_at'),
             'athletes': athletes
         })
 
-    save_to_json(simplified, output_file)
+    print(f"{len(simplified)} new fight/match videos")
+    simplified = merge_videos(simplified, existing, channel_names)
+
+    # The athlete index refers to positions in the written file
+    simplified = save_to_json(simplified, output_file)
+
+    # Resolve name variants into canonical athletes and index their fights
+    save_athlete_index(simplified, ATHLETE_INDEX_FILE, source=output_file, known_athletes=extractor.gazetteer)
     return simplified
 
 
@@ -349,27 +697,28 @@ def main():
         print("="*60)
         print(f"Channels to scrape: {', '.join(BJJ_CHANNELS)}")
         
-        # Scrape technique channels
-        all_videos = scrape_all_channels(BJJ_CHANNELS, max_results_per_channel=5000)
+        # Incremental runs only fetch uploads newer than the existing dataset
+        existing_simple = load_videos('bjj_videos_simple.json') if INCREMENTAL else []
+        known_ids = {video_id_of(video) for video in existing_simple} if INCREMENTAL else None
+        
+        # Scrape technique channels (matches already in the fight dataset are not fetched again)
+        all_videos = scrape_all_channels(BJJ_CHANNELS, max_results_per_channel=5000,
+                                         skip_ids=load_video_ids(FIGHT_DATASET), known_ids=known_ids)
         
         # Save to JSON file
-        if all_videos:
-            save_to_json(all_videos, 'bjj_videos.json')
+        if all_videos or existing_simple:
+            print(f"\n{len(all_videos)} new videos")
+            if INCREMENTAL and existing_simple and not os.path.exists('bjj_videos.json'):
+                # The new uploads alone would replace the full dataset with a fraction of it
+                print("Skipping bjj_videos.json: no existing full dataset to update "
+                      "(run with SCRAPE_MODE=full to rebuild it)")
+            else:
+                existing_full = load_videos('bjj_videos.json') if INCREMENTAL else []
+                save_to_json(merge_videos(all_videos, existing_full, BJJ_CHANNELS), 'bjj_videos.json')
             
             # Also create a simplified version with just the requested fields
-            simplified_videos = [
-                {
-                    'channel_name': video['channel_name'],
-                    'title': video['title'],
-                    'description': video['description'],
-                    'tags': video['tags'],
-                    'youtube_link': video['youtube_link'],
-                    'view_count': int(video.get('view_count', 0)),
-                    'language': video.get('default_audio_language', video.get('default_language', 'unknown'))
-                }
-                for video in all_videos
-            ]
-            save_to_json(simplified_videos, 'bjj_videos_simple.json')
+            simplified_videos = [simplify_video(video) for video in all_videos]
+            save_to_json(merge_videos(simplified_videos, existing_simple, BJJ_CHANNELS), 'bjj_videos_simple.json')
         else:
             print("\nNo videos were collected.")
     
@@ -380,7 +729,7 @@ def main():
         print(f"Channels to scrape: {', '.join(FIGHT_CHANNELS)}")
         
         # Scrape fight/match channels
-        scrape_and_save_fight_channels(FIGHT_CHANNELS, max_results_per_channel=20000, output_file='fight_simple.json')
+        scrape_and_save_fight_channels(FIGHT_CHANNELS, max_results_per_channel=20000, output_file=FIGHT_DATASET)
 
 
 if __name__ == '__main__':